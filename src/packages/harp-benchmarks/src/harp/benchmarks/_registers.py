@@ -7,11 +7,17 @@
 so no sample values live here, only the register class and its frame shape.
 
 All generated artifacts live under ``./benchmark`` in the current working directory.
+The sweeps that synthesize their frames in memory share :func:`mean_time` and
+:func:`random_corpus` from here too.
 """
 
+from collections.abc import Callable
 from pathlib import Path
+from statistics import mean
+from time import perf_counter
 from typing import Any, NamedTuple
 
+import numpy as np
 from harp.benchmarks.register_models import (
     AnalogData,
     BitmaskSplitter,
@@ -34,6 +40,28 @@
 ARTIFACTS_DIR = Path("benchmark").resolve()
 DATA_DIR = ARTIFACTS_DIR / "data"
 REPORT_PATH = ARTIFACTS_DIR / "report.md"
+RESULTS_PATH = ARTIFACTS_DIR / "results.json"
+
+
+def mean_time(fn: Callable[[], object], *, runs: int) -> float:
+    """The mean wall time of ``runs`` calls of ``fn``, after one warm-up call."""
+    fn()  # warm-up, not measured
+    samples: list[float] = []
+    for _ in range(runs):
+        t0 = perf_counter()
+        fn()
+        samples.append(perf_counter() - t0)
+    return mean(samples)
+
+
+def random_corpus(register: type[RegisterBase[Any]], frames: int) -> bytes:
+    """``frames`` timestamped frames of ``register`` with random payload bytes, 1 ms apart,
+    seeded by its address so every run parses the same bytes."""
+    dtype = register.payload_class.payload_dtype
+    rng = np.random.default_rng(register.address)
+    records = rng.integers(0, 256, size=frames * dtype.itemsize, dtype=np.uint8).view(dtype)
+    timestamps = np.arange(frames, dtype=np.float64) * 1e-3
+    return bytes(register.format_bulk(records, timestamps=timestamps))
 
 
 class BenchmarkedRegister(NamedTuple):
@@ -1,11 +1,15 @@
 import argparse
+import gc
+import json
 import platform
 import sys
-from dataclasses import dataclass
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
 from pathlib import Path
 from statistics import mean, stdev
 from time import perf_counter
-from typing import Callable
+from typing import Any, Callable
 
 import numpy as np
 import pandas as pd
@@ -13,8 +17,10 @@
     BENCHMARK_REGISTERS,
     DATA_DIR,
     REPORT_PATH,
+    RESULTS_PATH,
     BenchmarkedRegister,
 )
+from harp.benchmarks.compare import report_comparison
 from harp.benchmarks.generate import ensure_corpus
 from harp.data import parse_to_dataframe
 
@@ -23,7 +29,13 @@
 
 @dataclass
 class TimingStats:
-    """Per-run timings (seconds) and throughput derived from the mean."""
+    """Per-run timings (seconds) and throughput derived from the mean.
+
+    ``samples`` keeps the time of every run, which a comparison against a baseline
+    resamples to tell a regression from noise. ``peak_bytes`` is the most memory the
+    operation held at once in a separate, traced run; buffers allocated before the call,
+    as a pre-read file is, are not counted.
+    """
 
     min: float
     mean: float
@@ -31,6 +43,8 @@ class TimingStats:
     stdev: float
     frames: int
     file_bytes: int
+    samples: list[float] = field(default_factory=list)
+    peak_bytes: int = 0
 
     @property
     def mframes_per_s(self) -> float:
@@ -40,8 +54,35 @@ def mframes_per_s(self) -> float:
     def mib_per_s(self) -> float:
         return (self.file_bytes / self.mean) / _MIB
 
+    @property
+    def bytes_per_frame(self) -> float:
+        return self.peak_bytes / self.frames
+
+    @property
+    def amplification(self) -> float:
+        """Peak memory as a multiple of the file size."""
+        return self.peak_bytes / self.file_bytes
+
+
+def _peak_bytes(fn: Callable[[], object]) -> int:
+    """The peak memory ``fn`` allocates, traced by ``tracemalloc``, which numpy reports to.
+
+    The result is released before the peak is read, but it counts at its peak all the
+    same, so a DataFrame and the file it views are both included.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return peak - base
+
 
 def _time(fn: Callable[[], object], *, runs: int, frames: int, file_bytes: int) -> TimingStats:
+    """Time ``runs`` calls of ``fn``, then trace its peak memory in one more, untimed."""
     fn()  # warm-up for imports, caches and first-touch pages, not measured
     samples: list[float] = []
     for _ in range(runs):
@@ -55,6 +96,8 @@ def _time(fn: Callable[[], object], *, runs: int, frames: int, file_bytes: int)
         stdev=stdev(samples) if len(samples) > 1 else 0.0,
         frames=frames,
         file_bytes=file_bytes,
+        samples=samples,
+        peak_bytes=_peak_bytes(fn),
     )
 
 
@@ -73,6 +116,10 @@ class RegisterResult:
     df_reread: TimingStats
 
 
+STAGES = ("bulk_preread", "bulk_reread", "cols", "df_preread", "df_reread")
+"""The timed stages of a :class:`RegisterResult`, as named in the JSON results."""
+
+
 def _dataset_info(raw: bytes, payload_bytes: int) -> tuple[int, int]:
     data = np.frombuffer(raw, dtype=np.uint8)
     stride = int(data[1]) + 2
@@ -141,6 +188,36 @@ def _fmt_ms(s: float) -> str:
     return f"{s * 1e3:.2f}"
 
 
+def environment(*, runs: int) -> dict[str, Any]:
+    """The platform and library versions a run was measured on."""
+    return {
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "runs": runs,
+    }
+
+
+def results_to_json(results: list[RegisterResult], *, runs: int) -> dict[str, Any]:
+    """The results of a run with its environment, as written to ``results.json``.
+
+    Each register lists the statistics of every stage, per-run ``samples`` included,
+    which :mod:`harp.benchmarks.compare` reads back as a baseline.
+    """
+    registers = []
+    for r in results:
+        entry = asdict(r)
+        entry["stages"] = {stage: entry.pop(stage) for stage in STAGES}
+        registers.append(entry)
+    return {
+        "created": datetime.now(UTC).isoformat(timespec="seconds"),
+        "environment": environment(runs=runs),
+        "registers": registers,
+    }
+
+
 def build_report(results: list[RegisterResult], *, runs: int) -> str:
     lines: list[str] = []
     lines.append("# Harp parsing benchmark\n")
@@ -151,12 +228,13 @@ def build_report(results: list[RegisterResult], *, runs: int) -> str:
 
     # Environment
     lines.append("## Environment\n")
+    env = environment(runs=runs)
     lines.append("| Key | Value |")
     lines.append("| --- | --- |")
-    lines.append(f"| Platform | {platform.platform()} |")
-    lines.append(f"| Python | {sys.version.split()[0]} |")
-    lines.append(f"| NumPy | {np.__version__} |")
-    lines.append(f"| pandas | {pd.__version__} |")
+    lines.append(f"| Platform | {env['platform']} |")
+    lines.append(f"| Python | {env['python']} |")
+    lines.append(f"| NumPy | {env['numpy']} |")
+    lines.append(f"| pandas | {env['pandas']} |")
     lines.append(f"| Runs per measurement | {runs} |")
     lines.append(
         "| Measured op | one full-file parse; min/mean/stdev over runs (1 warm-up discarded) |\n"
@@ -214,8 +292,8 @@ def _table(
         "Isolates the decode step: `parse_bulk` views are built once up front, then "
         "only `payload.payload_as_columns()` is timed. This is where the "
         "`converter.decode_batch` executes. Registers whose converters loop in Python "
-        "(`HarpVersionConverter`, `StringConverter`, `BytesToIntConverter` -> object "
-        "dtype) dominate here; vectorized converters stay cheap.\n"
+        "(`StringConverter` -> object dtype) dominate here; vectorized converters, and "
+        "`HarpVersionConverter` split into typed columns by `decode_columns`, stay cheap.\n"
     )
     lines.append("| Register | Frames | mean (ms) | min (ms) | stdev (ms) | Mframes/s | MiB/s |")
     lines.append("| --- | ---: | ---: | ---: | ---: | ---: | ---: |")
@@ -249,6 +327,30 @@ def _table(
         )
     lines.append("")
 
+    lines.append("## Memory (peak bytes traced, as a multiple of the file size)\n")
+    lines.append(
+        "The most memory each stage held at once, traced with `tracemalloc` in one "
+        "extra run, over the file size. `pre` stages parse a buffer read beforehand, "
+        "which is not counted; `re` stages count the file read too, so they start at "
+        "1x. A DataFrame viewing the frames adds little beyond them, while each copy, "
+        "decoded column or object array shows as a further multiple.\n"
+    )
+    lines.append(
+        "| Register | File (MiB) | parse_bulk pre | parse_bulk re | payload_as_columns "
+        "| parse_to_dataframe pre | parse_to_dataframe re | re peak (MiB) | re B/frame |"
+    )
+    lines.append("| --- | ---: | ---: | ---: | ---: | ---: | ---: | ---: | ---: |")
+    for r in results:
+        cells = " | ".join(
+            f"{t.amplification:.2f}x"
+            for t in (r.bulk_preread, r.bulk_reread, r.cols, r.df_preread, r.df_reread)
+        )
+        lines.append(
+            f"| {r.name} | {r.file_bytes / _MIB:.1f} | {cells} | "
+            f"{r.df_reread.peak_bytes / _MIB:.1f} | {r.df_reread.bytes_per_frame:.1f} |"
+        )
+    lines.append("")
+
     return "\n".join(lines)
 
 
@@ -300,6 +402,30 @@ def main() -> None:
         help=f"directory containing/receiving corpus files (default: {DATA_DIR})",
     )
     parser.add_argument("--report", type=Path, default=REPORT_PATH)
+    parser.add_argument(
+        "--json",
+        type=Path,
+        default=RESULTS_PATH,
+        help=f"machine-readable results, per-run samples included (default: {RESULTS_PATH})",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        help="results.json of an earlier run to compare against, writing compare.md next to "
+        "--report; exits 1 on a regression",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.05,
+        help="with --baseline, smallest relative change reported, as a fraction (default: 0.05)",
+    )
+    parser.add_argument(
+        "--confidence",
+        type=float,
+        default=0.99,
+        help="with --baseline, confidence of the bootstrap interval (default: 0.99)",
+    )
     parser.add_argument(
         "--head",
         action="store_true",
@@ -323,7 +449,8 @@ def main() -> None:
         print(
             f"bulk={_fmt_ms(res.bulk_preread.mean):>8s}ms "
             f"payload_as_columns={_fmt_ms(res.cols.mean):>9s}ms "
-            f"df={_fmt_ms(res.df_preread.mean):>9s}ms"
+            f"df={_fmt_ms(res.df_preread.mean):>9s}ms "
+            f"df peak={res.df_reread.amplification:>5.2f}x file"
         )
         if args.head:
             df = parse_to_dataframe(reg.register, path.read_bytes(), time_index=True)
@@ -334,6 +461,23 @@ def main() -> None:
     report = build_report(results, runs=args.runs)
     args.report.write_text(report, encoding="utf-8")
     print(f"\nReport written to {args.report}")
+    current = results_to_json(results, runs=args.runs)
+    args.json.parent.mkdir(parents=True, exist_ok=True)
+    args.json.write_text(json.dumps(current, indent=2), encoding="utf-8")
+    print(f"Results written to {args.json}")
+
+    if args.baseline is not None:
+        print(f"\nComparing against {args.baseline}:")
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressed = report_comparison(
+            baseline,
+            current,
+            report=args.report.with_name("compare.md"),
+            threshold=args.threshold,
+            confidence=args.confidence,
+        )
+        if regressed:
+            raise SystemExit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,229 @@
+"""Compare the ``results.json`` of a benchmark run against a stored baseline.
+
+Every stage of every register present in both runs is compared on the ratio of its
+mean times, current over baseline. The per-run samples of both are resampled with
+replacement into a bootstrap confidence interval of that ratio, so a change counts
+only when the whole interval clears the threshold: a regression when its lower bound
+is above ``1 + threshold``, an improvement when its upper bound is below
+``1 - threshold``. A regression exits with status 1, so a CI job fails on it.
+"""
+
+import argparse
+import json
+from collections.abc import Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Literal
+
+import numpy as np
+from harp.benchmarks._registers import ARTIFACTS_DIR, RESULTS_PATH
+
+COMPARE_REPORT_PATH = ARTIFACTS_DIR / "compare.md"
+
+Verdict = Literal["regression", "improvement", "unchanged"]
+"""How a stage changed, once noise in the per-run samples is accounted for."""
+
+_RESAMPLES = 10_000
+
+_ENVIRONMENT_KEYS = ("platform", "machine", "python", "numpy", "pandas")
+
+
+@dataclass
+class Comparison:
+    """The change in one stage of one register, as a ratio of mean times."""
+
+    name: str
+    stage: str
+    baseline: float
+    current: float
+    ratio: float
+    low: float
+    high: float
+    verdict: Verdict
+
+
+def _ratio_interval(
+    baseline: list[float], current: list[float], *, confidence: float, rng: np.random.Generator
+) -> tuple[float, float]:
+    """The bootstrap ``confidence`` interval of ``mean(current) / mean(baseline)``."""
+    base = np.asarray(baseline, dtype=np.float64)
+    cur = np.asarray(current, dtype=np.float64)
+    base_means = base[rng.integers(0, len(base), (_RESAMPLES, len(base)))].mean(axis=1)
+    cur_means = cur[rng.integers(0, len(cur), (_RESAMPLES, len(cur)))].mean(axis=1)
+    tail = (1 - confidence) / 2 * 100
+    low, high = np.percentile(cur_means / base_means, [tail, 100 - tail])
+    return float(low), float(high)
+
+
+def _stages(results: Mapping[str, Any]) -> dict[tuple[str, str], Mapping[str, Any]]:
+    return {
+        (register["name"], stage): stats
+        for register in results["registers"]
+        for stage, stats in register["stages"].items()
+    }
+
+
+def compare_results(
+    baseline: Mapping[str, Any],
+    current: Mapping[str, Any],
+    *,
+    threshold: float = 0.05,
+    confidence: float = 0.99,
+) -> list[Comparison]:
+    """Compare every stage the two runs share, in the order of ``current``.
+
+    A stage lacking per-run samples in either run, as from a single run, compares
+    its means alone and is never judged a change.
+    """
+    rng = np.random.default_rng(0)  # a fixed seed, so the same runs give the same verdicts
+    before = _stages(baseline)
+    comparisons: list[Comparison] = []
+    for key, stats in _stages(current).items():
+        if key not in before:
+            continue
+        ratio = stats["mean"] / before[key]["mean"]
+        low = high = ratio
+        verdict: Verdict = "unchanged"
+        if len(stats["samples"]) > 1 and len(before[key]["samples"]) > 1:
+            low, high = _ratio_interval(
+                before[key]["samples"], stats["samples"], confidence=confidence, rng=rng
+            )
+            if low > 1 + threshold:
+                verdict = "regression"
+            elif high < 1 - threshold:
+                verdict = "improvement"
+        comparisons.append(
+            Comparison(
+                name=key[0],
+                stage=key[1],
+                baseline=before[key]["mean"],
+                current=stats["mean"],
+                ratio=ratio,
+                low=low,
+                high=high,
+                verdict=verdict,
+            )
+        )
+    return comparisons
+
+
+def environment_differences(
+    baseline: Mapping[str, Any], current: Mapping[str, Any]
+) -> dict[str, tuple[Any, Any]]:
+    """The environment entries that differ between two runs, as ``(baseline, current)``."""
+    before, after = baseline.get("environment", {}), current.get("environment", {})
+    return {
+        key: (before.get(key), after.get(key))
+        for key in _ENVIRONMENT_KEYS
+        if before.get(key) != after.get(key)
+    }
+
+
+def build_report(
+    comparisons: list[Comparison],
+    *,
+    threshold: float,
+    confidence: float,
+    differences: Mapping[str, tuple[Any, Any]],
+) -> str:
+    lines = [
+        "# Benchmark comparison\n",
+        (
+            f"Ratio of mean times, current over baseline, with its {confidence:.0%} "
+            f"bootstrap interval over the per-run samples. A change is reported when the "
+            f"whole interval lies beyond {threshold:.0%}.\n"
+        ),
+    ]
+    if differences:
+        lines.append("The runs were measured in different environments:\n")
+        for key, (before, after) in differences.items():
+            lines.append(f"- {key}: {before} -> {after}")
+        lines.append("")
+    lines += [
+        "| Register | Stage | baseline (ms) | current (ms) | ratio | interval | verdict |",
+        "| --- | --- | ---: | ---: | ---: | --- | --- |",
+    ]
+    for c in comparisons:
+        verdict = f"**{c.verdict}**" if c.verdict == "regression" else c.verdict
+        lines.append(
+            f"| {c.name} | {c.stage} | {c.baseline * 1e3:.2f} | {c.current * 1e3:.2f} | "
+            f"{c.ratio:.3f} | {c.low:.3f} - {c.high:.3f} | {verdict} |"
+        )
+    lines.append("")
+    return "\n".join(lines)
+
+
+def report_comparison(
+    baseline: Mapping[str, Any],
+    current: Mapping[str, Any],
+    *,
+    report: Path,
+    threshold: float = 0.05,
+    confidence: float = 0.99,
+) -> bool:
+    """Compare two runs, write the report and print the changes; whether any regressed."""
+    comparisons = compare_results(baseline, current, threshold=threshold, confidence=confidence)
+    differences = environment_differences(baseline, current)
+    report.parent.mkdir(parents=True, exist_ok=True)
+    report.write_text(
+        build_report(
+            comparisons, threshold=threshold, confidence=confidence, differences=differences
+        ),
+        encoding="utf-8",
+    )
+    for key, (before, after) in differences.items():
+        print(f"  environment differs, {key}: {before} -> {after}")
+    changed = [c for c in comparisons if c.verdict != "unchanged"]
+    for c in changed:
+        print(
+            f"  {c.verdict:<11s} {c.name:<24s} {c.stage:<12s} x{c.ratio:.3f} "
+            f"({c.low:.3f} - {c.high:.3f})"
+        )
+    regressions = sum(c.verdict == "regression" for c in comparisons)
+    print(
+        f"\n{len(comparisons)} stage(s) compared, {regressions} regression(s), "
+        f"{len(changed) - regressions} improvement(s); report written to {report}"
+    )
+    return regressions > 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("baseline", type=Path, help="results.json of the baseline run")
+    parser.add_argument(
+        "current",
+        type=Path,
+        nargs="?",
+        default=RESULTS_PATH,
+        help=f"results.json of the run to check (default: {RESULTS_PATH})",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.05,
+        help="smallest relative change reported, as a fraction (default: 0.05)",
+    )
+    parser.add_argument(
+        "--confidence",
+        type=float,
+        default=0.99,
+        help="confidence of the bootstrap interval (default: 0.99)",
+    )
+    parser.add_argument("--report", type=Path, default=COMPARE_REPORT_PATH)
+    args = parser.parse_args()
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    current = json.loads(args.current.read_text(encoding="utf-8"))
+    regressed = report_comparison(
+        baseline,
+        current,
+        report=args.report,
+        threshold=args.threshold,
+        confidence=args.confidence,
+    )
+    if regressed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
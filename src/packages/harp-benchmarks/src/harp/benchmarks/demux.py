@@ -0,0 +1,191 @@
+"""Time demultiplexing ``BitMask`` flag registers into one boolean column per flag.
+
+Each register is parsed once up front, so only ``payload_as_columns`` with
+``demux_bit_masks=True`` is timed, against the one-pass-per-flag masking it replaces.
+``parse_to_dataframe`` is timed too, so the share of pandas construction is visible.
+Besides ``PortDIOSet`` from the device.yml model, which keeps 4 flags of one byte,
+16- and 32-line digital ports exercise wide flag registers.
+"""
+
+import argparse
+import enum
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, ClassVar
+
+import numpy as np
+from harp.benchmarks._registers import ARTIFACTS_DIR, mean_time, random_corpus
+from harp.benchmarks.register_models import PortDigitalIOS, PortDIOSet
+from harp.data import parse_to_dataframe
+from harp.protocol import AnonymousPayload, BitMask, PayloadType, RegisterBase
+
+DEMUX_REPORT_PATH = ARTIFACTS_DIR / "demux.md"
+
+
+class DigitalLines(enum.IntFlag):
+    """Digital lines, one bit each; a port keeps those that fit its element."""
+
+    DI0 = 0x1
+    DI1 = 0x2
+    DI2 = 0x4
+    DI3 = 0x8
+    DI4 = 0x10
+    DI5 = 0x20
+    DI6 = 0x40
+    DI7 = 0x80
+    DI8 = 0x100
+    DI9 = 0x200
+    DI10 = 0x400
+    DI11 = 0x800
+    DI12 = 0x1000
+    DI13 = 0x2000
+    DI14 = 0x4000
+    DI15 = 0x8000
+    DI16 = 0x10000
+    DI17 = 0x20000
+    DI18 = 0x40000
+    DI19 = 0x80000
+    DI20 = 0x100000
+    DI21 = 0x200000
+    DI22 = 0x400000
+    DI23 = 0x800000
+    DI24 = 0x1000000
+    DI25 = 0x2000000
+    DI26 = 0x4000000
+    DI27 = 0x8000000
+    DI28 = 0x10000000
+    DI29 = 0x20000000
+    DI30 = 0x40000000
+    DI31 = 0x80000000
+
+
+class DigitalPortPayload(AnonymousPayload[np.uint16]):
+    __value__: DigitalLines = BitMask(enum=DigitalLines)
+
+
+class DigitalPort(RegisterBase[DigitalLines]):
+    """A 16-line digital input port, a single BitMask over the whole U16 element."""
+
+    address: ClassVar[int] = 32
+    payload_type: ClassVar[PayloadType] = PayloadType.U16
+    payload_class = DigitalPortPayload
+
+
+class WideDigitalPortPayload(AnonymousPayload[np.uint32]):
+    __value__: DigitalLines = BitMask(enum=DigitalLines)
+
+
+class WideDigitalPort(RegisterBase[DigitalLines]):
+    """A 32-line digital input port, a single BitMask over the whole U32 element."""
+
+    address: ClassVar[int] = 33
+    payload_type: ClassVar[PayloadType] = PayloadType.U32
+    payload_class = WideDigitalPortPayload
+
+
+@dataclass
+class DemuxResult:
+    """Mean timings (seconds) of demultiplexing one register."""
+
+    name: str
+    flags: int
+    frames: int
+    per_flag: float
+    payload_as_columns: float
+    parse_to_dataframe: float
+
+
+def _per_flag(values: np.ndarray, members: list[int]) -> list[np.ndarray]:
+    """The reference demultiplexing: the values gathered once, then a pass per flag member."""
+    raw = np.ascontiguousarray(values)
+    return [(raw & member) != 0 for member in members]
+
+
+DEMUX_REGISTERS: list[tuple[str, type[RegisterBase[Any]], type[enum.IntFlag]]] = [
+    ("PortDIOSet", PortDIOSet, PortDigitalIOS),
+    ("DigitalPort", DigitalPort, DigitalLines),
+    ("WideDigitalPort", WideDigitalPort, DigitalLines),
+]
+"""Each flag register under benchmark, with the flag enum of its single BitMask."""
+
+
+def benchmark_demux(
+    name: str,
+    register: type[RegisterBase[Any]],
+    flags: type[enum.IntFlag],
+    *,
+    frames: int,
+    runs: int,
+) -> DemuxResult:
+    raw = random_corpus(register, frames)
+    _, _, _, payload = register.parse_bulk(raw)
+    columns = payload.payload_as_columns(demux_bit_masks=True)
+    values = payload.payload_array["__value__"]
+    members = [int(flags[str(c.name)]) for c in columns]
+    return DemuxResult(
+        name=name,
+        flags=len(columns),
+        frames=frames,
+        per_flag=mean_time(lambda: _per_flag(values, members), runs=runs),
+        payload_as_columns=mean_time(
+            lambda: payload.payload_as_columns(demux_bit_masks=True), runs=runs
+        ),
+        parse_to_dataframe=mean_time(
+            lambda: parse_to_dataframe(register, raw, demux_bit_masks=True), runs=runs
+        ),
+    )
+
+
+def build_report(results: list[DemuxResult], *, runs: int) -> str:
+    lines = [
+        "# BitMask demultiplexing benchmark\n",
+        (
+            f"`demux_bit_masks=True` over random flag values, mean of {runs} runs "
+            "(1 warm-up discarded). `per flag` masks the data once per flag member, "
+            "the reference `payload_as_columns` is measured against; above 16 flags it "
+            "unpacks every bit in a single pass instead.\n"
+        ),
+        (
+            "| Register | Flags | Frames | per flag (ms) | payload_as_columns (ms) | speedup "
+            "| parse_to_dataframe (ms) |"
+        ),
+        "| --- | ---: | ---: | ---: | ---: | ---: | ---: |",
+    ]
+    for r in results:
+        lines.append(
+            f"| {r.name} | {r.flags} | {r.frames:,} | {r.per_flag * 1e3:.2f} | "
+            f"{r.payload_as_columns * 1e3:.2f} | {r.per_flag / r.payload_as_columns:.1f}x | "
+            f"{r.parse_to_dataframe * 1e3:.2f} |"
+        )
+    lines.append("")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--frames", type=int, default=1_000_000, help="frames per register (default: 1,000,000)"
+    )
+    parser.add_argument(
+        "--runs", type=int, default=10, help="repeats per measurement (default: 10)"
+    )
+    parser.add_argument("--report", type=Path, default=DEMUX_REPORT_PATH)
+    args = parser.parse_args()
+
+    results: list[DemuxResult] = []
+    for name, register, flags in DEMUX_REGISTERS:
+        r = benchmark_demux(name, register, flags, frames=args.frames, runs=args.runs)
+        results.append(r)
+        print(
+            f"  {r.name:<16s} per flag={r.per_flag * 1e3:>8.2f}ms "
+            f"payload_as_columns={r.payload_as_columns * 1e3:>8.2f}ms "
+            f"df={r.parse_to_dataframe * 1e3:>8.2f}ms"
+        )
+
+    args.report.parent.mkdir(parents=True, exist_ok=True)
+    args.report.write_text(build_report(results, runs=args.runs))
+    print(f"\nReport written to {args.report}")
+
+
+if __name__ == "__main__":
+    main()
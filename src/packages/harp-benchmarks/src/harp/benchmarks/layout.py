@@ -0,0 +1,140 @@
+"""Time and trace the memory of each DataFrame ``layout`` of ``parse_to_dataframe``.
+
+Every layout parses the same in-memory frames. Time is the mean of the runs; peak
+memory is the most held at once while parsing, and retained memory what the
+DataFrame keeps alive once the frames are released, both traced with
+``tracemalloc``, which numpy reports its buffers to. ``DataFrame.sum`` is timed on
+the result too, as an operation reading every column.
+"""
+
+import argparse
+import gc
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, get_args
+
+import numpy as np
+from harp.benchmarks._registers import ARTIFACTS_DIR, mean_time, random_corpus
+from harp.benchmarks.register_models import AnalogData, ComplexConfiguration, StartPulseTrain
+from harp.data import Layout, parse_to_dataframe
+from harp.protocol import RegisterBase
+
+LAYOUT_REPORT_PATH = ARTIFACTS_DIR / "layout.md"
+
+LAYOUT_REGISTERS: list[type[RegisterBase[Any]]] = [
+    AnalogData,
+    ComplexConfiguration,
+    StartPulseTrain,
+]
+"""A homogeneous float register, and two mixing dtypes, decoders and masked fields."""
+
+_MIB = 1 << 20
+
+
+@dataclass
+class LayoutResult:
+    """Mean timings (seconds) and traced memory (bytes) of one register and layout."""
+
+    name: str
+    layout: str
+    frames: int
+    blocks: int
+    parse: float
+    peak: int
+    retained: int
+    sum: float
+
+
+def _traced(register: type[RegisterBase[Any]], corpus: bytes, layout: Layout) -> tuple[int, int]:
+    """The peak and retained memory of parsing a private copy of ``corpus``."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        raw = bytearray(corpus)  # the frames as read, traced and released below
+        base = tracemalloc.get_traced_memory()[0]
+        df = parse_to_dataframe(register, raw, layout=layout)
+        del raw
+        gc.collect()
+        retained, peak = tracemalloc.get_traced_memory()
+        del df
+    finally:
+        tracemalloc.stop()
+    return peak - base + len(corpus), retained
+
+
+def _sum(df: Any) -> object:
+    with np.errstate(all="ignore"):  # random float bytes overflow, which is not timed apart
+        return df.sum(numeric_only=True)
+
+
+def benchmark_layout(
+    register: type[RegisterBase[Any]], layout: Layout, *, frames: int, runs: int
+) -> LayoutResult:
+    corpus = random_corpus(register, frames)
+    df = parse_to_dataframe(register, corpus, layout=layout)
+    peak, retained = _traced(register, corpus, layout)
+    return LayoutResult(
+        name=register.__name__,
+        layout=layout,
+        frames=frames,
+        blocks=df._mgr.nblocks,
+        parse=mean_time(lambda: parse_to_dataframe(register, corpus, layout=layout), runs=runs),
+        peak=peak,
+        retained=retained,
+        sum=mean_time(lambda: _sum(df), runs=runs),
+    )
+
+
+def build_report(results: list[LayoutResult], *, runs: int) -> str:
+    lines = [
+        "# DataFrame layout benchmark\n",
+        (
+            f"`parse_to_dataframe` of in-memory frames with each `layout`, mean of {runs} "
+            "runs (1 warm-up discarded). Peak counts the frames as read; retained is "
+            "what the DataFrame holds once they are released.\n"
+        ),
+        (
+            "| Register | Layout | Frames | Blocks | parse (ms) | peak (MiB) | retained (MiB) "
+            "| sum (ms) |"
+        ),
+        "| --- | --- | ---: | ---: | ---: | ---: | ---: | ---: |",
+    ]
+    for r in results:
+        lines.append(
+            f"| {r.name} | {r.layout} | {r.frames:,} | {r.blocks} | {r.parse * 1e3:.2f} | "
+            f"{r.peak / _MIB:.1f} | {r.retained / _MIB:.1f} | {r.sum * 1e3:.2f} |"
+        )
+    lines.append("")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--frames", type=int, default=1_000_000, help="frames per register (default: 1,000,000)"
+    )
+    parser.add_argument(
+        "--runs", type=int, default=10, help="repeats per measurement (default: 10)"
+    )
+    parser.add_argument("--report", type=Path, default=LAYOUT_REPORT_PATH)
+    args = parser.parse_args()
+
+    results: list[LayoutResult] = []
+    for register in LAYOUT_REGISTERS:
+        for layout in get_args(Layout):
+            r = benchmark_layout(register, layout, frames=args.frames, runs=args.runs)
+            results.append(r)
+            print(
+                f"  {r.name:<22s} {r.layout:<8s} parse={r.parse * 1e3:>8.2f}ms "
+                f"peak={r.peak / _MIB:>7.1f}MiB retained={r.retained / _MIB:>7.1f}MiB "
+                f"sum={r.sum * 1e3:>7.2f}ms"
+            )
+
+    args.report.parent.mkdir(parents=True, exist_ok=True)
+    args.report.write_text(build_report(results, runs=args.runs))
+    print(f"\nReport written to {args.report}")
+
+
+if __name__ == "__main__":
+    main()
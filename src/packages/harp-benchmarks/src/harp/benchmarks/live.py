@@ -0,0 +1,287 @@
+"""Time the live device path over an in-process loopback transport.
+
+No serial port is involved: :class:`LoopbackTransport` hands a :class:`Device` the
+bytes queued on it and answers each request with a canned reply, so what is timed is
+the client itself. Four paths are measured:
+
+- ``HarpFramer`` throughput, feeding the same frames in fragments of several sizes,
+  as a serial port delivers them, and draining every complete frame after each feed.
+- Request round trips, ``Device.read`` of ``WhoAmI`` answered by the loopback.
+- Event delivery, from the bytes reaching the transport to the handler of a
+  subscription, one event at a time for latency and in a burst for throughput.
+- Subscription fan-out, a burst delivered to 1, 4 and 16 handlers of one register.
+
+Latencies are wall-clock percentiles over every sample of every run. CPU per frame is
+the process time spent, over every thread, divided by the frames handled.
+"""
+
+import argparse
+import queue
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter, perf_counter_ns, process_time
+from typing import Any
+
+import numpy as np
+from harp.benchmarks._registers import ARTIFACTS_DIR
+from harp.benchmarks.register_models import AnalogData
+from harp.device.client import Device, HarpFramer
+from harp.device.core import WhoAmI
+from harp.protocol import HarpMessage, MessageType
+
+LIVE_REPORT_PATH = ARTIFACTS_DIR / "live.md"
+
+FRAGMENT_SIZES = (1, 7, 64, 4096)
+"""The sizes, in bytes, of the fragments the framer is fed."""
+
+FANOUT_SUBSCRIBERS = (1, 4, 16)
+"""The numbers of handlers subscribed to one register for the fan-out measurement."""
+
+_WAIT_TIMEOUT = 10.0  # seconds; a delivery slower than this is a failure, not a sample
+
+
+class LoopbackTransport:
+    """An ``ITransport`` delivering queued bytes, which answers requests through ``reply``.
+
+    ``reply`` maps each written request frame to the bytes the device sends back;
+    :meth:`push` queues bytes as if the device had emitted them unprompted.
+    """
+
+    def __init__(self, reply: Callable[[bytes], bytes] | None = None) -> None:
+        self._reply = reply
+        self._inbox: queue.SimpleQueue[bytes] = queue.SimpleQueue()
+
+    def open(self) -> None: ...
+
+    def close(self) -> None: ...
+
+    def write(self, data: bytes) -> None:
+        if self._reply is not None:
+            self._inbox.put(self._reply(data))
+
+    def push(self, data: bytes) -> None:
+        self._inbox.put(data)
+
+    def read(self) -> bytes:
+        try:
+            return self._inbox.get(timeout=0.01)
+        except queue.Empty:
+            return b""
+
+
+@dataclass
+class LiveResult:
+    """Throughput, latency percentiles and CPU (seconds) of one live path."""
+
+    path: str
+    case: str
+    frames: int
+    per_second: float
+    cpu: float
+    p50: float | None = None
+    p99: float | None = None
+
+
+def _percentiles(samples_ns: list[int]) -> tuple[float, float]:
+    p50, p99 = np.percentile(np.asarray(samples_ns, dtype=np.float64) * 1e-9, [50, 99])
+    return float(p50), float(p99)
+
+
+def _event_frames(frames: int) -> list[bytes]:
+    """``frames`` separate event frames of ``AnalogData``, a struct payload of six floats."""
+    values = np.arange(frames * 6, dtype=np.float32).reshape(frames, 6)
+    raw = bytes(AnalogData.format_bulk(values, timestamps=np.arange(frames) * 1e-3))
+    stride = len(raw) // frames
+    return [raw[i : i + stride] for i in range(0, len(raw), stride)]
+
+
+def benchmark_framer(*, frames: int, runs: int) -> list[LiveResult]:
+    """Feed the framer the same frames in fragments of each of :data:`FRAGMENT_SIZES`."""
+    raw = b"".join(_event_frames(frames))
+    results: list[LiveResult] = []
+    for size in FRAGMENT_SIZES:
+        fragments = [raw[i : i + size] for i in range(0, len(raw), size)]
+        wall = cpu = 0.0
+        for run in range(runs + 1):  # run 0 warms up and is not measured
+            framer = HarpFramer()
+            count = 0
+            c0, t0 = process_time(), perf_counter()
+            for fragment in fragments:
+                framer.feed(fragment)
+                for _msg in framer.frames():
+                    count += 1
+            elapsed, spent = perf_counter() - t0, process_time() - c0
+            assert count == frames, f"the framer found {count} of {frames} frames"
+            if run > 0:
+                wall, cpu = wall + elapsed, cpu + spent
+        results.append(
+            LiveResult(
+                path="HarpFramer",
+                case=f"{size} B fragments",
+                frames=frames * runs,
+                per_second=frames * runs / wall,
+                cpu=cpu / (frames * runs),
+            )
+        )
+    return results
+
+
+def benchmark_requests(*, frames: int, runs: int) -> LiveResult:
+    """Time ``Device.read`` round trips, each answered at once by the loopback."""
+    reply = bytes(WhoAmI.format(np.uint16(7), message_type=MessageType.Read))
+    samples: list[int] = []
+    with Device(LoopbackTransport(lambda _request: reply)) as device:
+        for _ in range(frames):  # warm-up, not measured
+            device.read(WhoAmI)
+        c0, t0 = process_time(), perf_counter()
+        for _ in range(frames * runs):
+            start = perf_counter_ns()
+            device.read(WhoAmI)
+            samples.append(perf_counter_ns() - start)
+        wall, cpu = perf_counter() - t0, process_time() - c0
+    p50, p99 = _percentiles(samples)
+    return LiveResult(
+        path="Device.read",
+        case="WhoAmI round trip",
+        frames=len(samples),
+        per_second=len(samples) / wall,
+        cpu=cpu / len(samples),
+        p50=p50,
+        p99=p99,
+    )
+
+
+class _Receiver:
+    """Subscription handlers recording when each event arrives, counting them as they come."""
+
+    def __init__(self, expected: int) -> None:
+        self.expected = expected
+        self.arrivals: list[int] = []
+        self.done = threading.Event()
+        self.delivered = threading.Semaphore(0)
+
+    def record(self, _message: HarpMessage[Any]) -> None:
+        self.arrivals.append(perf_counter_ns())
+        self.delivered.release()
+        if len(self.arrivals) == self.expected:
+            self.done.set()
+
+    def count(self, _message: HarpMessage[Any]) -> None:
+        pass
+
+
+def _deliver(
+    events: list[bytes], *, subscribers: int, burst: bool
+) -> tuple[list[int], float, float]:
+    """Push ``events`` to a device and return the latencies, wall time and CPU time.
+
+    One event at a time waits for its delivery before pushing the next, so each latency
+    is that of an idle device; a burst pushes every event in one chunk.
+    """
+    transport = LoopbackTransport()
+    receiver = _Receiver(len(events))
+    with Device(transport) as device:
+        # The recording handler is subscribed last, so it sees each event after every other.
+        for _ in range(subscribers - 1):
+            device.subscribe(AnalogData, receiver.count)
+        device.subscribe(AnalogData, receiver.record)
+        sent: list[int] = []
+        c0, t0 = process_time(), perf_counter()
+        if burst:
+            sent = [perf_counter_ns()] * len(events)
+            transport.push(b"".join(events))
+        else:
+            for event in events:
+                sent.append(perf_counter_ns())
+                transport.push(event)
+                if not receiver.delivered.acquire(timeout=_WAIT_TIMEOUT):
+                    raise TimeoutError("An event was not delivered.")
+        if not receiver.done.wait(_WAIT_TIMEOUT):
+            raise TimeoutError(f"{len(receiver.arrivals)} of {len(events)} events delivered.")
+        wall, cpu = perf_counter() - t0, process_time() - c0
+    return [a - s for a, s in zip(receiver.arrivals, sent)], wall, cpu
+
+
+def benchmark_events(
+    *, frames: int, runs: int, subscribers: int = 1, burst: bool = False, path: str = "subscribe"
+) -> LiveResult:
+    """Time delivering ``frames`` events to ``subscribers`` handlers of one register."""
+    events = _event_frames(frames)
+    _deliver(events, subscribers=subscribers, burst=burst)  # warm-up, not measured
+    samples: list[int] = []
+    wall = cpu = 0.0
+    for _ in range(runs):
+        latencies, elapsed, spent = _deliver(events, subscribers=subscribers, burst=burst)
+        samples += latencies
+        wall, cpu = wall + elapsed, cpu + spent
+    p50, p99 = _percentiles(samples)
+    handlers = "handler" if subscribers == 1 else "handlers"
+    return LiveResult(
+        path=path,
+        case=f"{'burst' if burst else 'one at a time'}, {subscribers} {handlers}",
+        frames=frames * runs,
+        per_second=frames * runs / wall,
+        cpu=cpu / (frames * runs),
+        p50=p50,
+        p99=p99,
+    )
+
+
+def _us(seconds: float | None) -> str:
+    return "" if seconds is None else f"{seconds * 1e6:.1f}"
+
+
+def build_report(results: list[LiveResult], *, runs: int) -> str:
+    lines = [
+        "# Live device path benchmark\n",
+        (
+            f"Over an in-process loopback transport, {runs} runs each (1 warm-up "
+            "discarded). Latencies are percentiles over every sample; a burst latency "
+            "includes the wait behind earlier events. CPU counts every thread.\n"
+        ),
+        "| Path | Case | Frames | frames/s | p50 (µs) | p99 (µs) | CPU/frame (µs) |",
+        "| --- | --- | ---: | ---: | ---: | ---: | ---: |",
+    ]
+    for r in results:
+        lines.append(
+            f"| {r.path} | {r.case} | {r.frames:,} | {r.per_second:,.0f} | {_us(r.p50)} | "
+            f"{_us(r.p99)} | {_us(r.cpu)} |"
+        )
+    lines.append("")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--frames", type=int, default=10_000, help="frames or requests per run (default: 10,000)"
+    )
+    parser.add_argument("--runs", type=int, default=5, help="repeats per measurement (default: 5)")
+    parser.add_argument("--report", type=Path, default=LIVE_REPORT_PATH)
+    args = parser.parse_args()
+
+    frames, runs = args.frames, args.runs
+    results = benchmark_framer(frames=frames, runs=runs)
+    results.append(benchmark_requests(frames=frames, runs=runs))
+    results.append(benchmark_events(frames=frames, runs=runs))
+    for subscribers in FANOUT_SUBSCRIBERS:
+        results.append(
+            benchmark_events(
+                frames=frames, runs=runs, subscribers=subscribers, burst=True, path="fan-out"
+            )
+        )
+    for r in results:
+        print(
+            f"  {r.path:<12s} {r.case:<28s} {r.per_second:>12,.0f} frames/s "
+            f"p50={_us(r.p50) or '-':>8s}us p99={_us(r.p99) or '-':>8s}us cpu={_us(r.cpu):>6s}us"
+        )
+
+    args.report.parent.mkdir(parents=True, exist_ok=True)
+    args.report.write_text(build_report(results, runs=runs))
+    print(f"\nReport written to {args.report}")
+
+
+if __name__ == "__main__":
+    main()
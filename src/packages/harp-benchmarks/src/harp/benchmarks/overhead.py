@@ -0,0 +1,314 @@
+"""Time ``payload_as_columns`` per call on small and large batches, and ``parse`` per message.
+
+A live event window holds a handful of frames, so the fixed cost of each call, not
+the NumPy work proportional to the rows, decides its throughput. Each register is
+decoded from batches of 1, 100 and 10,000 random records built up front, so only
+``payload_as_columns`` is timed. The 1-row figure is the per-call overhead.
+
+Single messages of scalar registers are parsed too, against decoding the payload
+through ``np.frombuffer``, the path ``RegisterBase.parse`` takes for other payloads.
+
+``GroupMask`` enum fields of 8 and 16-bit slots are decoded from large batches, with
+every code defined and with a share of undefined codes as noisy hardware produces,
+against the masked lookup and ``np.unique`` of undefined codes it replaced.
+"""
+
+import argparse
+import enum
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+
+import numpy as np
+from harp.benchmarks._registers import ARTIFACTS_DIR
+from harp.benchmarks.register_models import (
+    AnalogData,
+    ComplexConfiguration,
+    Counter0,
+    CustomMemberConverter,
+    DigitalInputs,
+    EncoderMode,
+    EncoderModeMask,
+    EncoderModePayload,
+    PortDIOSet,
+    PwmPort,
+    StartPulseTrain,
+)
+from harp.protocol import AnonymousPayload, GroupMask, HarpMessage, RegisterBase, RegisterFloat
+from numpy.typing import NDArray
+
+OVERHEAD_REPORT_PATH = ARTIFACTS_DIR / "overhead.md"
+
+BATCH_ROWS = (1, 100, 10_000)
+"""The batch sizes each register is decoded at."""
+
+OVERHEAD_REGISTERS: list[type[RegisterBase[Any]]] = [
+    AnalogData,
+    ComplexConfiguration,
+    CustomMemberConverter,
+    StartPulseTrain,
+    EncoderMode,
+    PortDIOSet,
+]
+"""Registers spanning plain, sub-array, converted, masked, enum and flag fields."""
+
+PARSE_REGISTERS: list[tuple[str, type[RegisterBase[Any]], Any]] = [
+    ("DigitalInputs", DigitalInputs, 0x5A),
+    ("Counter0", Counter0, -123_456),
+    ("AnalogInput", RegisterFloat(0x2A), 1.5),
+]
+"""Scalar registers parsed one message at a time, with the value each message carries."""
+
+
+class PwmPortPayload(AnonymousPayload[np.uint16]):
+    """A ``PwmPort`` group mask in the middle of a 16-bit element, other bits as noise."""
+
+    __value__: PwmPort = GroupMask(enum=PwmPort, mask=0x0FF0)
+
+
+GROUPMASK_PAYLOADS: list[tuple[str, type[AnonymousPayload[Any]], type[enum.IntEnum], int]] = [
+    ("EncoderMode (u8)", EncoderModePayload, EncoderModeMask, 0xFF),
+    ("PwmPort (u16)", PwmPortPayload, PwmPort, 0x0FF0),
+]
+"""Payloads of one ``GroupMask`` field, with its enum and mask, decoded with and without
+undefined codes."""
+
+UNDEFINED_SHARES = (0.0, 0.01, 0.2)
+"""The shares of rows holding an undefined code."""
+
+GROUPMASK_ROWS = 1_000_000
+
+
+@dataclass
+class OverheadResult:
+    """Best per-call time (seconds) of ``payload_as_columns`` at each batch size."""
+
+    name: str
+    columns: int
+    per_call: dict[int, float]
+
+
+@dataclass
+class ParseResult:
+    """Best time (seconds) of parsing one message of a scalar register."""
+
+    name: str
+    numpy: float
+    parse: float
+
+
+def _per_call(fn: Callable[[], object], *, calls: int, runs: int) -> float:
+    fn()  # warm-up, not measured
+    best = float("inf")
+    for _ in range(runs):
+        t0 = perf_counter()
+        for _ in range(calls):
+            fn()
+        best = min(best, (perf_counter() - t0) / calls)
+    return best
+
+
+def _batch(register: type[RegisterBase[Any]], rows: int) -> Any:
+    payload_class = register.payload_class
+    dtype = payload_class.payload_dtype
+    rng = np.random.default_rng(register.address)
+    records = rng.integers(0, 256, size=rows * dtype.itemsize, dtype=np.uint8).view(dtype)
+    return payload_class._from_array(records)
+
+
+def benchmark_overhead(
+    register: type[RegisterBase[Any]], *, calls: int, runs: int
+) -> OverheadResult:
+    per_call: dict[int, float] = {}
+    for rows in BATCH_ROWS:
+        batch = _batch(register, rows)
+        # Keep each measurement near the same wall time whatever the batch size.
+        n = max(1, calls * BATCH_ROWS[0] // max(1, rows // 100))
+        per_call[rows] = _per_call(batch.payload_as_columns, calls=n, runs=runs)
+    columns = len(_batch(register, 1).payload_as_columns())
+    return OverheadResult(name=register.__name__, columns=columns, per_call=per_call)
+
+
+def _numpy_parse(register: type[RegisterBase[Any]], message: HarpMessage) -> Any:
+    """The reference decode: the payload viewed as a one-record array, then unwrapped."""
+    payload_class = register.payload_class
+    record = np.frombuffer(message.payload_bytes, dtype=payload_class.payload_dtype, count=1)[0]
+    return payload_class._unwrap(record)
+
+
+def benchmark_parse(
+    name: str, register: type[RegisterBase[Any]], value: Any, *, calls: int, runs: int
+) -> ParseResult:
+    message = HarpMessage.parse(register.format(value, timestamp=1.0))
+    return ParseResult(
+        name=name,
+        numpy=_per_call(lambda: _numpy_parse(register, message), calls=calls, runs=runs),
+        parse=_per_call(lambda: register.parse(message), calls=calls, runs=runs),
+    )
+
+
+@dataclass
+class GroupMaskResult:
+    """Best time (seconds) of decoding a large batch of one ``GroupMask`` field."""
+
+    name: str
+    undefined: float
+    reference: float
+    decode: float
+
+
+def _groupmask_elements(
+    elem: np.dtype, members: type[enum.IntEnum], mask: int, undefined: float
+) -> "NDArray[Any]":
+    """``GROUPMASK_ROWS`` defined codes, ``undefined`` of them replaced by undefined ones,
+    with random bits outside the mask."""
+    shift = (mask & -mask).bit_length() - 1
+    rng = np.random.default_rng(mask)
+    codes = rng.choice([int(m) for m in members], GROUPMASK_ROWS)
+    gaps = np.setdiff1d(np.arange((mask >> shift) + 1), codes)
+    noisy = rng.random(GROUPMASK_ROWS) < undefined
+    codes[noisy] = rng.choice(gaps, int(noisy.sum()))
+    noise = rng.integers(0, np.iinfo(elem).max + 1, GROUPMASK_ROWS) & ~mask
+    return ((codes << shift) | noise).astype(elem)
+
+
+def _reference_groupmask(
+    elements: "NDArray[Any]", members: type[enum.IntEnum], mask: int
+) -> tuple["NDArray[Any]", list[Any]]:
+    """The former decode: mask, shift, a lookup, then ``np.unique`` of undefined codes."""
+    shift = (mask & -mask).bit_length() - 1
+    categories = [m.name for m in members]
+    lookup = np.full(max(int(m) for m in members) + 1, -1, dtype=np.int8)
+    lookup[[int(m) for m in members]] = np.arange(len(categories))
+    raw = (elements & mask) >> shift
+    codes = np.where(raw < len(lookup), lookup.take(raw, mode="clip"), -1)
+    undefined = codes < 0
+    if not undefined.any():
+        return codes, categories
+    codes = codes.astype(np.intp)
+    extras = np.unique(raw[undefined])
+    codes[undefined] = len(categories) + np.searchsorted(extras, raw[undefined])
+    return codes, categories + extras.tolist()
+
+
+def benchmark_groupmask(
+    name: str,
+    payload_class: type[AnonymousPayload[Any]],
+    members: type[enum.IntEnum],
+    mask: int,
+    undefined: float,
+    *,
+    runs: int,
+) -> GroupMaskResult:
+    elements = _groupmask_elements(payload_class._elem_dtype, members, mask, undefined)
+    batch = payload_class._from_array(elements.view(payload_class.payload_dtype))
+    return GroupMaskResult(
+        name=name,
+        undefined=undefined,
+        reference=_per_call(
+            lambda: _reference_groupmask(elements, members, mask), calls=1, runs=runs
+        ),
+        decode=_per_call(batch.payload_as_columns, calls=1, runs=runs),
+    )
+
+
+def build_report(
+    results: list[OverheadResult],
+    parses: list[ParseResult],
+    groupmasks: list[GroupMaskResult],
+    *,
+    runs: int,
+) -> str:
+    heads = " | ".join(f"{rows:,} row{'s' if rows > 1 else ''} (µs)" for rows in BATCH_ROWS)
+    lines = [
+        "# `payload_as_columns` per-call benchmark\n",
+        (
+            f"Decoding batches of random records, best of {runs} runs (1 warm-up "
+            "discarded). The 1-row time is the fixed cost of a call; `ns/row` is the "
+            f"marginal cost of a row at {BATCH_ROWS[-1]:,} rows.\n"
+        ),
+        f"| Register | Columns | {heads} | ns/row |",
+        "| --- | ---: |" + " ---: |" * len(BATCH_ROWS) + " ---: |",
+    ]
+    first, last = BATCH_ROWS[0], BATCH_ROWS[-1]
+    for r in results:
+        times = " | ".join(f"{r.per_call[rows] * 1e6:.1f}" for rows in BATCH_ROWS)
+        marginal = (r.per_call[last] - r.per_call[first]) / (last - first)
+        lines.append(f"| {r.name} | {r.columns} | {times} | {marginal * 1e9:.1f} |")
+    lines += [
+        "",
+        "## `parse`, one message of a scalar register\n",
+        (
+            "`np.frombuffer` decodes the payload as a one-record array and unwraps it, "
+            "the reference `parse` is measured against.\n"
+        ),
+        "| Register | np.frombuffer (ns) | parse (ns) | speedup |",
+        "| --- | ---: | ---: | ---: |",
+    ]
+    for r in parses:
+        lines.append(
+            f"| {r.name} | {r.numpy * 1e9:.0f} | {r.parse * 1e9:.0f} | {r.numpy / r.parse:.1f}x |"
+        )
+    lines += [
+        "",
+        f"## `GroupMask` decode, {GROUPMASK_ROWS:,} rows\n",
+        (
+            "The reference masks, shifts and looks up each code, then sorts the undefined "
+            "ones with `np.unique`; `payload_as_columns` takes each element through a "
+            "dense code table.\n"
+        ),
+        "| Field | undefined | reference (ms) | payload_as_columns (ms) | speedup |",
+        "| --- | ---: | ---: | ---: | ---: |",
+    ]
+    for r in groupmasks:
+        lines.append(
+            f"| {r.name} | {r.undefined:.0%} | {r.reference * 1e3:.2f} | "
+            f"{r.decode * 1e3:.2f} | {r.reference / r.decode:.1f}x |"
+        )
+    lines.append("")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--calls", type=int, default=2_000, help="calls per run on 1-row batches (default: 2,000)"
+    )
+    parser.add_argument("--runs", type=int, default=7, help="runs per measurement (default: 7)")
+    parser.add_argument("--report", type=Path, default=OVERHEAD_REPORT_PATH)
+    args = parser.parse_args()
+
+    results: list[OverheadResult] = []
+    for register in OVERHEAD_REGISTERS:
+        r = benchmark_overhead(register, calls=args.calls, runs=args.runs)
+        results.append(r)
+        times = " ".join(f"{rows:>6,}={t * 1e6:>8.1f}µs" for rows, t in r.per_call.items())
+        print(f"  {r.name:<22s} {times}")
+
+    parses: list[ParseResult] = []
+    for name, register, value in PARSE_REGISTERS:
+        r = benchmark_parse(name, register, value, calls=args.calls * 10, runs=args.runs)
+        parses.append(r)
+        print(
+            f"  {r.name:<22s} np.frombuffer={r.numpy * 1e9:>6.0f}ns parse={r.parse * 1e9:>6.0f}ns"
+        )
+
+    groupmasks: list[GroupMaskResult] = []
+    for name, payload_class, members, mask in GROUPMASK_PAYLOADS:
+        for undefined in UNDEFINED_SHARES:
+            r = benchmark_groupmask(name, payload_class, members, mask, undefined, runs=args.runs)
+            groupmasks.append(r)
+            print(
+                f"  {r.name:<18s} {r.undefined:>4.0%} undefined reference="
+                f"{r.reference * 1e3:>7.2f}ms decode={r.decode * 1e3:>7.2f}ms"
+            )
+
+    args.report.parent.mkdir(parents=True, exist_ok=True)
+    args.report.write_text(build_report(results, parses, groupmasks, runs=args.runs))
+    print(f"\nReport written to {args.report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""Sweep corpus sizes, chunk sizes and worker counts to chart how parsing scales.
+
+``parse_to_dataframe`` of in-memory frames is timed three ways:
+
+- over corpora from 10^3 frames up, so the throughput curve shows where the frames
+  stop fitting the caches and per-call overhead stops mattering;
+- over one corpus split into chunks of several sizes, parsed one after the other,
+  as a reader streaming a long recording chunk by chunk would;
+- over the same corpus split evenly between 1 to N threads parsing concurrently. The
+  library has no parallel read path of its own, so this measures what one would gain,
+  as parallel efficiency: the speedup over one worker divided by the workers.
+
+Corpora of 10^8 frames take gigabytes, so the default sweep stops at 10^7; pass
+``--sizes`` to go further.
+"""
+
+import argparse
+import itertools
+import os
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from harp.benchmarks._registers import ARTIFACTS_DIR, BENCHMARK_REGISTERS, mean_time, random_corpus
+from harp.data import parse_to_dataframe
+from harp.protocol import RegisterBase
+
+SCALING_REPORT_PATH = ARTIFACTS_DIR / "scaling.md"
+
+CORPUS_SIZES = (10**3, 10**4, 10**5, 10**6, 10**7)
+"""The corpus sizes, in frames, swept by default."""
+
+CHUNK_SIZES = (10**3, 10**4, 10**5, 10**6)
+"""The chunk sizes, in frames, a corpus is streamed in."""
+
+WORKER_COUNTS = (1, 2, 4, 8)
+"""The numbers of threads a corpus is split between."""
+
+_MIB = 1 << 20
+
+
+@dataclass
+class ScalingResult:
+    """The mean time (seconds) of parsing ``frames`` frames at one point of a sweep."""
+
+    sweep: str
+    value: int
+    frames: int
+    file_bytes: int
+    seconds: float
+
+    @property
+    def frames_per_s(self) -> float:
+        return self.frames / self.seconds
+
+    @property
+    def mib_per_s(self) -> float:
+        return self.file_bytes / self.seconds / _MIB
+
+
+def _split(raw: bytes, parts: int, *, frames: int) -> list[bytes]:
+    """``raw`` cut into ``parts`` runs of whole frames, as even as the frames allow."""
+    stride = len(raw) // frames
+    bounds = np.linspace(0, frames, parts + 1).astype(int) * stride
+    return [raw[start:end] for start, end in itertools.pairwise(bounds) if end > start]
+
+
+def sweep_sizes(
+    register: type[RegisterBase[Any]], sizes: Sequence[int], *, runs: int
+) -> list[ScalingResult]:
+    """Parse whole corpora of each of ``sizes`` frames."""
+    results: list[ScalingResult] = []
+    for frames in sizes:
+        raw = random_corpus(register, frames)
+        seconds = mean_time(lambda raw=raw: parse_to_dataframe(register, raw), runs=runs)
+        results.append(ScalingResult("corpus size", frames, frames, len(raw), seconds))
+    return results
+
+
+def sweep_chunks(
+    register: type[RegisterBase[Any]],
+    raw: bytes,
+    chunk_sizes: Sequence[int],
+    *,
+    frames: int,
+    runs: int,
+) -> list[ScalingResult]:
+    """Parse ``raw`` one chunk of each of ``chunk_sizes`` frames at a time."""
+    results: list[ScalingResult] = []
+    for size in chunk_sizes:
+        chunks = _split(raw, max(1, -(-frames // size)), frames=frames)
+
+        def _stream(chunks: list[bytes] = chunks) -> None:
+            for chunk in chunks:
+                parse_to_dataframe(register, chunk)
+
+        seconds = mean_time(_stream, runs=runs)
+        results.append(ScalingResult("chunk size", size, frames, len(raw), seconds))
+    return results
+
+
+def sweep_workers(
+    register: type[RegisterBase[Any]], raw: bytes, workers: Sequence[int], *, frames: int, runs: int
+) -> list[ScalingResult]:
+    """Parse ``raw`` split evenly between each of ``workers`` threads."""
+    results: list[ScalingResult] = []
+    for count in workers:
+        chunks = _split(raw, count, frames=frames)
+        with ThreadPoolExecutor(count) as pool:
+            seconds = mean_time(
+                lambda chunks=chunks, pool=pool: list(
+                    pool.map(lambda c: parse_to_dataframe(register, c), chunks)
+                ),
+                runs=runs,
+            )
+        results.append(ScalingResult("workers", count, frames, len(raw), seconds))
+    return results
+
+
+def build_report(results: list[ScalingResult], *, register: str, frames: int, runs: int) -> str:
+    lines = [
+        "# Scaling benchmark\n",
+        (
+            f"`parse_to_dataframe` of in-memory `{register}` frames, mean of {runs} runs "
+            f"(1 warm-up discarded), on {os.cpu_count()} logical CPUs. The chunk and "
+            f"worker sweeps parse one corpus of {frames:,} frames.\n"
+        ),
+    ]
+    for sweep in ("corpus size", "chunk size", "workers"):
+        rows = [r for r in results if r.sweep == sweep]
+        if not rows:
+            continue
+        first = rows[0]
+        efficiency = sweep == "workers"
+        lines.append(f"## {sweep.capitalize()}\n")
+        header = f"| {sweep.capitalize()} | Frames | mean (ms) | Mframes/s | MiB/s |"
+        rule = "| ---: | ---: | ---: | ---: | ---: |"
+        lines.append(header + (" speedup | efficiency |" if efficiency else ""))
+        lines.append(rule + (" ---: | ---: |" if efficiency else ""))
+        for r in rows:
+            line = (
+                f"| {r.value:,} | {r.frames:,} | {r.seconds * 1e3:.2f} | "
+                f"{r.frames_per_s / 1e6:.2f} | {r.mib_per_s:,.0f} |"
+            )
+            if efficiency:
+                speedup = first.seconds / r.seconds
+                line += f" {speedup:.2f}x | {speedup / r.value:.0%} |"
+            lines.append(line)
+        lines.append("")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    names = [r.name for r in BENCHMARK_REGISTERS if r.timestamped]
+    parser.add_argument(
+        "--register",
+        choices=names,
+        default="AnalogData",
+        help="register parsed (default: AnalogData)",
+    )
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=list(CORPUS_SIZES), help="corpus sizes in frames"
+    )
+    parser.add_argument(
+        "--chunks", type=int, nargs="+", default=list(CHUNK_SIZES), help="chunk sizes in frames"
+    )
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=list(WORKER_COUNTS), help="thread counts"
+    )
+    parser.add_argument(
+        "--frames",
+        type=int,
+        default=1_000_000,
+        help="frames of the chunk and worker sweeps (default: 1,000,000)",
+    )
+    parser.add_argument("--runs", type=int, default=5, help="repeats per measurement (default: 5)")
+    parser.add_argument("--report", type=Path, default=SCALING_REPORT_PATH)
+    args = parser.parse_args()
+
+    register = next(r.register for r in BENCHMARK_REGISTERS if r.name == args.register)
+    results = sweep_sizes(register, args.sizes, runs=args.runs)
+    raw = random_corpus(register, args.frames)
+    results += sweep_chunks(register, raw, args.chunks, frames=args.frames, runs=args.runs)
+    results += sweep_workers(register, raw, args.workers, frames=args.frames, runs=args.runs)
+    for r in results:
+        print(
+            f"  {r.sweep:<12s} {r.value:>12,} {r.frames_per_s / 1e6:>8.2f} Mframes/s "
+            f"{r.mib_per_s:>8,.0f} MiB/s"
+        )
+
+    args.report.parent.mkdir(parents=True, exist_ok=True)
+    args.report.write_text(
+        build_report(results, register=args.register, frames=args.frames, runs=args.runs)
+    )
+    print(f"\nReport written to {args.report}")
+
+
+if __name__ == "__main__":
+    main()
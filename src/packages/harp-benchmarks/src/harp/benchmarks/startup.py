@@ -0,0 +1,126 @@
+"""Time building a device module from a ``device.yml`` against importing a generated one.
+
+Every run starts from nothing, with no cached declarations: ``create_device_module`` is
+called with ``cache=False``, and the generated package is executed as a fresh module
+from its compiled bytecode, as a new process importing an installed package would.
+``harp`` itself is already imported, so only the cost of the device declarations is timed.
+"""
+
+import argparse
+import compileall
+import importlib.util
+import sys
+import tempfile
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from statistics import mean, stdev
+from time import perf_counter
+
+from harp.benchmarks._registers import ARTIFACTS_DIR
+from harp.device.schema import create_device_module, write_device_package
+
+STARTUP_REPORT_PATH = ARTIFACTS_DIR / "startup.md"
+
+
+@dataclass
+class StartupResult:
+    """Per-run timings (seconds) of one way of obtaining the device module."""
+
+    name: str
+    min: float
+    mean: float
+    stdev: float
+
+
+def _time(name: str, fn: Callable[[], object], *, runs: int) -> StartupResult:
+    fn()  # warm-up for imports and the bytecode cache, not measured
+    samples: list[float] = []
+    for _ in range(runs):
+        t0 = perf_counter()
+        fn()
+        samples.append(perf_counter() - t0)
+    return StartupResult(
+        name=name,
+        min=min(samples),
+        mean=mean(samples),
+        stdev=stdev(samples) if len(samples) > 1 else 0.0,
+    )
+
+
+def _import_fresh(package: Path) -> None:
+    """Execute the generated package as a new module, through its bytecode cache."""
+    spec = importlib.util.spec_from_file_location(package.name, package / "__init__.py")
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[package.name] = module  # so a relative import of .converters resolves
+    try:
+        spec.loader.exec_module(module)
+    finally:
+        del sys.modules[package.name]
+
+
+def benchmark_startup(schema: Path, *, runs: int) -> list[StartupResult]:
+    """Time each way of obtaining the device module of ``schema``."""
+    text = schema.read_bytes()
+    with tempfile.TemporaryDirectory() as scratch:
+        cache_dir = Path(scratch) / "cache"
+        package = Path(scratch) / "harp_startup_device"
+        # Custom converters are decoded natively so the package imports nothing else.
+        write_device_package(text, package, require_converters=False)
+        # An installer compiles the package; without it every run would parse the source.
+        compileall.compile_dir(package, quiet=1)
+        return [
+            _time(
+                "create_device_module",
+                lambda: create_device_module(text, require_converters=False, cache=False),
+                runs=runs,
+            ),
+            _time(
+                "create_device_module, schema cached on disk",
+                lambda: create_device_module(
+                    text, require_converters=False, cache=False, cache_dir=cache_dir
+                ),
+                runs=runs,
+            ),
+            _time("import generated package", lambda: _import_fresh(package), runs=runs),
+        ]
+
+
+def build_report(results: list[StartupResult], *, schema: Path, runs: int) -> str:
+    baseline = results[0].mean
+    lines = [
+        "# Device module startup benchmark\n",
+        f"Obtaining the device module of `{schema}`, {runs} runs each (1 warm-up discarded).\n",
+        "| Path | mean (ms) | min (ms) | stdev (ms) | speedup |",
+        "| --- | ---: | ---: | ---: | ---: |",
+    ]
+    for r in results:
+        lines.append(
+            f"| {r.name} | {r.mean * 1e3:.2f} | {r.min * 1e3:.2f} | {r.stdev * 1e3:.2f} | "
+            f"{baseline / r.mean:.1f}x |"
+        )
+    lines.append("")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("schema", type=Path, help="path to the device.yml")
+    parser.add_argument(
+        "--runs", type=int, default=20, help="repeats per measurement (default: 20)"
+    )
+    parser.add_argument("--report", type=Path, default=STARTUP_REPORT_PATH)
+    args = parser.parse_args()
+
+    results = benchmark_startup(args.schema, runs=args.runs)
+    for r in results:
+        print(f"  {r.name:<44s} {r.mean * 1e3:>8.2f}ms")
+
+    args.report.parent.mkdir(parents=True, exist_ok=True)
+    args.report.write_text(build_report(results, schema=args.schema, runs=args.runs))
+    print(f"\nReport written to {args.report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,38 @@
+from ._align import AlignHow
+from ._catalog import Catalog, scan_catalog
 from ._dataset import DatasetReader, default_file_resolver, open_dataset
+from ._flags import BitMaskAccessor, FlagArray, FlagDtype
+from ._live import LiveTable
+from ._pyramid import Pyramid
 from ._read import read
-from ._reader import REFERENCE_EPOCH, parse_to_dataframe, payload_to_dataframe
+from ._reader import REFERENCE_EPOCH, Layout, TimeBound, parse_to_dataframe, payload_to_dataframe
+from ._resample import Aggregation
 from ._write import to_buffer, to_file
+from ._writer import DatasetWriter, FlushPolicy, RegisterWriter, create_dataset
 
 __all__ = [
     "read",
     "parse_to_dataframe",
     "payload_to_dataframe",
+    "Layout",
+    "TimeBound",
+    "AlignHow",
+    "Aggregation",
+    "FlagArray",
+    "FlagDtype",
+    "BitMaskAccessor",
     "to_buffer",
     "to_file",
     "DatasetReader",
     "open_dataset",
+    "DatasetWriter",
+    "RegisterWriter",
+    "create_dataset",
+    "FlushPolicy",
+    "LiveTable",
     "default_file_resolver",
+    "Catalog",
+    "scan_catalog",
+    "Pyramid",
     "REFERENCE_EPOCH",
 ]
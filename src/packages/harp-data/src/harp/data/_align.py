@@ -0,0 +1,212 @@
+"""Several registers on one time axis, merged on their integer timestamps."""
+
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+from typing import Any, Literal, cast
+
+import numpy as np
+import pandas as pd
+from harp.protocol import RegisterBase
+from numpy.typing import NDArray
+from pandas.api.extensions import take
+
+from ._reader import _DEFAULT_COLUMN_NAME, TimeBound, _column_values, _time_selection
+
+AlignHow = Literal["asof", "outer", "resample"]
+"""How :meth:`DatasetReader.read_aligned` puts several registers on one time axis.
+
+``"asof"`` keeps the frames of the first register as the axis, and gives every other
+register its latest frame at or before each of them. ``"outer"`` takes the union of the
+timestamps of every register, each row holding the registers with a frame at that time.
+``"resample"`` lays a regular axis of one ``period`` over the span of the registers, and
+gives every register its latest frame at or before each step.
+"""
+
+_ALIGN_HOWS = ("asof", "outer", "resample")
+
+
+def _duration_ns(duration: float | timedelta) -> int:
+    """A duration, in seconds or as a timedelta, as integer nanoseconds."""
+    if isinstance(duration, timedelta):
+        return pd.Timedelta(duration).value
+    return round(duration * 1e9)
+
+
+def timed_payload(
+    register: type[RegisterBase[Any]],
+    raw: bytes,
+    *,
+    epoch: datetime | None,
+    start: TimeBound | None,
+    end: TimeBound | None,
+) -> tuple[NDArray[np.int64], Any, NDArray[np.intp] | None]:
+    """The integer nanoseconds of the frames in ``raw`` in ``[start, end)``, in time order,
+    their payload, and the frame of the payload at each of those times, or ``None`` when
+    they are its frames in order. The payload is left undecoded, and is a view of ``raw``
+    when the frames selected are a contiguous run."""
+    _data, timestamps, _msg, payload = register.parse_bulk(raw, parse_timestamp=True)
+    if timestamps is None:
+        if len(payload) > 0:
+            raise ValueError(f"{register.__name__} frames carry no timestamp to align on.")
+        return np.empty(0, dtype=np.int64), payload, None
+    ns = timestamps.nanoseconds()
+    if start is not None or end is not None:
+        selected = _time_selection(ns, start, end, epoch)
+        ns = ns[selected]
+        payload = cast(Any, payload)._from_array(payload.payload_array[selected])
+    if len(ns) > 1 and not (ns[1:] >= ns[:-1]).all():
+        order = np.argsort(ns, kind="stable")
+        return ns[order], payload, order
+    return ns, payload, None
+
+
+def _asof_rows(ns: NDArray[np.int64], axis: NDArray[np.int64], tolerance: int | None) -> Any:
+    """The row of ``ns`` at or before each time of ``axis``, or -1 for none within tolerance.
+
+    Both are sorted, so when ``ns`` is the shorter, each of its frames is placed on the
+    axis and the rows counted up along it, which is a merge of the two rather than a
+    binary search per time of the axis.
+    """
+    if len(ns) < len(axis):
+        placed = np.searchsorted(axis, ns, side="left")
+        rows = np.cumsum(np.bincount(placed, minlength=len(axis) + 1)[: len(axis)]) - 1
+    else:
+        rows = np.searchsorted(ns, axis, side="right") - 1
+    if tolerance is not None and len(ns):
+        too_old = axis - ns[np.maximum(rows, 0)] > tolerance
+        rows[too_old] = -1
+    return rows
+
+
+def _exact_rows(ns: NDArray[np.int64], axis: NDArray[np.int64]) -> Any:
+    """The row of ``ns`` at each time of ``axis``, the last of equal times, or -1 for none."""
+    rows = np.full(len(axis), -1, dtype=np.intp)
+    rows[np.searchsorted(axis, ns)] = np.arange(len(ns))
+    return rows
+
+
+def _decoded(payload: Any, **options: Any) -> dict[str, Any]:
+    """The columns of ``payload``, decoded as by :func:`payload_to_dataframe` but still
+    views of the payload wherever the decoding allows."""
+    pack_bit_masks = options.pop("pack_bit_masks", False)
+    if options.get("demux_bit_masks") and pack_bit_masks:
+        raise ValueError("demux_bit_masks and pack_bit_masks are exclusive; pass one of them.")
+    return {
+        column.name if column.name is not None else _DEFAULT_COLUMN_NAME: _column_values(
+            column, pack_bit_masks=pack_bit_masks
+        )
+        for column in payload.payload_as_columns(**options)
+    }
+
+
+def _gathered_dtype(values: Any, fill: bool) -> np.dtype[Any] | None:
+    """The dtype of a numeric column gathered with missing rows where ``fill``, or ``None``
+    for a column pandas takes, as a boolean one becoming object."""
+    if not isinstance(values, np.ndarray) or values.dtype.kind not in "biuf":
+        return None
+    if not fill or values.dtype.kind == "f":
+        return values.dtype
+    return np.dtype(np.float64) if values.dtype.kind in "iu" else None
+
+
+def _wide_frame(
+    gathers: Sequence[tuple[Any, NDArray[np.intp] | None, NDArray[np.bool_] | None]],
+    size: int,
+) -> pd.DataFrame:
+    """The columns of ``gathers`` at their rows, all of them by default, missing where
+    their mask is set, a row of -1, which turns an integer or boolean column into float
+    or object.
+
+    The numeric columns of each dtype are gathered straight into the rows of one 2-D
+    block, which the frame wraps, so no column is copied a second time to consolidate.
+    The columns are labelled by their position in ``gathers``.
+    """
+    blocks: dict[np.dtype[Any], list[int]] = {}
+    others: dict[int, Any] = {}
+    for position, (values, rows, missing) in enumerate(gathers):
+        dtype = _gathered_dtype(values, missing is not None)
+        if dtype is not None:
+            blocks.setdefault(dtype, []).append(position)
+        elif rows is None:
+            others[position] = values
+        else:
+            others[position] = take(values, rows, allow_fill=missing is not None)
+    parts = [pd.DataFrame(others, index=pd.RangeIndex(size))]
+    for dtype, positions in blocks.items():
+        block = np.empty((len(positions), size), dtype=dtype)
+        for out, position in zip(block, positions):
+            values, rows, missing = gathers[position]
+            if rows is None:
+                out[...] = values
+                continue
+            # Clipping reads frame 0 at the missing rows, overwritten just below.
+            if len(values) and values.dtype == dtype:
+                np.take(values, rows, out=out, mode="clip")
+            elif len(values):
+                out[...] = np.take(values, rows, mode="clip")
+            if missing is not None:
+                out[missing] = np.nan
+        parts.append(pd.DataFrame(block.T, columns=positions, copy=False))
+    df = pd.concat(parts, axis=1) if len(parts) > 1 else parts[0]
+    return df.reindex(columns=range(len(gathers)))
+
+
+def align_frames(
+    frames: Sequence[tuple[str, NDArray[np.int64], Any, NDArray[np.intp] | None]],
+    *,
+    how: AlignHow,
+    tolerance: float | timedelta | None,
+    period: float | timedelta | None,
+    **options: Any,
+) -> tuple[NDArray[np.int64], pd.DataFrame]:
+    """The time axis, in integer nanoseconds, and the columns of every register on it.
+
+    ``frames`` holds the name of each register and its :func:`timed_payload`. The rows
+    of every register are found on the nanoseconds alone, and its columns gathered at
+    them straight from the payload, decoded with ``options`` as by
+    :func:`payload_to_dataframe`. The columns of the result are a two-level index of
+    register name and column.
+    """
+    if how not in _ALIGN_HOWS:
+        raise ValueError(f"how must be 'asof', 'outer' or 'resample', not {how!r}.")
+    if (period is None) == (how == "resample"):
+        raise ValueError("period= sets the step of how='resample', and only of that.")
+    if tolerance is not None and how == "outer":
+        raise ValueError("tolerance= applies to how='asof' and how='resample', not 'outer'.")
+    tol = None if tolerance is None else _duration_ns(tolerance)
+    if how == "asof":
+        axis = frames[0][1].copy()
+    elif how == "outer":
+        # Concatenated sorted runs merge in one stable sort, which finds the runs.
+        merged = np.sort(
+            np.concatenate([ns for _name, ns, _payload, _rows in frames]), kind="stable"
+        )
+        axis = merged[np.r_[True, merged[1:] != merged[:-1]]] if len(merged) else merged
+    else:
+        step = _duration_ns(cast(Any, period))
+        if step <= 0:
+            raise ValueError(f"period must be positive, not {period}.")
+        lows = [ns[0] for _name, ns, _payload, _rows in frames if len(ns)]
+        highs = [ns[-1] for _name, ns, _payload, _rows in frames if len(ns)]
+        axis = (
+            np.arange(min(lows), max(highs) + 1, step, dtype=np.int64)
+            if lows
+            else np.empty(0, dtype=np.int64)
+        )
+    keys: list[tuple[str, str]] = []
+    gathers: list[tuple[Any, NDArray[np.intp] | None, NDArray[np.bool_] | None]] = []
+    for position, (name, ns, payload, order) in enumerate(frames):
+        if how == "asof" and position == 0:
+            rows = order
+        else:
+            found = _exact_rows(ns, axis) if how == "outer" else _asof_rows(ns, axis, tol)
+            rows = found if order is None else np.where(found < 0, -1, order[found])
+        missing = None if rows is None else rows < 0
+        if missing is not None and not missing.any():
+            missing = None
+        for column, values in _decoded(payload, **options).items():
+            keys.append((name, column))
+            gathers.append((values, rows, missing))
+    df = _wide_frame(gathers, len(axis))
+    df.columns = pd.MultiIndex.from_tuples(keys, names=["register", "column"])
+    return axis, df
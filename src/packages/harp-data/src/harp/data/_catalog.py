@@ -0,0 +1,235 @@
+"""An index of every Harp device folder under a tree, built from file headers alone."""
+
+import hashlib
+import json
+import os
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from os import PathLike
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+from harp.device.core import REGISTER_MAP as CORE_REGISTER_MAP
+from harp.device.schema import parse_device_schema
+from ruamel.yaml import YAMLError
+
+from ._dataset import DEVICE_SCHEMA_FILENAME, FileNameResolver, default_file_resolver
+from ._files import scan_register
+
+CATALOG_VERSION = 1
+"""Version of the file :meth:`Catalog.save` writes; a file of another version is refused."""
+
+CATALOG_COLUMNS = (
+    "root",
+    "device",
+    "who_am_i",
+    "address",
+    "register",
+    "files",
+    "frames",
+    "bytes",
+    "first",
+    "last",
+)
+"""The columns of :attr:`Catalog.entries`, one row per register recorded in a folder."""
+
+_CORE_NAMES = {address: cls.__name__ for address, cls in CORE_REGISTER_MAP.items()}
+
+
+class Catalog:
+    """An index of the Harp device folders under a tree, one row per recorded register.
+
+    Build one with :func:`scan_catalog`, keep it with :meth:`save` and reopen it with
+    :meth:`load`, so that locating data is a query over a table rather than a walk over
+    the filesystem::
+
+        catalog = scan_catalog("archive")
+        catalog.save("archive/catalog.json")
+        ...
+        catalog = Catalog.load("archive/catalog.json")
+        sessions = catalog.find(device="Behavior", register="AnalogData")
+        reader = open_dataset(sessions["root"].iloc[0])
+
+    :attr:`entries` holds the columns of :data:`CATALOG_COLUMNS`: the folder, the device
+    name and ``whoAmI`` its ``device.yml`` declares, the address and name of each
+    register with files, how many chunk files and frames it has and their size in bytes,
+    and the Harp seconds of its first and last frames. ``register`` is ``None`` for an
+    address neither the schema nor the common registers name. A folder with no register
+    files keeps one row with no address, so every device folder is listed.
+    """
+
+    def __init__(self, entries: pd.DataFrame) -> None:
+        self._entries = entries
+
+    @property
+    def entries(self) -> pd.DataFrame:
+        """The catalog, one row per register of each device folder."""
+        return self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def devices(self) -> pd.DataFrame:
+        """One row per device folder: its identity, registers, frames and time span."""
+        grouped = self._entries.groupby(["root", "device", "who_am_i"], dropna=False, sort=False)
+        return grouped.agg(
+            registers=("address", "count"),
+            frames=("frames", "sum"),
+            bytes=("bytes", "sum"),
+            first=("first", "min"),
+            last=("last", "max"),
+        ).reset_index()
+
+    def find(
+        self,
+        *,
+        device: str | None = None,
+        who_am_i: int | None = None,
+        register: str | int | None = None,
+        start: float | None = None,
+        end: float | None = None,
+    ) -> pd.DataFrame:
+        """The entries matching every criterion given.
+
+        ``register`` is a register name or address. ``start`` and ``end`` are Harp
+        seconds, and keep the registers whose frames span any time in ``[start, end)``.
+        """
+        entries = self._entries
+        keep = pd.Series(True, index=entries.index)
+        if device is not None:
+            keep &= entries["device"] == device
+        if who_am_i is not None:
+            keep &= entries["who_am_i"] == who_am_i
+        if register is not None:
+            column = "register" if isinstance(register, str) else "address"
+            keep &= entries[column] == register
+        if start is not None:
+            keep &= entries["last"] >= start
+        if end is not None:
+            keep &= entries["first"] < end
+        return entries.loc[keep].reset_index(drop=True)
+
+    def save(self, path: str | PathLike[str]) -> None:
+        """Write the catalog to ``path`` as JSON."""
+        records = self._entries.astype(object).where(self._entries.notna(), None)
+        document = {"version": CATALOG_VERSION, "entries": records.to_dict("split")["data"]}
+        Path(path).write_text(json.dumps(document), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: str | PathLike[str]) -> "Catalog":
+        """Read a catalog written by :meth:`save`."""
+        document = json.loads(Path(path).read_text(encoding="utf-8"))
+        if document.get("version") != CATALOG_VERSION:
+            raise ValueError(
+                f"{path} holds a catalog of version {document.get('version')}, not "
+                f"{CATALOG_VERSION}. Scan the tree again with scan_catalog."
+            )
+        return cls(_entries_frame(document["entries"]))
+
+
+def _entries_frame(rows: list[Any]) -> pd.DataFrame:
+    frame = pd.DataFrame(rows, columns=list(CATALOG_COLUMNS))
+    integers = ["who_am_i", "address", "files", "frames", "bytes"]
+    frame[integers] = frame[integers].astype("Int64")
+    frame[["first", "last"]] = frame[["first", "last"]].astype("float64")
+    return frame
+
+
+def _walk(top: Path) -> Iterator[Path]:
+    """Every folder under ``top`` holding a ``device.yml``, without descending into one."""
+    for folder, subdirs, files in os.walk(top):
+        if DEVICE_SCHEMA_FILENAME in files:
+            subdirs.clear()
+            yield Path(folder)
+        else:
+            subdirs.sort()
+
+
+class _SchemaCache:
+    """Parsed device names, ``whoAmI`` and register names by schema content.
+
+    The sessions of an archive share a few schemas, so each is parsed once per scan.
+    """
+
+    def __init__(self) -> None:
+        self._parsed: dict[bytes, tuple[str | None, int | None, dict[int, str]]] = {}
+
+    def identity(self, path: Path) -> tuple[str | None, int | None, dict[int, str]]:
+        text = path.read_bytes()
+        key = hashlib.sha256(text).digest()
+        parsed = self._parsed.get(key)
+        if parsed is None:
+            try:
+                model = parse_device_schema(text)
+            except (ValueError, YAMLError):
+                # Text that is not YAML, or YAML that is not a schema, leaves the folder
+                # indexed as of an unknown device rather than stopping the scan.
+                parsed = (None, None, dict(_CORE_NAMES))
+            else:
+                names = dict(_CORE_NAMES)
+                names.update({r.address: name for name, r in model.registers.items()})
+                parsed = (model.device, model.whoAmI, names)
+            self._parsed[key] = parsed
+        return parsed
+
+
+def _scan_folder(folder: Path, schemas: _SchemaCache, resolver: FileNameResolver) -> list[Any]:
+    """The catalog rows of one device folder."""
+    device, who_am_i, names = schemas.identity(folder / DEVICE_SCHEMA_FILENAME)
+    root = str(folder)
+    if device is None:
+        return [[root, None, who_am_i, *[None] * 7]]
+    rows: list[Any] = []
+    for address, paths in resolver(folder, device).items():
+        span = scan_register(paths)
+        rows.append(
+            [
+                root,
+                device,
+                who_am_i,
+                address,
+                names.get(address),
+                len(span.spans),
+                span.frames,
+                span.size,
+                span.first,
+                span.last,
+            ]
+        )
+    return rows or [[root, device, who_am_i, *[None] * 7]]
+
+
+def scan_catalog(
+    root: str | PathLike[str],
+    *,
+    workers: int | None = None,
+    resolver: FileNameResolver = default_file_resolver,
+) -> Catalog:
+    """Find every Harp device folder under ``root`` and index what each recorded.
+
+    A device folder is one holding a ``device.yml``; the folders inside it are not
+    searched. The top-level subfolders of ``root`` are walked, and the device folders
+    found scanned, on a pool of ``workers`` threads (default: as
+    :class:`~concurrent.futures.ThreadPoolExecutor` chooses), since the scan waits on
+    the filesystem far more than it computes.
+
+    Nothing is decoded: each register file contributes the size and the first and last
+    frame headers, so the frame counts assume whole frames of one length, as a
+    de-multiplexed Harp file holds. Each distinct ``device.yml`` is parsed once.
+    ``resolver`` matches the files of a device as in :class:`DatasetReader`. The rows
+    are in folder order, then address order.
+    """
+    top = Path(root)
+    schemas = _SchemaCache()
+    with ThreadPoolExecutor(workers) as pool:
+        if (top / DEVICE_SCHEMA_FILENAME).is_file():
+            folders = [top]
+        else:
+            subdirs = sorted(entry.path for entry in os.scandir(top) if entry.is_dir())
+            folders = [
+                f for found in pool.map(lambda d: list(_walk(Path(d))), subdirs) for f in found
+            ]
+        scanned = pool.map(lambda folder: _scan_folder(folder, schemas, resolver), folders)
+        rows = [row for folder_rows in scanned for row in folder_rows]
+    return Catalog(_entries_frame(rows))
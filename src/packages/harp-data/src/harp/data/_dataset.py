@@ -1,10 +1,11 @@
 import re
-from collections.abc import Callable, Mapping
-from datetime import datetime
+from collections.abc import Callable, Mapping, Sequence
+from datetime import datetime, timedelta
 from os import PathLike
 from pathlib import Path
 from typing import Any, Generic, TypeVar, overload
 
+import numpy as np
 import pandas as pd
 from harp.device.schema import (
     DeviceModule,
@@ -13,8 +14,13 @@
     parse_device_schema,
 )
 from harp.protocol import RegisterBase
+from numpy.typing import NDArray
 
-from ._reader import parse_to_dataframe
+from ._align import AlignHow, align_frames, timed_payload
+from ._files import sample_seconds, scan_register
+from ._pyramid import Pyramid
+from ._reader import Layout, TimeBound, _nanosecond_index, parse_to_dataframe
+from ._resample import Aggregation, resample_frames
 
 M = TypeVar("M", bound=DeviceModuleLike)
 
@@ -25,16 +31,51 @@
 DEVICE_SCHEMA_FILENAME = "device.yml"
 """Default filename of the device schema looked up inside a dataset folder."""
 
+_SUMMARY_COLUMNS = ("address", "files", "frames", "bytes", "first", "last", "duration", "rate")
+
+_SUMMARY_SAMPLE = 10_000
+
+
+def _suffix_order(suffix: str) -> tuple[int, int, str]:
+    """Sort key of a chunk suffix: the unsuffixed file first, then other suffixes by name,
+    then sequence numbers by value, so ``_10000`` follows ``_9999``."""
+    return (1, int(suffix), suffix) if suffix.isdigit() else (0, 0, suffix)
+
 
 def default_file_resolver(root: Path, name: str) -> dict[int, list[Path]]:
     """Harp file format resolver: map address -> sorted ``<name>_<address>...`` files."""
-    pattern = re.compile(rf"^{re.escape(name)}_(\d+)(?:_.*)?$")
-    files: dict[int, list[Path]] = {}
-    for path in sorted(root.glob("*.bin")):
+    pattern = re.compile(rf"^{re.escape(name)}_(\d+)(?:_(.*))?$")
+    found: dict[int, list[tuple[tuple[int, int, str], Path]]] = {}
+    for path in root.glob("*.bin"):
         match = pattern.match(path.stem)
         if match is not None:
-            files.setdefault(int(match.group(1)), []).append(path)
-    return dict(sorted(files.items()))
+            order = _suffix_order(match.group(2) or "")
+            found.setdefault(int(match.group(1)), []).append((order, path))
+    return {address: [path for _order, path in sorted(found[address])] for address in sorted(found)}
+
+
+def _name_map(registers: Mapping[int, type[RegisterBase[Any]]]) -> dict[str, int]:
+    """Register name -> address, in address order."""
+    return {registers[address].__name__: address for address in sorted(registers)}
+
+
+def _resolve_register(
+    registers: Mapping[int, type[RegisterBase[Any]]],
+    name_map: Mapping[str, int],
+    register: RegisterKey,
+) -> tuple[type[RegisterBase[Any]], int]:
+    """Resolve a register class, name or address to its class and address."""
+    if isinstance(register, type):
+        return register, register.address
+    if isinstance(register, str):
+        address = name_map.get(register)
+        if address is None:
+            raise KeyError(f"No register named {register!r} in the map of this device.")
+        return registers[address], address
+    cls = registers.get(register)
+    if cls is None:
+        raise KeyError(f"No register at address {register} in the map of this device.")
+    return cls, register
 
 
 class DatasetReader(Generic[M]):
@@ -95,8 +136,7 @@ def __init__(
         self._epoch = epoch
         self._name = self._resolve_name()
         self._paths = dict(self._resolver(self._root, self._name))
-        registers = device_module.REGISTER_MAP
-        self._name_map = {registers[address].__name__: address for address in sorted(registers)}
+        self._name_map = _name_map(device_module.REGISTER_MAP)
         if validate:
             self._validate_whoami()
 
@@ -159,6 +199,69 @@ def paths(self) -> Mapping[int, list[Path]]:
         """The mapping from address to binary files discovered under :attr:`root`."""
         return self._paths
 
+    def summary(self, *, sample: int | None = None, gap: float | None = None) -> pd.DataFrame:
+        """Summarize what each register recorded, without decoding its frames.
+
+        One row per register of :attr:`contents`, indexed by name, with its ``address``,
+        its chunk ``files``, ``frames`` and ``bytes``, the Harp seconds of its ``first``
+        and ``last`` frames, the ``duration`` between them and the mean ``rate`` over
+        it, in frames per second. Frame counts come from the file size and the stride of
+        the first frame, and the times from the first and last frames alone, so the
+        summary takes as long for a terabyte as for a kilobyte.
+
+        ``sample`` adds the ``median_rate``, the inverse of the median interval between
+        frames, from the timestamps of about ``sample`` frames evenly strided over each
+        register. ``gap`` adds ``gaps``, the count of pauses longer than ``gap`` seconds,
+        sampling 10,000 frames unless ``sample`` says otherwise. Between two sampled
+        frames the frames skipped are taken to arrive at the median interval, so a pause
+        is the time left over beyond them, and several pauses between the same two
+        samples count once. A ``sample`` no smaller than the frame count reads every
+        timestamp and counts exactly.
+        """
+        if gap is not None and sample is None:
+            sample = _SUMMARY_SAMPLE
+        rows: list[dict[str, Any]] = []
+        names = {address: name for name, address in self.contents.items()}
+        for address, name in names.items():
+            register = scan_register(self._paths[address])
+            spans, frames = register.spans, register.frames
+            first = np.nan if register.first is None else register.first
+            last = np.nan if register.last is None else register.last
+            duration = last - first
+            row: dict[str, Any] = {
+                "register": name,
+                "address": address,
+                "files": len(spans),
+                "frames": frames,
+                "bytes": register.size,
+                "first": first,
+                "last": last,
+                "duration": duration,
+                "rate": (frames - 1) / duration if duration > 0 else np.nan,
+            }
+            if sample is not None:
+                sampled: list[tuple[NDArray[np.float64], int]] = []
+                for span in spans:
+                    share = max(2, -(-sample * span.frames // max(1, frames)))
+                    seconds, step = sample_seconds(span, share)
+                    sampled.append((np.diff(seconds), step))
+                per_frame = np.concatenate([intervals / step for intervals, step in sampled])
+                median = float(np.median(per_frame)) if per_frame.size else 0.0
+                row["median_rate"] = 1 / median if median > 0 else np.nan
+                if gap is not None:
+                    # The frames skipped between two samples take about the median each.
+                    row["gaps"] = sum(
+                        int(np.count_nonzero(intervals - (step - 1) * median > gap))
+                        for intervals, step in sampled
+                    )
+            rows.append(row)
+        columns = [*_SUMMARY_COLUMNS]
+        if sample is not None:
+            columns.append("median_rate")
+        if gap is not None:
+            columns.append("gaps")
+        return pd.DataFrame(rows, columns=["register", *columns]).set_index("register")
+
     def read(
         self,
         register: RegisterKey,
@@ -168,6 +271,13 @@ def read(
         keep_type: bool = False,
         decode_enums: bool = True,
         demux_bit_masks: bool = False,
+        columns: Sequence[str] | None = None,
+        pack_bit_masks: bool = False,
+        layout: Layout = "views",
+        start: TimeBound | None = None,
+        end: TimeBound | None = None,
+        resample: float | timedelta | None = None,
+        aggregate: Aggregation | Sequence[Aggregation] | None = None,
     ) -> pd.DataFrame:
         """Read the data of one register into a DataFrame.
 
@@ -189,9 +299,40 @@ def read(
         chunk for the address). The remaining options match
         :func:`~harp.data.parse_to_dataframe`, except that the epoch is the one the
         reader was opened with.
+
+        ``resample``, a period in seconds or a timedelta, reads one row per bin of that
+        period instead of one per frame, each column reduced over the frames of the bin
+        by ``aggregate``, an :data:`Aggregation` or several of them (default:
+        ``"mean"``). Several give a two-level column index of column and aggregation.
+        The files are read and reduced a chunk at a time, so memory follows the number
+        of bins rather than of frames. Bins are aligned to multiples of the period from
+        Harp time zero and labelled by their start, and a bin holding no frame is a row
+        of missing values. ``time_index=False``, ``keep_type`` and ``pack_bit_masks``
+        do not apply to bins, and ``layout`` is ignored.
         """
         cls, address = self._resolve(register)
         paths = self._resolve_paths(address, suffix)
+        if resample is not None:
+            if not time_index or keep_type or pack_bit_masks:
+                raise ValueError(
+                    "resample= bins the frames on the time index, with no message_type "
+                    "and flags as raw integers; drop time_index, keep_type and "
+                    "pack_bit_masks."
+                )
+            return resample_frames(
+                cls,
+                paths,
+                period=resample,
+                aggregate=aggregate or "mean",
+                epoch=self._epoch,
+                start=start,
+                end=end,
+                decode_enums=decode_enums,
+                demux_bit_masks=demux_bit_masks,
+                columns=columns,
+            )
+        if aggregate is not None:
+            raise ValueError("aggregate= reduces the bins of resample=, and only those.")
         raw = b"".join(p.read_bytes() for p in paths)
         return parse_to_dataframe(
             cls,
@@ -201,21 +342,101 @@ def read(
             keep_type=keep_type,
             decode_enums=decode_enums,
             demux_bit_masks=demux_bit_masks,
+            columns=columns,
+            pack_bit_masks=pack_bit_masks,
+            layout=layout,
+            start=start,
+            end=end,
         )
 
+    def read_aligned(
+        self,
+        registers: Sequence[RegisterKey],
+        *,
+        how: AlignHow = "asof",
+        tolerance: float | timedelta | None = None,
+        period: float | timedelta | None = None,
+        decode_enums: bool = True,
+        demux_bit_masks: bool = False,
+        pack_bit_masks: bool = False,
+        start: TimeBound | None = None,
+        end: TimeBound | None = None,
+    ) -> pd.DataFrame:
+        """Read several registers into one DataFrame on a shared time axis.
+
+        ``how`` is the :data:`AlignHow`: the frames of the first register as the axis
+        with the latest frame of every other at or before each (``"asof"``), the union of
+        every timestamp (``"outer"``), or a regular axis every ``period`` seconds over the
+        span of the registers (``"resample"``), each register giving its latest frame at
+        or before each step. ``tolerance``, in seconds or as a timedelta, leaves a
+        register missing where its latest frame is older than that. ``"outer"`` keeps the
+        last of the frames of one register sharing a timestamp.
+
+        The registers are merged on the integer nanoseconds of their timestamps, so equal
+        times match exactly, and each column is gathered into the result once, rather
+        than through a ``pd.merge_asof`` per register. The columns are a two-level index
+        of register name and column, so ``df["AnalogData"]`` selects the columns of one
+        register. A register missing at a row turns its integer and boolean columns into
+        float and object ones, as pandas represents missing values there. The time index
+        and the remaining options are those of :meth:`read`.
+        """
+        if not registers:
+            raise ValueError("read_aligned needs at least one register to read.")
+        frames = []
+        for register in registers:
+            cls, address = self._resolve(register)
+            raw = b"".join(p.read_bytes() for p in self._resolve_paths(address, None))
+            ns, payload, rows = timed_payload(cls, raw, epoch=self._epoch, start=start, end=end)
+            frames.append((cls.__name__, ns, payload, rows))
+        axis, df = align_frames(
+            frames,
+            how=how,
+            tolerance=tolerance,
+            period=period,
+            decode_enums=decode_enums,
+            demux_bit_masks=demux_bit_masks,
+            pack_bit_masks=pack_bit_masks,
+        )
+        df.index = _nanosecond_index(axis, self._epoch)
+        return df
+
+    def pyramid(
+        self,
+        register: RegisterKey,
+        *,
+        base: float | timedelta = 0.1,
+        factor: int = 4,
+        columns: Sequence[str] | None = None,
+        update: bool = True,
+    ) -> Pyramid:
+        """The :class:`Pyramid` of one register, cached in the dataset folder.
+
+        The cache is the folder ``<name>_<address>.pyramid`` beside the files of the
+        register. ``base`` is the bin period of its finest level, in seconds or as a
+        timedelta, and each level bins ``factor`` times longer than the one below.
+        ``columns`` names the numeric columns to summarize (default: every numeric
+        column). A cache built with other options is rebuilt.
+
+        ``update`` folds in the frames written since the cache was last updated, every
+        frame the first time; pass ``False`` to query the cache as it is, and call
+        :meth:`Pyramid.update` as the recording grows.
+        """
+        cls, address = self._resolve(register)
+        pyramid = Pyramid(
+            cls,
+            self._root / f"{self._name}_{address}.pyramid",
+            lambda: list(self._resolver(self._root, self._name).get(address, [])),
+            base=base,
+            factor=factor,
+            columns=columns,
+            epoch=self._epoch,
+        )
+        if update:
+            pyramid.update()
+        return pyramid
+
     def _resolve(self, register: RegisterKey) -> tuple[type[RegisterBase[Any]], int]:
-        if isinstance(register, type):
-            return register, register.address
-        registers = self._device_module.REGISTER_MAP
-        if isinstance(register, str):
-            address = self._name_map.get(register)
-            if address is None:
-                raise KeyError(f"No register named {register!r} in the map of this device.")
-            return registers[address], address
-        cls = registers.get(register)
-        if cls is None:
-            raise KeyError(f"No register at address {register} in the map of this device.")
-        return cls, register
+        return _resolve_register(self._device_module.REGISTER_MAP, self._name_map, register)
 
     def _resolve_paths(self, address: int, suffix: str | None) -> list[Path]:
         paths = self._paths.get(address) or []
@@ -250,6 +471,7 @@ def open_dataset(
     resolver: FileNameResolver = ...,
     converters: Mapping[str, Any] | None = ...,
     require_converters: bool = ...,
+    cache_dir: str | PathLike[str] | None = ...,
     epoch: datetime | None = ...,
     validate: bool = ...,
 ) -> DatasetReader[DeviceModule]: ...
@@ -264,6 +486,7 @@ def open_dataset(
     resolver: FileNameResolver = default_file_resolver,
     converters: Mapping[str, Any] | None = None,
     require_converters: bool = True,
+    cache_dir: str | PathLike[str] | None = None,
     epoch: datetime | None = None,
     validate: bool = True,
 ) -> DatasetReader:
@@ -283,6 +506,11 @@ def open_dataset(
     decoding. These three parameters describe alternative ways to supply a module, so
     they are mutually exclusive, and will raise when more than one is specified.
 
+    Modules built from a schema are cached by its content, so opening many sessions
+    recorded with the same ``device.yml`` builds its classes once. ``cache_dir`` also
+    keeps the parsed schema on disk, so a new process skips parsing it as well (see
+    :func:`~harp.device.schema.create_device_module`).
+
     ``epoch`` anchors the time index of every read to absolute time, since the anchor
     describes the recording rather than one register. The reference Harp clock starts
     at :data:`REFERENCE_EPOCH`, and the default of ``None`` gives float seconds.
@@ -293,10 +521,10 @@ def open_dataset(
     """
     root_path = Path(root)
     if device_module is not None:
-        if schema is not None or converters is not None:
+        if schema is not None or converters is not None or cache_dir is not None:
             raise TypeError(
-                "schema= and converters= describe how to build a device module, so they "
-                "do not apply when one is given. Drop them, or drop the device module."
+                "schema=, converters= and cache_dir= describe how to build a device module, "
+                "so they do not apply when one is given. Drop them, or drop the device module."
             )
         return DatasetReader(
             device_module,
@@ -313,7 +541,10 @@ def open_dataset(
             f"or pass the device module itself as open_dataset(root, device_module)."
         )
     built = create_device_module(
-        schema_path.read_text(), converters=converters, require_converters=require_converters
+        schema_path.read_bytes(),
+        converters=converters,
+        require_converters=require_converters,
+        cache_dir=cache_dir,
     )
     return DatasetReader(
         built,
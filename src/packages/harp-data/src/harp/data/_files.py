@@ -0,0 +1,162 @@
+"""What a Harp binary file holds, read from the headers of its first and last frames.
+
+Every frame of a de-multiplexed register file has the same length, so the stride of
+the first frame gives the frame count from the file size, and the last frame is found
+at a fixed offset without reading anything in between.
+"""
+
+import mmap
+import os
+import struct
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+from harp.protocol._constants import (
+    _HEADER_LEN,
+    _TICK_PERIOD_NS,
+    _TICK_PERIOD_S,
+    _TICKS_PER_S,
+    _TIMESTAMP_FLAG,
+    _TIMESTAMPED_PAYLOAD_OFFSET,
+    _TS_MICROS_OFFSET,
+)
+from numpy.typing import NDArray
+
+_TIMESTAMP = struct.Struct("<IH")
+
+
+@dataclass(frozen=True)
+class FileSpan:
+    """The frames of one binary file of ``size`` bytes: their stride, count and first and
+    last timestamps.
+
+    ``trailing`` counts the bytes past the last whole frame, as a recording cut short
+    mid-frame leaves. ``first`` and ``last`` are Harp seconds, ``None`` when the frames
+    carry no timestamp or the file is empty.
+    """
+
+    path: Path
+    size: int
+    stride: int
+    frames: int
+    trailing: int
+    first: float | None
+    last: float | None
+
+
+def _frame_seconds(frame: bytes) -> float | None:
+    """The timestamp of the frame starting ``frame``, in seconds, or ``None`` without one."""
+    if len(frame) < _TIMESTAMPED_PAYLOAD_OFFSET or not frame[4] & _TIMESTAMP_FLAG:
+        return None
+    seconds, ticks = _TIMESTAMP.unpack_from(frame, _HEADER_LEN)
+    return seconds + ticks * _TICK_PERIOD_S
+
+
+def scan_file(path: Path) -> FileSpan:
+    """Read the first and last frame headers of ``path``; nothing else is read."""
+    with open(path, "rb", buffering=0) as file:
+        size = os.fstat(file.fileno()).st_size
+        head = file.read(_TIMESTAMPED_PAYLOAD_OFFSET)
+        if len(head) < _HEADER_LEN:
+            return FileSpan(path, size, 0, 0, size, None, None)
+        stride = head[1] + 2
+        frames, trailing = divmod(size, stride)
+        first = _frame_seconds(head) if frames else None
+        last = first
+        if frames > 1:
+            file.seek((frames - 1) * stride)
+            last = _frame_seconds(file.read(_TIMESTAMPED_PAYLOAD_OFFSET))
+    return FileSpan(path, size, stride, frames, trailing, first, last)
+
+
+@dataclass(frozen=True)
+class RegisterSpan:
+    """The chunk files of one register taken together: their spans, the ``frames`` and
+    ``size`` in bytes summed over them, and the earliest ``first`` and latest ``last``
+    timestamps, ``None`` when no file has one.
+    """
+
+    spans: tuple[FileSpan, ...]
+    frames: int
+    size: int
+    first: float | None
+    last: float | None
+
+
+def scan_register(paths: Iterable[Path]) -> RegisterSpan:
+    """Scan each chunk file of a register in ``paths`` with :func:`scan_file` and sum them."""
+    spans = tuple(scan_file(path) for path in paths)
+    firsts = [span.first for span in spans if span.first is not None]
+    lasts = [span.last for span in spans if span.last is not None]
+    return RegisterSpan(
+        spans,
+        sum(span.frames for span in spans),
+        sum(span.size for span in spans),
+        min(firsts, default=None),
+        max(lasts, default=None),
+    )
+
+
+def sample_seconds(span: FileSpan, count: int) -> tuple[NDArray[np.float64], int]:
+    """The timestamps of at most ``count`` frames evenly strided over the file of ``span``,
+    and the stride in frames between them, so ``count >= span.frames`` reads every one.
+
+    The file is memory-mapped and read through strided views, so only the pages holding
+    the sampled headers are touched.
+    """
+    if span.first is None or span.frames == 0:
+        return np.empty(0, dtype=np.float64), 1
+    step = max(1, -(-span.frames // max(1, count)))
+    rows = -(-span.frames // step)
+    strides = (span.stride * step,)
+    with open(span.path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        seconds = np.ndarray(rows, dtype="<u4", buffer=m, offset=_HEADER_LEN, strides=strides)
+        ticks = np.ndarray(rows, dtype="<u2", buffer=m, offset=_TS_MICROS_OFFSET, strides=strides)
+        out = np.multiply(ticks, _TICK_PERIOD_S, dtype=np.float64)
+        out += seconds
+        del seconds, ticks  # release the map before it closes
+    return out, step
+
+
+def seek_frame(span: FileSpan, ns: int) -> int:
+    """The first frame of the file of ``span`` timestamped at or after ``ns`` nanoseconds.
+
+    The frames are taken to be in time order, as a device writes them, and a binary
+    search reads the headers of about ``log2(frames)`` of them.
+    """
+    if span.first is None or span.frames == 0:
+        return 0
+    low, high = 0, span.frames
+    with open(span.path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        while low < high:
+            middle = (low + high) // 2
+            seconds, ticks = _TIMESTAMP.unpack_from(m, middle * span.stride + _HEADER_LEN)
+            if (seconds * _TICKS_PER_S + ticks) * _TICK_PERIOD_NS < ns:
+                low = middle + 1
+            else:
+                high = middle
+    return low
+
+
+def read_chunks(
+    span: FileSpan, chunk_bytes: int, offset: int = 0, stop: int | None = None
+) -> Iterator[memoryview]:
+    """The bytes ``[offset, stop)`` of the file of ``span``, its whole frames by default,
+    in chunks of whole frames of about ``chunk_bytes``.
+
+    One buffer is read into, so each chunk is only valid until the next one.
+    """
+    if span.stride == 0:
+        return
+    stop = span.frames * span.stride if stop is None else stop
+    buffer = bytearray(max(1, chunk_bytes // span.stride) * span.stride)
+    with open(span.path, "rb", buffering=0) as file:
+        file.seek(offset)
+        while offset < stop:
+            read = file.readinto(memoryview(buffer)[: stop - offset])
+            if not read:
+                return
+            offset += read
+            yield memoryview(buffer)[:read]
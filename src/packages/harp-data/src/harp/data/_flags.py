@@ -0,0 +1,201 @@
+"""A pandas column type keeping a ``BitMask`` flag set packed in its raw integers.
+
+Demultiplexing a flag field gives one ``bool`` column per flag, a byte per flag per
+frame. :class:`FlagArray` keeps the field as the raw integers instead, a single column
+as wide as the register element, and the ``bitmask`` Series accessor reads a flag
+from it only when asked::
+
+    df = parse_to_dataframe(PortDIOSet, raw, pack_bit_masks=True)
+    df["value"].bitmask["DIO0"]  # one boolean Series
+    df["value"].bitmask.demux()  # every flag, as demux_bit_masks=True gives
+"""
+
+import enum
+import functools
+import operator
+from collections.abc import Sequence
+from typing import Any, Self
+
+import numpy as np
+import pandas as pd
+from numpy.typing import NDArray
+from pandas.api.extensions import (
+    ExtensionArray,
+    ExtensionDtype,
+    register_extension_dtype,
+    register_series_accessor,
+    take,
+)
+from pandas.api.indexers import check_array_indexer
+
+
+@register_extension_dtype
+class FlagDtype(ExtensionDtype):
+    """The dtype of a :class:`FlagArray`, its ``enum.IntFlag``, integer ``storage`` and
+    field ``mask``.
+
+    The column holds the flags that fit ``mask``, the bits of the register element the
+    ``BitMask`` field reads. ``storage`` is the integer type of that element, and
+    defaults to the smallest one holding every flag of the enum; ``mask`` defaults to
+    every bit of the storage.
+    """
+
+    _metadata = ("flags", "storage", "mask")
+
+    def __init__(
+        self, flags: type[enum.IntFlag], storage: Any = None, mask: int | None = None
+    ) -> None:
+        self.flags = flags
+        if storage is None:
+            storage = np.min_scalar_type(functools.reduce(operator.or_, map(int, flags), 0))
+        self.storage = np.dtype(storage)
+        self.mask = (1 << (self.storage.itemsize * 8)) - 1 if mask is None else int(mask)
+
+    @property
+    def members(self) -> list[enum.IntFlag]:
+        """The flags of the enum that fit the mask, as demultiplexing reads them."""
+        return [member for member in self.flags if not (int(member) & ~self.mask)]
+
+    @property
+    def name(self) -> str:
+        full = (1 << (self.storage.itemsize * 8)) - 1
+        mask = "" if self.mask == full else f", 0x{self.mask:x}"
+        return f"flags[{self.flags.__name__}, {self.storage}{mask}]"
+
+    @property
+    def type(self) -> type[enum.IntFlag]:
+        return self.flags
+
+    @property
+    def na_value(self) -> Any:
+        return pd.NA
+
+    @classmethod
+    def construct_array_type(cls) -> "type[FlagArray]":  # type: ignore[override]
+        return FlagArray
+
+    @classmethod
+    def construct_from_string(cls, string: str) -> Self:
+        # A dtype string cannot name the enum, so only an instance describes a FlagDtype.
+        raise TypeError(f"Cannot construct a 'FlagDtype' from '{string}'")
+
+
+class FlagArray(ExtensionArray):
+    """Raw flag-set integers with the ``enum.IntFlag`` describing their bits.
+
+    An element reads as a member of the enum, combined flags included. ``mask`` marks
+    missing rows, as introduced by reindexing; a decoded register has none.
+    """
+
+    def __init__(
+        self, values: NDArray[Any], dtype: FlagDtype, mask: NDArray[np.bool_] | None = None
+    ) -> None:
+        self._data = np.asarray(values)
+        self._mask = np.zeros(len(self._data), dtype=np.bool_) if mask is None else mask
+        self._dtype = dtype
+
+    @classmethod
+    def _from_sequence(cls, scalars: Any, *, dtype: Any = None, copy: bool = False) -> "FlagArray":
+        if not isinstance(dtype, FlagDtype):
+            raise TypeError("A FlagArray needs a FlagDtype naming its flags.")
+        values = list(scalars)
+        mask = np.array([v is None or bool(pd.isna(v)) for v in values], dtype=np.bool_)
+        data = np.array([0 if m else int(v) for v, m in zip(values, mask)], dtype=dtype.storage)
+        return cls(data, dtype, mask)
+
+    @classmethod
+    def _from_factorized(cls, values: Any, original: "FlagArray") -> "FlagArray":
+        return cls._from_sequence(values, dtype=original.dtype)
+
+    @property
+    def dtype(self) -> FlagDtype:
+        return self._dtype
+
+    @property
+    def nbytes(self) -> int:
+        return self._data.nbytes + self._mask.nbytes
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __getitem__(self, item: Any) -> Any:
+        if isinstance(item, (int, np.integer)):
+            return (
+                self._dtype.na_value
+                if self._mask[item]
+                else self._dtype.flags(int(self._data[item]))
+            )
+        item = check_array_indexer(self, item)
+        return type(self)(self._data[item], self._dtype, self._mask[item])
+
+    def __eq__(self, other: object) -> Any:  # type: ignore[override]
+        if isinstance(other, (pd.Series, pd.Index, pd.DataFrame)):
+            return NotImplemented
+        values = other._data if isinstance(other, FlagArray) else np.asarray(other)
+        return (self._data == values) & ~self._mask
+
+    def __array__(self, dtype: Any = None, copy: bool | None = None) -> NDArray[Any]:
+        if not self._mask.any():
+            return self._data.astype(dtype) if dtype is not None else self._data
+        return np.array([self[i] for i in range(len(self))], dtype=dtype or object)
+
+    def isna(self) -> NDArray[np.bool_]:
+        return self._mask.copy()
+
+    def take(
+        self, indices: Any, *, allow_fill: bool = False, fill_value: Any = None
+    ) -> "FlagArray":
+        # A missing fill is masked, anything else is taken as the flags to fill with.
+        missing = fill_value is None or bool(pd.isna(fill_value))
+        fill = 0 if fill_value is None or missing else int(fill_value)
+        data = take(self._data, indices, allow_fill=allow_fill, fill_value=fill)
+        mask = take(self._mask, indices, allow_fill=allow_fill, fill_value=missing)
+        return type(self)(np.asarray(data), self._dtype, np.asarray(mask))
+
+    def copy(self) -> "FlagArray":
+        return type(self)(self._data.copy(), self._dtype, self._mask.copy())
+
+    @classmethod
+    def _concat_same_type(cls, to_concat: Sequence["FlagArray"]) -> "FlagArray":  # type: ignore[override]
+        dtype = to_concat[0].dtype
+        data = np.concatenate([a._data for a in to_concat]).astype(dtype.storage, copy=False)
+        return cls(data, dtype, np.concatenate([a._mask for a in to_concat]))
+
+    def _formatter(self, boxed: bool = False) -> Any:
+        # Flag names such as DIO0|DIO3 rather than the IntFlag repr; 0 sets no flag.
+        flags = self._dtype.flags
+        return lambda value: flags(int(value)).name or str(int(value))
+
+    def flag(self, member: str | enum.IntFlag) -> NDArray[np.bool_]:
+        """Whether ``member``, a flag or its name, is set in each element; missing is unset."""
+        flags = self._dtype.flags
+        value = flags[member] if isinstance(member, str) else flags(member)
+        return ((self._data & int(value)) != 0) & ~self._mask
+
+
+@register_series_accessor("bitmask")
+class BitMaskAccessor:
+    """Read the flags of a :class:`FlagArray` Series one at a time, as ``series.bitmask``."""
+
+    def __init__(self, series: pd.Series) -> None:
+        if not isinstance(series.dtype, FlagDtype):
+            # AttributeError, as pandas accessors raise, so hasattr(series, "bitmask") works.
+            raise AttributeError("Can only use .bitmask with a flags dtype Series.")  # noqa: TRY004
+        self._series = series
+        self._array: FlagArray = series.array  # type: ignore[assignment]
+
+    @property
+    def members(self) -> list[str]:
+        """The names of the flags of the column, in declaration order."""
+        return [str(member.name) for member in self._array.dtype.members]
+
+    def __getitem__(self, member: str | enum.IntFlag) -> pd.Series:
+        """A boolean Series telling whether ``member`` is set in each row."""
+        name = member if isinstance(member, str) else member.name
+        return pd.Series(self._array.flag(member), index=self._series.index, name=name)
+
+    def demux(self) -> pd.DataFrame:
+        """Every flag as a boolean column, as ``demux_bit_masks=True`` reads them."""
+        return pd.DataFrame(
+            {name: self._array.flag(name) for name in self.members}, index=self._series.index
+        )
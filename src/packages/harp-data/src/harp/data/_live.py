@@ -0,0 +1,186 @@
+"""Keep the events of a register as a DataFrame while they arrive from a device.
+
+Concatenating a DataFrame per message copies every earlier row on every message. A
+:class:`LiveTable` appends the frames of a subscription into one preallocated buffer
+instead, and decodes them into a DataFrame only when :meth:`LiveTable.snapshot` asks::
+
+    table = LiveTable(AnalogData, max_rows=10_000)
+    with table.subscribe(device):
+        while running:
+            plot(table.snapshot())
+"""
+
+import threading
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from harp.device.client import Device, Subscription
+from harp.device.client._device import MessageTypeFilter
+from harp.protocol import HarpMessage, HarpParseError, MessageType, RegisterBase
+
+from ._reader import _frames_to_dataframe
+
+_DEFAULT_CAPACITY = 1024
+
+
+class LiveTable:
+    """The frames of ``register`` received so far, read as a DataFrame on demand.
+
+    Each :meth:`append` copies one frame into a preallocated buffer, a single copy of
+    its bytes with nothing decoded. By default the buffer starts with room for
+    ``capacity`` frames and doubles when full, so appending stays amortized constant
+    time and every frame is kept. ``max_rows`` keeps only the latest frames instead, in
+    a ring of that fixed capacity whose oldest frame the next one overwrites.
+
+    :meth:`snapshot` decodes the frames held into a DataFrame, exactly as
+    :func:`~harp.data.parse_to_dataframe` reads the same frames from a file, with the
+    options given here. Without ``max_rows`` the snapshot views the buffer, since frames
+    already appended are never written again, so it costs a decode and no copy. A ring
+    rewrites its frames in place, so its snapshot first copies the frames it holds,
+    oldest first, which ``max_rows`` bounds.
+
+    Appends and snapshots may come from different threads, as the event thread of a
+    :class:`~harp.device.client.Device` and a plotting loop do. Every frame must have
+    the length of the first, which a register of fixed layout guarantees.
+    """
+
+    def __init__(
+        self,
+        register: type[RegisterBase[Any]],
+        *,
+        capacity: int = _DEFAULT_CAPACITY,
+        max_rows: int | None = None,
+        time_index: bool = True,
+        epoch: datetime | None = None,
+        keep_type: bool = False,
+        decode_enums: bool = True,
+        demux_bit_masks: bool = False,
+        columns: Sequence[str] | None = None,
+        pack_bit_masks: bool = False,
+    ) -> None:
+        if capacity < 1:
+            raise ValueError(f"capacity must be positive, not {capacity}.")
+        if max_rows is not None and max_rows < 1:
+            raise ValueError(f"max_rows must be positive, not {max_rows}.")
+        if demux_bit_masks and pack_bit_masks:
+            raise ValueError("demux_bit_masks and pack_bit_masks are exclusive; pass one of them.")
+        self._register = register
+        self._initial_capacity = capacity if max_rows is None else max_rows
+        self._max_rows = max_rows
+        self._options: dict[str, Any] = {
+            "time_index": time_index,
+            "epoch": epoch,
+            "keep_type": keep_type,
+            "decode_enums": decode_enums,
+            "demux_bit_masks": demux_bit_masks,
+            "columns": columns,
+            "pack_bit_masks": pack_bit_masks,
+        }
+        self._lock = threading.Lock()
+        self._stride: int | None = None
+        self._reset()
+
+    def _reset(self) -> None:
+        # A new buffer rather than the old one reused, which snapshots may still view.
+        self._capacity = self._initial_capacity
+        self._frames: np.ndarray | None = None
+        self._buffer: memoryview | None = None
+        self._count = 0
+        self._total = 0
+
+    @property
+    def register(self) -> type[RegisterBase[Any]]:
+        """The register whose frames are kept."""
+        return self._register
+
+    @property
+    def max_rows(self) -> int | None:
+        """The capacity of the ring, or ``None`` when every frame is kept."""
+        return self._max_rows
+
+    @property
+    def total(self) -> int:
+        """The number of frames appended so far, including those a ring dropped."""
+        return self._total
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, message: HarpMessage[Any]) -> None:
+        """Add the frame of ``message`` as the newest row.
+
+        This is the handler :meth:`subscribe` registers; a message received by other
+        means may be appended directly. A frame of another length than the first
+        raises :class:`~harp.protocol.HarpParseError`.
+        """
+        frame = message.bytes
+        stride = len(frame)
+        with self._lock:
+            if self._buffer is None:
+                self._allocate(stride)
+            elif stride != self._stride:
+                raise HarpParseError(
+                    f"{self._register.__name__} frames are {self._stride} bytes long, "
+                    f"but this message has {stride}."
+                )
+            if self._max_rows is None:
+                if self._count == self._capacity:
+                    self._grow()
+                row = self._count
+                self._count += 1
+            else:
+                row = self._total % self._capacity
+                self._count = min(self._count + 1, self._capacity)
+            offset = row * stride
+            self._buffer[offset : offset + stride] = frame  # type: ignore[index]
+            self._total += 1
+
+    def _allocate(self, stride: int) -> None:
+        self._stride = stride
+        self._frames = np.empty(self._capacity * stride, dtype=np.uint8)
+        self._buffer = memoryview(self._frames)
+
+    def _grow(self) -> None:
+        assert self._frames is not None and self._stride is not None
+        used = self._count * self._stride
+        self._capacity *= 2
+        frames = np.empty(self._capacity * self._stride, dtype=np.uint8)
+        frames[:used] = self._frames[:used]
+        self._frames = frames
+        self._buffer = memoryview(frames)
+
+    def _held(self) -> np.ndarray:
+        """The frames held, oldest first, viewed or, in a ring, copied."""
+        with self._lock:
+            if self._frames is None or self._stride is None:
+                return np.empty(0, dtype=np.uint8)
+            used = self._count * self._stride
+            if self._max_rows is None:
+                return self._frames[:used]
+            if self._count < self._capacity:
+                return self._frames[:used].copy()
+            split = (self._total % self._capacity) * self._stride
+            return np.concatenate((self._frames[split:], self._frames[:split]))
+
+    def snapshot(self) -> pd.DataFrame:
+        """The frames held as a DataFrame, one row per frame, oldest first."""
+        return _frames_to_dataframe(self._register, memoryview(self._held()), **self._options)
+
+    def clear(self) -> None:
+        """Drop every frame held, leaving earlier snapshots intact."""
+        with self._lock:
+            self._reset()
+
+    def subscribe(
+        self, device: Device[Any], *, message_types: MessageTypeFilter = MessageType.Event
+    ) -> Subscription:
+        """Append every message ``device`` emits for the register, from now on.
+
+        ``message_types`` filters the messages as in
+        :meth:`~harp.device.client.Device.subscribe`. The returned
+        :class:`~harp.device.client.Subscription` stops the feed when cancelled.
+        """
+        return device.subscribe(self._register, self.append, message_types=message_types)
@@ -0,0 +1,317 @@
+"""Min, max and mean of a register at every zoom, cached beside its files for fast views."""
+
+import json
+from collections.abc import Callable, Sequence
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from harp.protocol import RegisterBase
+from numpy.typing import NDArray
+
+from ._align import _duration_ns
+from ._files import read_chunks, scan_file, seek_frame
+from ._reader import TimeBound, _bound_ns, _nanosecond_index, payload_to_dataframe
+from ._resample import _CHUNK_BYTES, _add_frames, _Partials
+
+_PYRAMID_VERSION = 1
+
+_STATE_FILENAME = "pyramid.json"
+
+_SUMMARIES = ("min", "max", "mean")
+
+
+def _row_dtype(width: int) -> np.dtype[Any]:
+    """One bin of a level: its index, frame count, and the extremes and sum of each column."""
+    return np.dtype(
+        [
+            ("bin", "<i8"),
+            ("count", "<i8"),
+            ("min", "<f8", (width,)),
+            ("max", "<f8", (width,)),
+            ("sum", "<f8", (width,)),
+        ]
+    )
+
+
+def _fold(rows: NDArray[Any]) -> NDArray[Any]:
+    """One row per bin of ``rows``, sorted by bin, folding the rows sharing a bin."""
+    if len(rows) < 2:
+        return rows
+    bins = rows["bin"]
+    starts = np.flatnonzero(np.r_[True, bins[1:] != bins[:-1]])
+    if len(starts) == len(rows):
+        return rows
+    out = np.empty(len(starts), dtype=rows.dtype)
+    out["bin"] = bins[starts]
+    out["count"] = np.add.reduceat(rows["count"], starts)
+    out["min"] = np.minimum.reduceat(rows["min"], starts, axis=0)
+    out["max"] = np.maximum.reduceat(rows["max"], starts, axis=0)
+    out["sum"] = np.add.reduceat(rows["sum"], starts, axis=0)
+    return out
+
+
+def _coarsen(rows: NDArray[Any], factor: int) -> NDArray[Any]:
+    """The sorted ``rows`` of one level folded into the bins of the level above."""
+    coarse = rows.copy()
+    coarse["bin"] //= factor
+    return _fold(coarse)
+
+
+class Pyramid:
+    """The min, max and mean of the numeric columns of one register at a ladder of bin
+    periods, cached in a folder beside its files, for views zooming over long recordings.
+
+    Level ``k`` bins the frames every ``base * factor**k`` seconds, from Harp time
+    zero, up to a level of one bin. :meth:`query` answers a time window at a number
+    of points from the coarsest level still giving that many, reading only the few
+    bins it returns; a window narrower than ``points`` bins of ``base`` reads the raw
+    frames in it instead, found by a binary search of the file headers. :meth:`update`
+    folds in the frames appended since the last update, rewriting only the last bins of
+    each level, and rebuilds the cache when its files were replaced or its options
+    changed.
+
+    The frames of each file are taken to be in time order, as a device writes them.
+    Get one from :meth:`DatasetReader.pyramid`.
+    """
+
+    def __init__(
+        self,
+        register: type[RegisterBase[Any]],
+        folder: Path,
+        files: Callable[[], Sequence[Path]],
+        *,
+        base: float | timedelta,
+        factor: int,
+        columns: Sequence[str] | None,
+        epoch: datetime | None,
+    ) -> None:
+        step = _duration_ns(base)
+        if step <= 0:
+            raise ValueError(f"base must be a positive period, not {base}.")
+        if factor < 2:
+            raise ValueError(f"factor must be at least 2, not {factor}.")
+        template = payload_to_dataframe(register.parse_bulk(b"")[3])
+        numeric = [
+            str(c)
+            for c, t in template.dtypes.items()
+            if isinstance(t, np.dtype) and t.kind in "biuf"
+        ]
+        if columns is None:
+            columns = numeric
+        missing = [c for c in columns if c not in template.columns]
+        if missing:
+            raise KeyError(f"Columns not in the payload: {missing}")
+        rejected = [c for c in columns if c not in numeric]
+        if rejected:
+            raise ValueError(f"Columns {rejected} are not numeric, so have no min, max or mean.")
+        self._register = register
+        self._folder = folder
+        self._files = files
+        self._base = step
+        self._factor = factor
+        self._columns = list(columns)
+        self._epoch = epoch
+        self._dtype = _row_dtype(len(self._columns))
+        self._state = self._load_state()
+
+    @property
+    def folder(self) -> Path:
+        """The folder holding the cache."""
+        return self._folder
+
+    @property
+    def columns(self) -> list[str]:
+        """The columns summarized."""
+        return list(self._columns)
+
+    @property
+    def periods(self) -> list[float]:
+        """The bin period of each level, in seconds, finest first."""
+        return [self._base * self._factor**k / 1e9 for k in range(self._state["levels"])]
+
+    def _load_state(self) -> dict[str, Any]:
+        """The cache description on disk, or that of an empty cache when it is missing or
+        was built with other options."""
+        state = {
+            "version": _PYRAMID_VERSION,
+            "register": self._register.__name__,
+            "base": self._base,
+            "factor": self._factor,
+            "columns": self._columns,
+            "files": {},
+            "levels": 0,
+        }
+        path = self._folder / _STATE_FILENAME
+        if path.is_file():
+            stored = json.loads(path.read_text(encoding="utf-8"))
+            if all(
+                stored.get(key) == state[key] for key in state if key not in ("files", "levels")
+            ):
+                return stored
+        return state
+
+    def _level_path(self, level: int) -> Path:
+        return self._folder / f"level_{level}.dat"
+
+    def _level(self, level: int) -> NDArray[Any]:
+        """The rows of ``level``, mapped rather than read."""
+        path = self._level_path(level)
+        if level >= self._state["levels"] or path.stat().st_size == 0:
+            return np.empty(0, dtype=self._dtype)
+        return np.memmap(path, dtype=self._dtype, mode="r")
+
+    def update(self) -> None:
+        """Fold the frames written since the last update into every level.
+
+        A file read before is read from where the last update stopped, so appending to
+        a recording costs the new frames and the last bins of each level. A file read
+        before and since removed or shortened rebuilds the cache from every file.
+        """
+        spans = [scan_file(path) for path in self._files()]
+        done: dict[str, int] = self._state["files"]
+        sizes = {span.path.name: span.frames * span.stride for span in spans}
+        if any(sizes.get(name, -1) < size for name, size in done.items()):
+            done = {}
+            self._state["levels"] = 0
+        partials = _Partials([(c, how) for c in self._columns for how in _SUMMARIES])
+        for span in spans:
+            offset = done.get(span.path.name, 0)
+            for raw in read_chunks(span, _CHUNK_BYTES, offset):
+                self._add(partials, raw, self._base)
+            done[span.path.name] = sizes[span.path.name]
+        rows = self._rows(partials)
+        self._folder.mkdir(parents=True, exist_ok=True)
+        if len(rows):
+            self._extend(rows)
+        self._state["files"] = done
+        state = self._folder / _STATE_FILENAME
+        state.write_text(json.dumps(self._state), encoding="utf-8")
+
+    def _add(self, partials: _Partials, raw: memoryview, step: int) -> None:
+        options: dict[str, Any] = {"columns": self._columns}
+        _add_frames(
+            partials, self._register, raw, step, epoch=None, start=None, end=None, options=options
+        )
+
+    def _rows(self, partials: _Partials) -> NDArray[Any]:
+        """The bins reduced into ``partials`` as rows of a level."""
+        bins, counts, values = partials.combine()
+        rows = np.empty(len(bins), dtype=self._dtype)
+        rows["bin"] = bins
+        rows["count"] = counts
+        for i, column in enumerate(self._columns):
+            for how, field in zip(_SUMMARIES, ("min", "max", "sum")):
+                rows[field][:, i] = values.get((column, how), 0.0)
+        return rows
+
+    def _extend(self, rows: NDArray[Any]) -> None:
+        """Fold new level-0 ``rows``, sorted by bin, into every level.
+
+        At each level the bins from the first new one on are rewritten, and the level
+        above is rebuilt from the bins of this one feeding its rewritten bins.
+        """
+        level, levels = 0, self._state["levels"]
+        while True:
+            existing = self._level(level)
+            keep = int(np.searchsorted(existing["bin"], rows["bin"][0]))
+            if level == 0:
+                rows = np.concatenate([existing[keep:], rows])
+                if not (rows["bin"][1:] >= rows["bin"][:-1]).all():
+                    rows = rows[np.argsort(rows["bin"], kind="stable")]
+                rows = _fold(rows)
+            feeding = int(
+                np.searchsorted(
+                    existing["bin"][:keep], (rows["bin"][0] // self._factor) * self._factor
+                )
+            )
+            above = np.concatenate([existing[feeding:keep], rows])
+            del existing  # unmap before the file is cut
+            self._write(level, keep, rows)
+            levels = max(levels, level + 1)
+            self._state["levels"] = levels
+            if keep + len(rows) <= 1 and level + 1 >= levels:
+                return
+            rows = _coarsen(above, self._factor)
+            level += 1
+
+    def _write(self, level: int, keep: int, rows: NDArray[Any]) -> None:
+        """Cut ``level`` to its first ``keep`` rows and append ``rows``."""
+        path = self._level_path(level)
+        with open(path, "r+b" if path.exists() and level < self._state["levels"] else "wb") as f:
+            f.truncate(keep * self._dtype.itemsize)
+            f.seek(keep * self._dtype.itemsize)
+            f.write(rows.tobytes())
+
+    def query(
+        self, start: TimeBound | None = None, end: TimeBound | None = None, points: int = 1000
+    ) -> pd.DataFrame:
+        """The min, max and mean of each column over ``[start, end)`` at ``points`` or more
+        bins, from the coarsest level giving as many.
+
+        ``start`` and ``end`` are Harp seconds or datetimes, as for
+        :meth:`DatasetReader.read`, and default to the span of the frames. A window
+        narrower than ``points`` bins of the finest level is binned from the raw frames in
+        it. The columns are a two-level index of column and ``min``, ``max`` and
+        ``mean``, and the index the start of each bin, a bin with no frame being missing.
+        """
+        if points < 1:
+            raise ValueError(f"points must be positive, not {points}.")
+        finest = self._level(0)
+        if len(finest) == 0:
+            return self._frame(np.empty(0, dtype=self._dtype), 0, -1, self._base)
+        low = _bound_ns(start, self._epoch) if start is not None else finest["bin"][0] * self._base
+        high = (
+            _bound_ns(end, self._epoch) if end is not None else (finest["bin"][-1] + 1) * self._base
+        )
+        wanted = max(1, (high - low) // points)
+        level = -1
+        while (
+            level + 1 < self._state["levels"] and self._base * self._factor ** (level + 1) <= wanted
+        ):
+            level += 1
+        if level < 0:
+            period = int(wanted)
+            rows = self._raw(low, high, period)
+        else:
+            period = self._base * self._factor**level
+            found = self._level(level)
+            bins = found["bin"]
+            first = int(np.searchsorted(bins, low // period))
+            last = int(np.searchsorted(bins, (high - 1) // period, side="right"))
+            rows = np.array(found[first:last])
+        return self._frame(rows, low // period, (high - 1) // period, period)
+
+    def _raw(self, low: int, high: int, period: int) -> NDArray[Any]:
+        """The frames timestamped in ``[low, high)`` nanoseconds as rows of bins of
+        ``period``, read from the files with nothing outside the window."""
+        partials = _Partials([(c, how) for c in self._columns for how in _SUMMARIES])
+        for span in map(scan_file, self._files()):
+            first, stop = seek_frame(span, low), seek_frame(span, high)
+            if first < stop:
+                offset = first * span.stride
+                for raw in read_chunks(span, _CHUNK_BYTES, offset, stop * span.stride):
+                    self._add(partials, raw, period)
+        return self._rows(partials)
+
+    def _frame(self, rows: NDArray[Any], first: int, last: int, period: int) -> pd.DataFrame:
+        """The rows of the bins ``first`` to ``last``, every bin a row of the DataFrame."""
+        size = max(0, last - first + 1)
+        offsets = rows["bin"] - first
+        data: dict[tuple[str, str], Any] = {}
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = rows["sum"] / rows["count"][:, None]
+        for i, column in enumerate(self._columns):
+            for how, values in zip(_SUMMARIES, (rows["min"], rows["max"], means)):
+                dense = np.full(size, np.nan)
+                dense[offsets] = values[:, i]
+                data[column, how] = dense
+        df = pd.DataFrame(data, index=pd.RangeIndex(size))
+        df.columns = pd.MultiIndex.from_tuples(
+            [(c, how) for c in self._columns for how in _SUMMARIES], names=["column", "aggregation"]
+        )
+        axis = (np.arange(size, dtype=np.int64) + first) * period
+        df.index = _nanosecond_index(axis, self._epoch)
+        return df
@@ -27,7 +27,7 @@
 )
 from harp.protocol._constants import _HEADER_LEN, _TIMESTAMP_LEN
 
-from ._reader import Source, _read_bytes, parse_to_dataframe
+from ._reader import Layout, Source, TimeBound, _read_bytes, parse_to_dataframe
 
 _SCALAR_REGISTER: dict[PayloadType, Any] = {
     PayloadType.U8: RegisterU8,
@@ -80,6 +80,9 @@ def read(
     time_index: bool = True,
     epoch: datetime | None = None,
     keep_type: bool = False,
+    layout: Layout = "views",
+    start: TimeBound | None = None,
+    end: TimeBound | None = None,
 ) -> pd.DataFrame:
     """Read the binary data of a single register, inferring its native layout.
 
@@ -93,5 +96,12 @@ def read(
         return pd.DataFrame()
     register = _infer_native_register(raw)
     return parse_to_dataframe(
-        register, raw, time_index=time_index, epoch=epoch, keep_type=keep_type
+        register,
+        raw,
+        time_index=time_index,
+        epoch=epoch,
+        keep_type=keep_type,
+        layout=layout,
+        start=start,
+        end=end,
     )
@@ -1,16 +1,34 @@
 """Load Harp register data into pandas DataFrames."""
 
+from collections.abc import Sequence
 from datetime import datetime
 from pathlib import Path
-from typing import Any, BinaryIO
+from typing import Any, BinaryIO, Literal, cast
 
 import numpy as np
 import pandas as pd
-from harp.protocol import RegisterBase
+from harp.protocol import Column, RegisterBase
 from numpy.typing import NDArray
 
+from ._flags import FlagArray, FlagDtype
+
 Source = str | Path | bytes | bytearray | memoryview | BinaryIO
 
+Layout = Literal["views", "records", "block"]
+"""How the columns of a DataFrame lay out in memory.
+
+``"views"`` keeps every column a view into the frames as read, strided by the frame
+length, with no copy; the frames stay alive while the DataFrame does. ``"records"``
+first gathers the payloads out of the frames into one contiguous record array, in a
+single copy of the payload bytes, and views the columns into it, so headers,
+timestamps and checksums are not kept. ``"block"`` copies the columns into one 2-D
+block when they share a numeric dtype, as the elements of an array register or the
+fields of ``AnalogData`` do, and otherwise copies each column into its own array;
+every column is then contiguous.
+"""
+
+_LAYOUTS = ("views", "records", "block")
+
 _MSG_NAMES = np.array(["_NONE", "Read", "Write", "Event"])
 
 REFERENCE_EPOCH = datetime(1904, 1, 1)
@@ -18,14 +36,67 @@
 
 _TIME_INDEX_NAME = "Time"
 
+TimeBound = float | datetime
+"""A bound of a time range: Harp seconds, or an absolute time measured from the epoch."""
+
+
+def _bound_ns(bound: TimeBound, epoch: datetime | None) -> int:
+    """A time range bound as integer nanoseconds of the Harp clock."""
+    if isinstance(bound, datetime):
+        return (pd.Timestamp(bound) - pd.Timestamp(epoch or REFERENCE_EPOCH)).value
+    return round(bound * 1e9)
+
+
+def _time_selection(
+    ns: NDArray[np.int64], start: TimeBound | None, end: TimeBound | None, epoch: datetime | None
+) -> slice | NDArray[np.intp]:
+    """The frames timestamped in ``[start, end)``, compared as integer nanoseconds.
+
+    A contiguous run, as time-ordered frames give, is a slice, so the frames selected
+    stay views; otherwise the indices of the frames.
+    """
+    keep = np.ones(len(ns), dtype=np.bool_)
+    if start is not None:
+        np.greater_equal(ns, _bound_ns(start, epoch), out=keep)
+    if end is not None:
+        keep &= ns < _bound_ns(end, epoch)
+    rows = np.flatnonzero(keep)
+    if len(rows) == 0:
+        return slice(0, 0)
+    if rows[-1] - rows[0] + 1 == len(rows):
+        return slice(int(rows[0]), int(rows[-1]) + 1)
+    return rows
+
 
-def _time_index(seconds: NDArray[np.float64], epoch: datetime | None) -> pd.Index:
-    """The Harp time axis: float seconds, or absolute datetime when ``epoch`` is set."""
+def _time_index(
+    timestamps: Any, epoch: datetime | None, rows: slice | NDArray[np.intp] | None = None
+) -> pd.Index:
+    """The Harp time axis of the frames ``rows``, all by default, or none without timestamps.
+
+    Float seconds, or absolute datetime when ``epoch`` is set. The datetime axis is
+    built from the integer nanoseconds of the frames offset by the epoch in place, and
+    viewed as ``datetime64[ns]``, with no float seconds or timedelta in between.
+    """
+    if rows is None:
+        rows = slice(None)
     if epoch is None:
-        return pd.Index(seconds, name=_TIME_INDEX_NAME)
-    return pd.DatetimeIndex(
-        pd.Timestamp(epoch) + pd.to_timedelta(seconds, unit="s"), name=_TIME_INDEX_NAME
-    )
+        seconds = np.empty(0) if timestamps is None else np.asarray(timestamps, dtype=np.float64)
+        return pd.Index(seconds[rows], name=_TIME_INDEX_NAME)
+    ns = np.empty(0, dtype=np.int64) if timestamps is None else timestamps.nanoseconds()[rows]
+    return _nanosecond_index(ns, epoch)
+
+
+def _nanosecond_index(ns: NDArray[np.int64], epoch: datetime | None) -> pd.Index:
+    """The time axis of Harp integer nanoseconds ``ns``, which are offset in place.
+
+    Float seconds, or absolute datetime when ``epoch`` is set.
+    """
+    if epoch is None:
+        return pd.Index(ns / 1e9, name=_TIME_INDEX_NAME)
+    anchor = pd.Timestamp(epoch)
+    ns += anchor.value  # nanoseconds since the Unix epoch, which datetime64 counts from
+    index = pd.DatetimeIndex(ns.view("M8[ns]"), name=_TIME_INDEX_NAME, copy=False)
+    return index if anchor.tz is None else index.tz_localize("UTC").tz_convert(anchor.tz)
 
 
 def _read_bytes(source: Source) -> bytes:
@@ -39,29 +110,84 @@ def _read_bytes(source: Source) -> bytes:
 _DEFAULT_COLUMN_NAME = "value"
 
 
+def _column_values(column: Column, *, pack_bit_masks: bool) -> Any:
+    """The values of one DataFrame column: labelled categories, packed flags or raw data."""
+    if column.categories is not None:
+        return pd.Categorical.from_codes(column.data, categories=column.categories)
+    if pack_bit_masks and column.flags is not None:
+        return FlagArray(column.data, FlagDtype(column.flags, column.data.dtype, column.mask))
+    return column.data
+
+
+def _block(values: list[Any]) -> NDArray[Any] | None:
+    """The columns stacked as one ``(columns, rows)`` array when they share a numeric dtype."""
+    if not values or not all(isinstance(v, np.ndarray) and v.ndim == 1 for v in values):
+        return None
+    dtype = values[0].dtype
+    if dtype.kind not in "biuf" or any(v.dtype != dtype for v in values):
+        return None
+    block = np.empty((len(values), len(values[0])), dtype=dtype)
+    for row, v in zip(block, values):
+        row[...] = v
+    return block
+
+
 def payload_to_dataframe(
-    payload: Any, *, decode_enums: bool = True, demux_bit_masks: bool = False, copy: bool = False
+    payload: Any,
+    *,
+    decode_enums: bool = True,
+    demux_bit_masks: bool = False,
+    copy: bool = False,
+    columns: Sequence[str] | None = None,
+    pack_bit_masks: bool = False,
+    layout: Layout = "views",
 ) -> pd.DataFrame:
     """Turn a (batched) payload into a DataFrame, one row per frame.
 
     ``decode_enums`` relabels enum columns as ``pd.Categorical``; ``demux_bit_masks``
     expands each flag (``BitMask``) column into one boolean column per flag member.
+    ``pack_bit_masks`` instead keeps each flag column as a single :class:`FlagArray`
+    of its raw integers, whose flags the ``bitmask`` Series accessor reads one at a
+    time; the two are exclusive.
+    ``columns`` keeps only the DataFrame columns with those names, in that order, and
+    leaves every payload field rendering none of them undecoded. A name matching no
+    column raises ``KeyError``.
+    ``layout`` is the :data:`Layout` of the columns in memory; ``copy`` copies them
+    whatever the layout.
     """
     # TODO: we may need to account for cases where columns have the same name.
     # this can happen when demuxing bitmasks, for example, where each bitmask column
     # is expanded into multiple boolean columns with the same name.
-    cols = payload.payload_as_columns(decode_enums=decode_enums, demux_bit_masks=demux_bit_masks)
-    return pd.DataFrame(
-        {
-            (c.name if c.name is not None else _DEFAULT_COLUMN_NAME): (
-                pd.Categorical.from_codes(c.data, categories=c.categories)
-                if c.categories is not None
-                else c.data
-            )
-            for c in cols
-        },
-        copy=copy,
-    )
+    if demux_bit_masks and pack_bit_masks:
+        raise ValueError("demux_bit_masks and pack_bit_masks are exclusive; pass one of them.")
+    if layout not in _LAYOUTS:
+        raise ValueError(f"layout must be 'views', 'records' or 'block', not {layout!r}.")
+    if layout == "records":
+        # One vectorized gather of the payload bytes out of the frames; columns view it.
+        payload = payload._from_array(np.ascontiguousarray(payload.payload_array))
+    options: dict[str, Any] = {"decode_enums": decode_enums, "demux_bit_masks": demux_bit_masks}
+    if columns is not None:
+        # A nameless column is labelled with the default name, so select it by that name.
+        selected: set[str | None] = set(columns)
+        if _DEFAULT_COLUMN_NAME in selected:
+            selected.add(None)
+        options["columns"] = selected
+    cols = payload.payload_as_columns(**options)
+    names = [c.name if c.name is not None else _DEFAULT_COLUMN_NAME for c in cols]
+    values = [_column_values(c, pack_bit_masks=pack_bit_masks) for c in cols]
+    block = _block(values) if layout == "block" else None
+    if block is not None:
+        df = pd.DataFrame(block.T, columns=names, copy=copy)
+    else:
+        if layout == "block":
+            values = [np.ascontiguousarray(v) if isinstance(v, np.ndarray) else v for v in values]
+        df = pd.DataFrame(dict(zip(names, values)), copy=copy)
+    if columns is None:
+        return df
+    missing = [c for c in columns if c not in df.columns]
+    if missing:
+        raise KeyError(f"Columns not in the payload: {missing}")
+    return df.reindex(columns=list(columns))
 
 
 def parse_to_dataframe(
@@ -73,6 +199,11 @@ def parse_to_dataframe(
     keep_type: bool = False,
     decode_enums: bool = True,
     demux_bit_masks: bool = False,
+    columns: Sequence[str] | None = None,
+    pack_bit_masks: bool = False,
+    layout: Layout = "views",
+    start: TimeBound | None = None,
+    end: TimeBound | None = None,
 ) -> pd.DataFrame:
     """Parse all frames of ``register`` from ``source`` into a DataFrame.
 
@@ -84,11 +215,68 @@ def parse_to_dataframe(
     inserts a leading column; ``decode_enums`` controls whether enum fields become
     ``pd.Categorical`` (True) or raw codes; ``demux_bit_masks`` expands each flag
     (``BitMask``) field into one boolean column per flag member (True) or keeps it
-    as a single raw-integer column.
+    as a single raw-integer column, which ``pack_bit_masks`` makes a
+    :class:`FlagArray` column read flag by flag. ``columns`` selects payload columns by name, in
+    that order, decoding only the fields that render them; the ``message_type``
+    column and the time index are unaffected. ``layout`` is the :data:`Layout` of the
+    payload columns in memory.
+
+    ``start`` and ``end`` keep only the frames timestamped in ``[start, end)``, before
+    any payload is decoded. A bound is Harp seconds, or a ``datetime`` measured from
+    ``epoch``, or from :data:`REFERENCE_EPOCH` when it is ``None``; the comparison runs
+    on the integer nanoseconds of the frames.
     """
-    raw = _read_bytes(source)
-    _data, timestamps, msg_view, payload = register.parse_bulk(raw, parse_timestamp=time_index)
-    df = payload_to_dataframe(payload, decode_enums=decode_enums, demux_bit_masks=demux_bit_masks)
+    return _frames_to_dataframe(
+        register,
+        _read_bytes(source),
+        time_index=time_index,
+        epoch=epoch,
+        keep_type=keep_type,
+        decode_enums=decode_enums,
+        demux_bit_masks=demux_bit_masks,
+        columns=columns,
+        pack_bit_masks=pack_bit_masks,
+        layout=layout,
+        start=start,
+        end=end,
+    )
+
+
+def _frames_to_dataframe(
+    register: type[RegisterBase[Any]],
+    raw: bytes | memoryview,
+    *,
+    time_index: bool = True,
+    epoch: datetime | None = None,
+    keep_type: bool = False,
+    decode_enums: bool = True,
+    demux_bit_masks: bool = False,
+    columns: Sequence[str] | None = None,
+    pack_bit_masks: bool = False,
+    layout: Layout = "views",
+    start: TimeBound | None = None,
+    end: TimeBound | None = None,
+) -> pd.DataFrame:
+    """:func:`parse_to_dataframe` of frames already in memory, viewed rather than copied."""
+    bounded = start is not None or end is not None
+    _data, timestamps, msg_view, payload = register.parse_bulk(
+        raw, parse_timestamp=time_index or bounded
+    )
+    rows = None
+    if bounded and timestamps is not None:
+        rows = _time_selection(timestamps.nanoseconds(), start, end, epoch)
+        payload = cast(Any, payload)._from_array(payload.payload_array[rows])
+        msg_view = msg_view[rows] if msg_view is not None else None
+    elif bounded and len(payload) > 0:
+        raise ValueError("Buffer contains no timestamp data to select a time range from.")
+    df = payload_to_dataframe(
+        payload,
+        decode_enums=decode_enums,
+        demux_bit_masks=demux_bit_masks,
+        columns=columns,
+        pack_bit_masks=pack_bit_masks,
+        layout=layout,
+    )
 
     if keep_type and msg_view is not None:
         df.insert(
@@ -97,14 +285,10 @@ def parse_to_dataframe(
             pd.Categorical(_MSG_NAMES[msg_view & 0x03], categories=_MSG_NAMES[1:]),
         )
     if time_index:
-        if timestamps is None:
-            if len(df) > 0:
-                raise ValueError(
-                    "Buffer contains no timestamp data; pass time_index=False to suppress "
-                    "the time index."
-                )
-            seconds = np.empty(0, dtype=np.float64)  # empty buffer: empty Time index
-        else:
-            seconds = np.asarray(timestamps, dtype=np.float64)
-        df.index = _time_index(seconds, epoch)
+        if timestamps is None and len(df) > 0:
+            raise ValueError(
+                "Buffer contains no timestamp data; pass time_index=False to suppress "
+                "the time index."
+            )
+        df.index = _time_index(timestamps, epoch, rows)  # an empty buffer: empty Time index
     return df
@@ -0,0 +1,245 @@
+"""A register read as per-bin aggregates, reduced chunk by chunk as its files stream in."""
+
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Literal, cast
+
+import numpy as np
+import pandas as pd
+from harp.protocol import RegisterBase
+from numpy.typing import NDArray
+
+from ._align import _duration_ns
+from ._files import read_chunks, scan_file
+from ._reader import TimeBound, _nanosecond_index, _time_selection, payload_to_dataframe
+
+Aggregation = Literal["min", "max", "mean", "last"]
+"""How :meth:`DatasetReader.read` reduces the frames falling in one bin of a resample.
+
+``"min"``, ``"max"`` and ``"mean"`` reduce numeric columns, the mean as float;
+``"last"`` keeps the latest frame of the bin and reduces any column.
+"""
+
+_AGGREGATIONS = ("min", "max", "mean", "last")
+
+_CHUNK_BYTES = 1 << 24
+"""Bytes of frames read and reduced at a time."""
+
+
+def _reduce(how: str, values: NDArray[Any], starts: NDArray[np.intp]) -> NDArray[Any]:
+    """The runs of ``values`` beginning at ``starts`` reduced by ``how``; a mean is a sum."""
+    if how == "min":
+        return np.minimum.reduceat(values, starts)
+    if how == "max":
+        return np.maximum.reduceat(values, starts)
+    if how == "mean":
+        return np.add.reduceat(values, starts, dtype=np.float64)
+    return values[np.r_[starts[1:], len(values)] - 1]
+
+
+def _runs(bins: NDArray[np.int64]) -> NDArray[np.intp]:
+    """Where each run of equal values of the sorted ``bins`` begins."""
+    return np.flatnonzero(np.r_[True, bins[1:] != bins[:-1]])
+
+
+class _Partials:
+    """The reductions of every chunk read so far, one entry per bin the chunk touched.
+
+    A bin straddling two chunks holds one entry from each until :meth:`combine` folds
+    them, with the same reductions, since a minimum of minima, a sum of sums or a last
+    of lasts is the reduction of the whole bin. Memory therefore follows the number of
+    bins, not of frames.
+    """
+
+    def __init__(self, reductions: Sequence[tuple[Any, str]]) -> None:
+        self._reductions = reductions
+        self._bins: list[NDArray[np.int64]] = []
+        self._counts: list[NDArray[np.int64]] = []
+        self._values: dict[tuple[Any, str], list[NDArray[Any]]] = {r: [] for r in reductions}
+
+    def add(self, bins: NDArray[np.int64], columns: dict[Any, NDArray[Any]]) -> None:
+        """Reduce one chunk of frames, its ``bins`` sorted."""
+        starts = _runs(bins)
+        self._bins.append(bins[starts])
+        self._counts.append(np.diff(np.r_[starts, len(bins)]))
+        for column, how in self._reductions:
+            self._values[column, how].append(_reduce(how, columns[column], starts))
+
+    def combine(self) -> tuple[NDArray[np.int64], NDArray[np.int64], dict[Any, NDArray[Any]]]:
+        """The bins with frames, in order, their frame counts and reduced columns."""
+        bins = np.concatenate(self._bins) if self._bins else np.empty(0, dtype=np.int64)
+        counts = np.concatenate(self._counts) if self._counts else np.empty(0, dtype=np.int64)
+        values = {r: np.concatenate(v) for r, v in self._values.items() if v}
+        if len(self._bins) > 1:
+            # Chunks in time order only repeat the bins at their edges; others need sorting.
+            if not (bins[1:] >= bins[:-1]).all():
+                order = np.argsort(bins, kind="stable")
+                bins, counts = bins[order], counts[order]
+                values = {r: v[order] for r, v in values.items()}
+            starts = _runs(bins)
+            bins, counts = bins[starts], np.add.reduceat(counts, starts)
+            values = {(c, how): _reduce(how, v, starts) for (c, how), v in values.items()}
+        return bins, counts, values
+
+
+class _Categories:
+    """The categories of the categorical columns, accumulated over the chunks read.
+
+    A chunk labels its codes with categories of its own, as an enum code outside the
+    declared values or a categorical string adds labels seen only in that chunk, so each
+    chunk is recoded onto the labels of every chunk read so far.
+    """
+
+    def __init__(self, template: pd.DataFrame) -> None:
+        self._positions: dict[Any, dict[Any, int]] = {
+            c: {label: i for i, label in enumerate(t.categories)}
+            for c, t in template.dtypes.items()
+            if isinstance(t, pd.CategoricalDtype)
+        }
+
+    def values(self, column: Any, series: pd.Series) -> NDArray[Any]:
+        """The raw values of a column: codes into the accumulated labels of a categorical,
+        else its array."""
+        if not isinstance(series.dtype, pd.CategoricalDtype):
+            return series.to_numpy()
+        positions = self._positions.setdefault(column, {})
+        recode = np.empty(len(series.dtype.categories) + 1, dtype=np.int64)
+        for i, label in enumerate(series.dtype.categories):
+            recode[i] = positions.setdefault(label, len(positions))
+        recode[-1] = -1  # a missing value, code -1, stays missing
+        return recode[series.cat.codes.to_numpy()]
+
+    def dtype(self, column: Any, template: pd.CategoricalDtype) -> pd.CategoricalDtype:
+        """The categorical dtype of ``column`` over every label read."""
+        return pd.CategoricalDtype(list(self._positions[column]), ordered=template.ordered)
+
+
+def _dense(bins: NDArray[np.int64], values: NDArray[Any], size: int) -> NDArray[Any]:
+    """``values`` at offsets ``bins`` of a regular axis of ``size`` bins, missing elsewhere."""
+    if len(values) == size:
+        return values
+    if values.dtype.kind in "biuf":
+        out: NDArray[Any] = np.full(size, np.nan)
+    else:
+        out = np.full(size, None, dtype=object)
+    out[bins] = values
+    return out
+
+
+def _add_frames(
+    partials: _Partials,
+    register: type[RegisterBase[Any]],
+    raw: memoryview,
+    step: int,
+    *,
+    epoch: datetime | None,
+    start: TimeBound | None,
+    end: TimeBound | None,
+    options: dict[str, Any],
+    categories: _Categories | None = None,
+) -> None:
+    """Decode the frames ``raw`` in ``[start, end)`` and reduce them into bins of ``step``
+    nanoseconds, recoding categorical columns onto ``categories``."""
+    _data, timestamps, _msg, payload = register.parse_bulk(raw, parse_timestamp=True)
+    if timestamps is None:
+        if len(payload) > 0:
+            raise ValueError("Buffer contains no timestamp data to resample.")
+        return
+    ns = timestamps.nanoseconds()
+    if start is not None or end is not None:
+        rows = _time_selection(ns, start, end, epoch)
+        ns = ns[rows]
+        payload = cast(Any, payload)._from_array(payload.payload_array[rows])
+    frame = payload_to_dataframe(payload, **options)
+    if categories is None:
+        columns = {c: series.to_numpy() for c, series in frame.items()}
+    else:
+        columns = {c: categories.values(c, series) for c, series in frame.items()}
+    bins = ns // step
+    if len(bins) > 1 and not (bins[1:] >= bins[:-1]).all():
+        order = np.argsort(bins, kind="stable")
+        bins = bins[order]
+        columns = {c: v[order] for c, v in columns.items()}
+    if len(bins):
+        partials.add(bins, columns)
+
+
+def resample_frames(
+    register: type[RegisterBase[Any]],
+    paths: Sequence[Path],
+    *,
+    period: float | timedelta,
+    aggregate: Aggregation | Sequence[Aggregation],
+    epoch: datetime | None,
+    start: TimeBound | None,
+    end: TimeBound | None,
+    **options: Any,
+) -> pd.DataFrame:
+    """The frames of ``register`` in ``paths`` reduced by ``aggregate`` over bins of
+    ``period``, read a chunk at a time and never decoded whole.
+
+    The bins are aligned to multiples of ``period`` from Harp time zero, and labelled by
+    their start; every bin from the first frame to the last is a row, missing where the
+    bin holds no frame.
+    """
+    hows = [aggregate] if isinstance(aggregate, str) else list(aggregate)
+    if not hows or any(how not in _AGGREGATIONS for how in hows):
+        raise ValueError(f"aggregate must be 'min', 'max', 'mean' or 'last', not {aggregate!r}.")
+    step = _duration_ns(period)
+    if step <= 0:
+        raise ValueError(f"resample must be a positive period, not {period}.")
+    template = payload_to_dataframe(register.parse_bulk(b"")[3], **options)
+    numeric = {
+        c for c, t in template.dtypes.items() if isinstance(t, np.dtype) and t.kind in "biuf"
+    }
+    reducing = any(how != "last" for how in hows)
+    rejected = [c for c in template.columns if c not in numeric and reducing]
+    if rejected:
+        raise ValueError(
+            f"Columns {rejected} are not numeric, so only aggregate='last' reduces them; "
+            "select the numeric ones with columns=, or pass decode_enums=False to reduce codes."
+        )
+    reductions = [(c, how) for c in template.columns for how in hows]
+    partials = _Partials(reductions)
+    categories = _Categories(template)
+    for span in map(scan_file, paths):
+        for raw in read_chunks(span, _CHUNK_BYTES):
+            _add_frames(
+                partials,
+                register,
+                raw,
+                step,
+                epoch=epoch,
+                start=start,
+                end=end,
+                options=options,
+                categories=categories,
+            )
+
+    bins, counts, values = partials.combine()
+    first = int(bins[0]) if len(bins) else 0
+    size = int(bins[-1]) - first + 1 if len(bins) else 0
+    offsets = bins - first
+    empty = {c: categories.values(c, series) for c, series in template.items()}
+    data: dict[Any, Any] = {}
+    for column, how in reductions:
+        reduced = values.get((column, how))
+        if reduced is None:
+            reduced = empty[column]
+        if how == "mean":
+            reduced = reduced / counts
+        dtype = template.dtypes[column]
+        if how == "last" and isinstance(dtype, pd.CategoricalDtype):
+            codes = np.full(size, -1, dtype=reduced.dtype)
+            codes[offsets] = reduced
+            dense: Any = pd.Categorical.from_codes(codes, dtype=categories.dtype(column, dtype))
+        else:
+            dense = _dense(offsets, reduced, size)
+        data[column if isinstance(aggregate, str) else (column, how)] = dense
+    df = pd.DataFrame(data, index=pd.RangeIndex(size))
+    if not isinstance(aggregate, str):
+        df.columns = pd.MultiIndex.from_tuples(list(data), names=["column", "aggregation"])
+    axis = (np.arange(size, dtype=np.int64) + first) * step
+    df.index = _nanosecond_index(axis, epoch)
+    return df
@@ -39,7 +39,15 @@ def to_file(
     message_type: MessageType | ArrayLike = MessageType.Event,
     port: int = 255,
 ) -> None:
-    """Write ``values`` as ``register`` frames to ``file`` (see :func:`to_buffer`)."""
-    to_buffer(register, values, timestamps=timestamps, message_type=message_type, port=port).tofile(
-        file
+    """Write ``values`` as ``register`` frames to ``file`` (see :func:`to_buffer`).
+
+    Frames are encoded in fixed-size chunks and written as each one fills, so memory
+    stays bounded by the chunk size rather than the size of the file. The values,
+    timestamps and message types are validated before ``file`` is opened, so a batch
+    that cannot be encoded leaves an existing file untouched.
+    """
+    chunks = register.format_bulk_chunks(
+        values, timestamps=timestamps, message_type=message_type, port=port
     )
+    with open(file, "wb") as f:
+        f.writelines(chunks)
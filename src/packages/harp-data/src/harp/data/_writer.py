@@ -0,0 +1,384 @@
+"""Stream Harp register data to a dataset folder, the counterpart of :class:`DatasetReader`.
+
+:func:`~harp.data.to_file` writes one register in one call. A recording arrives over
+time instead, so these writers keep their files open and append each batch as it
+comes, rotating to a new ``<name>_<address>_<suffix>.bin`` chunk when one is full.
+"""
+
+import os
+import sys
+from collections.abc import Mapping
+from os import PathLike
+from pathlib import Path
+from typing import Any, BinaryIO, Generic, Literal, Self
+
+from harp.device.schema import DeviceModule, create_device_module
+from harp.protocol import MessageType, PayloadBase, RegisterBase
+from numpy.typing import ArrayLike
+
+from ._dataset import DEVICE_SCHEMA_FILENAME, M, RegisterKey, _name_map, _resolve_register
+
+FlushPolicy = Literal["write", "chunk"]
+"""When buffered frames are handed to the operating system.
+
+``"write"`` flushes at the end of every :meth:`RegisterWriter.write`, so a reader of the
+folder sees each batch as soon as it is written. ``"chunk"`` flushes only when a chunk
+file is closed, on rotation or on :meth:`RegisterWriter.close`, leaving the batching to
+the file buffer.
+"""
+
+CHUNK_SUFFIX_DIGITS = 4
+"""Width of the zero padding of the sequence number suffixing each rotated chunk file;
+the 10,000th chunk and later take more digits."""
+
+_DEFAULT_BUFFER_SIZE = 1 << 20
+
+
+class RegisterWriter:
+    """Append frames of one register to ``<name>_<address>.bin`` in ``root``.
+
+    Each :meth:`write` encodes a batch with
+    :meth:`~harp.protocol.RegisterBase.format_bulk_chunks` and appends it, so memory
+    stays bounded by the encoding chunk whatever the size of the batch::
+
+        with RegisterWriter(AnalogData, "session.harp", "Behavior") as writer:
+            for values, seconds in acquisition:
+                writer.write(values, timestamps=seconds)
+
+    ``max_frames`` and ``max_bytes`` rotate the output into chunk files named
+    ``<name>_<address>_<suffix>.bin``, where the suffix is a zero-padded sequence
+    number, and :class:`DatasetReader` concatenates them back in sequence, ordering the
+    numbers by value once they outgrow the padding. A chunk holds whole frames only, so
+    a batch crossing the limit is split between two chunks, and a chunk always holds at
+    least one frame.
+    Without either limit every frame goes to the one unsuffixed file.
+
+    ``flush`` is the :data:`FlushPolicy`. ``fsync`` additionally asks the operating
+    system to commit every flush to disk, trading throughput for durability if the
+    machine fails mid-recording. ``buffer_size`` is the size of the file buffer.
+
+    Files are created exclusively, so a writer never overwrites a recording and an
+    existing file of the same name raises ``FileExistsError``.
+    """
+
+    def __init__(
+        self,
+        register: type[RegisterBase[Any]],
+        root: str | PathLike[str],
+        name: str,
+        *,
+        max_frames: int | None = None,
+        max_bytes: int | None = None,
+        flush: FlushPolicy = "write",
+        fsync: bool = False,
+        buffer_size: int = _DEFAULT_BUFFER_SIZE,
+    ) -> None:
+        if max_frames is not None and max_frames < 1:
+            raise ValueError(f"max_frames must be positive, not {max_frames}.")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError(f"max_bytes must be positive, not {max_bytes}.")
+        if flush not in ("write", "chunk"):
+            raise ValueError(f"flush must be 'write' or 'chunk', not {flush!r}.")
+        self._register = register
+        self._root = Path(root)
+        self._name = name
+        self._max_frames = max_frames
+        self._max_bytes = max_bytes
+        self._flush = flush
+        self._fsync = fsync
+        self._buffer_size = buffer_size
+        self._file: BinaryIO | None = None
+        self._chunk_frames = 0
+        self._frame_count = 0
+        self._paths: list[Path] = []
+        self._closed = False
+
+    @property
+    def register(self) -> type[RegisterBase[Any]]:
+        """The register whose frames are written."""
+        return self._register
+
+    @property
+    def frame_count(self) -> int:
+        """The number of frames written so far, across every chunk."""
+        return self._frame_count
+
+    @property
+    def paths(self) -> list[Path]:
+        """The files written so far, in write order."""
+        return list(self._paths)
+
+    @property
+    def closed(self) -> bool:
+        """Whether :meth:`close` has been called."""
+        return self._closed
+
+    @property
+    def rotates(self) -> bool:
+        """Whether the output is split into suffixed chunk files."""
+        return self._max_frames is not None or self._max_bytes is not None
+
+    def write(
+        self,
+        values: PayloadBase | ArrayLike,
+        *,
+        timestamps: ArrayLike | None = None,
+        message_type: MessageType | ArrayLike = MessageType.Event,
+        port: int = 255,
+    ) -> int:
+        """Append ``values`` as frames and return how many were written.
+
+        The arguments match :func:`~harp.data.to_buffer`. A dataset read through
+        :class:`DatasetReader` is indexed on time, so its frames carry ``timestamps``.
+        The batch is validated before any of it is encoded, so a batch that raises
+        ``ValueError`` writes nothing and leaves :attr:`frame_count` as it was.
+        """
+        if self._closed:
+            raise ValueError(f"Cannot write {self._register.__name__} frames to a closed writer.")
+        chunks = self._register.format_bulk_chunks(
+            values, timestamps=timestamps, message_type=message_type, port=port
+        )
+        written = 0
+        for frames in chunks:
+            stride = int(frames[1]) + 2  # every frame of a chunk shares one length
+            count = len(frames) // stride
+            start = 0
+            while start < count:
+                file = self._current_file(stride)
+                take = min(count - start, self._capacity(stride) - self._chunk_frames)
+                file.write(frames[start * stride : (start + take) * stride])
+                self._chunk_frames += take
+                start += take
+            written += count
+        self._frame_count += written
+        if self._flush == "write" and self._file is not None:
+            self._flush_file(self._file)
+        return written
+
+    def flush(self) -> None:
+        """Hand buffered frames to the operating system, and commit them if ``fsync``."""
+        if self._file is not None:
+            self._flush_file(self._file)
+
+    def close(self) -> None:
+        """Flush and close the current chunk. Further writes raise ``ValueError``."""
+        self._close_chunk()
+        self._closed = True
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def _capacity(self, stride: int) -> int:
+        """The number of frames of ``stride`` bytes one chunk file holds."""
+        limits = [] if self._max_frames is None else [self._max_frames]
+        if self._max_bytes is not None:
+            limits.append(max(1, self._max_bytes // stride))
+        return min(limits, default=sys.maxsize)
+
+    def _current_file(self, stride: int) -> BinaryIO:
+        if self._file is not None and self._chunk_frames >= self._capacity(stride):
+            self._close_chunk()
+        if self._file is None:
+            self._file = self._open_chunk()
+            self._chunk_frames = 0
+        return self._file
+
+    def _open_chunk(self) -> BinaryIO:
+        stem = f"{self._name}_{self._register.address}"
+        if self.rotates:
+            stem = f"{stem}_{len(self._paths):0{CHUNK_SUFFIX_DIGITS}d}"
+        path = self._root / f"{stem}.bin"
+        file = open(path, "xb", buffering=self._buffer_size)  # noqa: SIM115
+        self._paths.append(path)
+        return file
+
+    def _close_chunk(self) -> None:
+        if self._file is None:
+            return
+        self._flush_file(self._file)
+        self._file.close()
+        self._file = None
+
+    def _flush_file(self, file: BinaryIO) -> None:
+        file.flush()
+        if self._fsync:
+            os.fsync(file.fileno())
+
+
+class DatasetWriter(Generic[M]):
+    """Writer of a de-multiplexed Harp dataset folder, the counterpart of :class:`DatasetReader`.
+
+    Construct from a device module and a folder, then append the frames of any register
+    by register class, by name, or by address, as they arrive::
+
+        with DatasetWriter(behavior, "session.harp", schema=schema_text) as writer:
+            writer.write(behavior.AnalogData, values, timestamps=seconds)
+            writer.write("DigitalInputState", states, timestamps=seconds)
+
+        reader = open_dataset("session.harp")
+
+    :func:`create_dataset` builds one from a ``device.yml``. Each register gets its own
+    :class:`RegisterWriter`, opened on its first write, and the rotation, flush and
+    ``fsync`` options apply to each of them. ``schema`` is the text of the device schema,
+    written into the folder as ``device.yml`` so the folder opens with
+    :func:`open_dataset` alone. A folder already holding a different schema raises
+    ``FileExistsError`` rather than describing frames it did not record.
+
+    The files are named by the ``DEVICE_NAME`` declared by the module, or ``name`` when
+    given, the same prefix :class:`DatasetReader` matches them by.
+    """
+
+    def __init__(
+        self,
+        device_module: M,
+        root: str | PathLike[str],
+        *,
+        schema: str | bytes | None = None,
+        name: str | None = None,
+        max_frames: int | None = None,
+        max_bytes: int | None = None,
+        flush: FlushPolicy = "write",
+        fsync: bool = False,
+        buffer_size: int = _DEFAULT_BUFFER_SIZE,
+    ) -> None:
+        self._device_module = device_module
+        self._root = Path(root)
+        self._name = name or device_module.DEVICE_NAME
+        if not self._name:
+            raise ValueError(
+                f"The device module declares an empty DEVICE_NAME, so it cannot name the "
+                f"files under {self._root}. Pass name= with the file prefix to write."
+            )
+        self._options: dict[str, Any] = {
+            "max_frames": max_frames,
+            "max_bytes": max_bytes,
+            "flush": flush,
+            "fsync": fsync,
+            "buffer_size": buffer_size,
+        }
+        self._name_map = _name_map(device_module.REGISTER_MAP)
+        self._writers: dict[int, RegisterWriter] = {}
+        self._closed = False
+        self._root.mkdir(parents=True, exist_ok=True)
+        if schema is not None:
+            self._write_schema(schema.encode() if isinstance(schema, str) else schema)
+
+    @property
+    def root(self) -> Path:
+        """The dataset folder being written."""
+        return self._root
+
+    @property
+    def device_module(self) -> M:
+        """The device module whose registers are written, as the type it was given."""
+        return self._device_module
+
+    @property
+    def name(self) -> str:
+        """The ``<DeviceName>`` prefix of the binary files."""
+        return self._name
+
+    @property
+    def paths(self) -> Mapping[int, list[Path]]:
+        """The mapping from address to the binary files written so far, in write order."""
+        return {address: self._writers[address].paths for address in sorted(self._writers)}
+
+    def write(
+        self,
+        register: RegisterKey,
+        values: PayloadBase | ArrayLike,
+        *,
+        timestamps: ArrayLike | None = None,
+        message_type: MessageType | ArrayLike = MessageType.Event,
+        port: int = 255,
+    ) -> int:
+        """Append ``values`` as frames of ``register`` and return how many were written.
+
+        ``register`` is a register class, a register name, or an address, resolved as
+        :meth:`DatasetReader.read` resolves it. The remaining arguments match
+        :meth:`RegisterWriter.write`.
+        """
+        return self.writer(register).write(
+            values, timestamps=timestamps, message_type=message_type, port=port
+        )
+
+    def writer(self, register: RegisterKey) -> RegisterWriter:
+        """The :class:`RegisterWriter` of ``register``, opened on first use."""
+        if self._closed:
+            raise ValueError(f"Cannot write to the closed dataset writer of {self._root}.")
+        cls, address = _resolve_register(self._device_module.REGISTER_MAP, self._name_map, register)
+        writer = self._writers.get(address)
+        if writer is None:
+            writer = RegisterWriter(cls, self._root, self._name, **self._options)
+            self._writers[address] = writer
+        return writer
+
+    def flush(self) -> None:
+        """Flush the writer of every register written so far."""
+        for writer in self._writers.values():
+            writer.flush()
+
+    def close(self) -> None:
+        """Close the writer of every register. Further writes raise ``ValueError``."""
+        for writer in self._writers.values():
+            writer.close()
+        self._closed = True
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def _write_schema(self, schema: bytes) -> None:
+        path = self._root / DEVICE_SCHEMA_FILENAME
+        if path.is_file():
+            if path.read_bytes() == schema:
+                return
+            raise FileExistsError(
+                f"{path} already describes a different device schema, so the frames "
+                f"written here would be read against the wrong register map."
+            )
+        path.write_bytes(schema)
+
+
+def create_dataset(
+    root: str | PathLike[str],
+    schema: str | PathLike[str],
+    *,
+    name: str | None = None,
+    converters: Mapping[str, Any] | None = None,
+    require_converters: bool = True,
+    cache_dir: str | PathLike[str] | None = None,
+    max_frames: int | None = None,
+    max_bytes: int | None = None,
+    flush: FlushPolicy = "write",
+    fsync: bool = False,
+    buffer_size: int = _DEFAULT_BUFFER_SIZE,
+) -> DatasetWriter[DeviceModule]:
+    """Create a Harp dataset folder from a ``device.yml`` and return a :class:`DatasetWriter`.
+
+    The counterpart of :func:`open_dataset`: the schema at ``schema`` is built into a
+    module with :func:`~harp.device.schema.create_device_module`, forwarding
+    ``converters``, ``require_converters`` and ``cache_dir``, and copied into ``root`` as
+    ``device.yml``, so the finished folder opens with ``open_dataset(root)``. The
+    remaining options match :class:`DatasetWriter`.
+    """
+    text = Path(schema).read_bytes()
+    module = create_device_module(
+        text, converters=converters, require_converters=require_converters, cache_dir=cache_dir
+    )
+    return DatasetWriter(
+        module,
+        root,
+        schema=text,
+        name=name,
+        max_frames=max_frames,
+        max_bytes=max_bytes,
+        flush=flush,
+        fsync=fsync,
+        buffer_size=buffer_size,
+    )
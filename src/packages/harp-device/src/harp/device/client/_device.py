@@ -246,6 +246,11 @@ def write(
         timestamp: float | None = None,
         port: int = 255,
     ) -> HarpMessage[P]:
+        """Write ``value`` to ``register`` and return the reply of the device.
+
+        The frame is encoded through the :class:`~harp.protocol.FrameEncoder` the
+        register caches for this shape, so repeated writes reuse one precompiled header.
+        """
         frame = register.format(
             value, message_type=MessageType.Write, timestamp=timestamp, port=port
         )
@@ -1,10 +1,14 @@
-"""Building a device interface from a Harp ``device.yml`` at runtime."""
+"""Building a device interface from a Harp ``device.yml``, at runtime or ahead of time."""
 
+from ._codegen import generate_device_module, write_device_package
 from ._emit import ConverterContext, parse_device_schema
-from ._module import DeviceModule, DeviceModuleLike, create_device_module
+from ._module import DeviceModule, DeviceModuleLike, clear_module_cache, create_device_module
 
 __all__ = [
     "create_device_module",
+    "clear_module_cache",
+    "generate_device_module",
+    "write_device_package",
     "DeviceModule",
     "DeviceModuleLike",
     "parse_device_schema",
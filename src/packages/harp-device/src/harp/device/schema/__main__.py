@@ -0,0 +1,6 @@
+"""Generate a device package: ``python -m harp.device.schema device.yml <folder>``."""
+
+from ._codegen import main
+
+if __name__ == "__main__":
+    main()
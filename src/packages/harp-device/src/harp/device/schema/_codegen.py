@@ -0,0 +1,385 @@
+"""Write a device package ahead of time from a device schema.
+
+:func:`create_device_module` resolves a ``device.yml`` into classes every time a
+process starts. :func:`generate_device_module` runs the same resolution once and
+renders its result as Python source, the shape of ``harp.device.core`` and of the
+generated device packages: enums, payload and register classes at module level, with
+every converter, mask, offset and default spelled out, and a ``REGISTER_MAP`` beside
+them. Importing that source executes class statements only, and a type checker sees
+each declaration with its own type.
+"""
+
+import argparse
+import enum
+import json
+from collections.abc import Sequence
+from dataclasses import dataclass
+from os import PathLike
+from pathlib import Path
+from typing import Any, cast
+
+import numpy as np
+from harp.protocol import (
+    BoolConverter,
+    Converter,
+    Field,
+    HarpVersionConverter,
+    IdentityConverter,
+    StringConverter,
+    StructPayload,
+)
+from harp.protocol._payload import _MISSING
+
+from ._emit import (
+    _ARRAY_REGISTER,
+    _INTERFACES,
+    _SCALAR_REGISTER,
+    ConverterContext,
+    _Emitter,
+    _PayloadSpec,
+    parse_device_schema,
+)
+from ._model import DeviceModel, MaskValue, MaskValueItem
+
+_HEADER = (
+    "# This file was automatically generated and should not be edited directly.\n"
+    "# To make changes, edit the device metadata and regenerate the interface.\n"
+)
+
+_LINE_LENGTH = 100
+"""Longest line written before a call is wrapped, matching the formatter of the repository."""
+
+_INDENT = "    "
+
+
+@dataclass(frozen=True)
+class _ConverterReference:
+    """A custom converter, named by its symbol in the ``converters`` module of the package."""
+
+    symbol: str
+    annotation: str
+
+
+class _SourceEmitter(_Emitter):
+    """An emitter resolving custom converters to references rather than instances.
+
+    A generated package imports its custom converters from a ``converters`` module
+    beside it, as the generator lays a device package out, so only their symbols are
+    needed to write it.
+    """
+
+    def _extension(self, symbol: str, ctx: ConverterContext) -> Converter[Any]:
+        if not self.require_converters:
+            return super()._extension(symbol, ctx)
+        entry = _INTERFACES.get(ctx.interface_type or "")
+        native = entry.native_dtype if entry is not None else None
+        annotation = "Any" if native is None else _scalar(np.dtype(native))
+        return cast(Converter[Any], _ConverterReference(symbol, annotation))
+
+
+def _scalar(dtype: np.dtype) -> str:
+    return f"np.{dtype.type.__name__}"
+
+
+def _hex(value: int) -> str:
+    return f"0x{value:X}"
+
+
+def _docstring(text: str | None, indent: str) -> list[str]:
+    if not text:
+        return []
+    escaped = " ".join(text.split()).replace("\\", "\\\\").replace('"""', '\\"\\"\\"')
+    return [f'{indent}"""{escaped}"""']
+
+
+def _call(
+    prefix: str, callee: str, args: Sequence[str], indent: str, suffix: str = ""
+) -> list[str]:
+    """Render ``prefix callee(args)suffix``, wrapped the way the formatter wraps a long call."""
+    joined = ", ".join(args)
+    line = f"{indent}{prefix}{callee}({joined}){suffix}"
+    if len(line) <= _LINE_LENGTH:
+        return [line]
+    inner = indent + _INDENT
+    if len(inner) + len(joined) <= _LINE_LENGTH:
+        return [f"{indent}{prefix}{callee}(", f"{inner}{joined}", f"{indent}){suffix}"]
+    return [f"{indent}{prefix}{callee}(", *(f"{inner}{arg}," for arg in args), f"{indent}){suffix}"]
+
+
+def _import_block(module: str, names: set[str]) -> list[str]:
+    return [f"from {module} import (", *(f"{_INDENT}{name}," for name in sorted(names)), ")"]
+
+
+class _Renderer:
+    """Render the declarations of one schema as the source of a device module."""
+
+    def __init__(self, device: DeviceModel, name: str | None, require_converters: bool) -> None:
+        self.device = device
+        self.name = name or device.device or ""
+        self.emitter = _SourceEmitter(device, None, require_converters)
+        self.protocol: set[str] = {"PayloadType", "RegisterBase"}
+        self.core: set[str] = set()
+        self.converters: set[str] = set()
+        self.uses_ndarray = False
+
+    # -- expressions ------------------------------------------------------
+    def _enum_name(self, declaration: type[enum.Enum]) -> str:
+        if declaration.__name__ not in self.emitter.enums:
+            self.core.add(declaration.__name__)
+        return declaration.__name__
+
+    def _default(self, value: Any) -> str:
+        if isinstance(value, enum.Enum):
+            return f"{self._enum_name(type(value))}.{value.name}"
+        if isinstance(value, np.generic):
+            return f"np.{type(value).__name__}({value.item()!r})"
+        return repr(value)
+
+    def _converter(self, converter: Any) -> tuple[str, str]:
+        """The expression building ``converter``, and the type it decodes to."""
+        kind = type(converter)
+        if kind is _ConverterReference:
+            self.converters.add(converter.symbol)
+            return f"{converter.symbol}()", converter.annotation
+        self.protocol.add(kind.__name__)
+        dtype = getattr(converter, "dtype", None)
+        if kind is IdentityConverter and dtype is not None:
+            if dtype.subdtype is None:
+                return f"IdentityConverter({_scalar(dtype)})", _scalar(dtype)
+            base, shape = dtype.subdtype
+            self.uses_ndarray = True
+            return (
+                f"IdentityConverter(np.dtype(({_scalar(base)}, {shape!r})))",
+                f"NDArray[{_scalar(base)}]",
+            )
+        if kind is BoolConverter and dtype is not None:
+            args = "" if dtype == np.uint8 else _scalar(dtype)
+            return f"BoolConverter({args})", "bool"
+        if kind is StringConverter:
+            args = [repr(converter._length)]
+            if converter._encoding != "ascii":
+                args.append(f"encoding={converter._encoding!r}")
+            return f"StringConverter({', '.join(args)})", "str"
+        if kind is HarpVersionConverter and dtype is not None:
+            self.protocol.add("HarpVersion")
+            return f"HarpVersionConverter({_scalar(dtype.base)})", "HarpVersion"
+        raise TypeError(f"cannot write a {kind.__name__} as source")
+
+    def _descriptor(self, descriptor: Any) -> tuple[str, list[str], str]:
+        """The callee, arguments and annotation of a payload field declaration."""
+        kind = type(descriptor)
+        self.protocol.add(kind.__name__)
+        if kind is Field:
+            converter, annotation = self._converter(descriptor._converter)
+            args = [converter]
+        else:
+            annotation = self._enum_name(descriptor._enum)
+            args = [f"enum={annotation}"]
+        if descriptor._mask is not None:
+            args.append(f"mask={_hex(descriptor._mask)}")
+        if descriptor._offset:
+            args.append(f"offset={descriptor._offset}")
+        if descriptor._default is not _MISSING:
+            args.append(f"default={self._default(descriptor._default)}")
+        return kind.__name__, args, annotation
+
+    # -- declarations -----------------------------------------------------
+    def _enum(self, name: str, declaration: Any) -> list[str]:
+        spec: Any = self.emitter.bit_masks.get(name) or self.emitter.group_masks[name]
+        flag = issubclass(declaration, enum.IntFlag)
+        values: dict[str, MaskValue] = spec.bits if flag else spec.values
+        # The members keep the order of the yml, where a zero flag has no member.
+        items = [value for value in values.values() if not (flag and int(value) == 0)]
+        base = "IntFlag" if flag else "IntEnum"
+        lines = [f"class {name}(enum.{base}):", *_docstring(spec.description, _INDENT)]
+        if spec.description:
+            lines.append("")
+        for (member, declared), value in zip(declaration.__members__.items(), items):
+            literal = _hex(int(declared)) if flag else str(int(declared))
+            lines.append(f"{_INDENT}{member} = {literal}")
+            description = value.root.description if isinstance(value.root, MaskValueItem) else None
+            if description:
+                lines.extend([*_docstring(description, _INDENT), ""])
+        if lines[-1] == "":
+            lines.pop()
+        return lines
+
+    def _payload(self, name: str, owner: str) -> tuple[list[str], str]:
+        """The source of a payload class, and the type its register decodes to."""
+        reg = self.emitter.device.registers[owner]
+        spec: _PayloadSpec = self.emitter._payload_spec(owner, reg)
+        base = "StructPayload" if spec.base is StructPayload else "AnonymousPayload"
+        self.protocol.add(base)
+        header = f"{base}[{_scalar(np.dtype(spec.element))}]"
+        if spec.length > 1:
+            header += f", length={spec.length}"
+        lines = [
+            f"class {name}({header}):",
+            *_docstring(f"Represents the payload of the {owner} register.", _INDENT),
+            "",
+        ]
+        # The namespace is built from the payloadSpec in order, so the two zip together.
+        members = list((reg.payloadSpec or {}).values()) or [None]
+        annotation = name
+        for (attribute, descriptor), member in zip(spec.namespace.items(), members):
+            callee, args, annotation = self._descriptor(descriptor)
+            lines.extend(_call(f"{attribute}: {annotation} = ", callee, args, _INDENT))
+            if member is not None and member.description:
+                lines.extend([*_docstring(member.description, _INDENT), ""])
+        if lines[-1] == "":
+            lines.pop()
+        return lines, name if spec.base is StructPayload else annotation
+
+    def _register(self, name: str, class_name: str, payloads: dict[str, str]) -> list[str]:
+        reg = self.emitter.device.registers[name]
+        docstring = _docstring(reg.description, _INDENT)
+        body = [*docstring, ""] if docstring else []
+        address = f"{_INDENT}address: ClassVar[int] = {reg.address}"
+        length = reg.length or 1
+        if not self.emitter._needs_payload(reg):
+            if length > 1:
+                base = _ARRAY_REGISTER[reg.type].__name__
+                self.protocol.add(base)
+                header = f"class {class_name}({base}({reg.address}, length={length})):"
+                return [header, *(docstring or [f"{_INDENT}pass"])]
+            base = _SCALAR_REGISTER[reg.type].__name__
+            self.protocol.add(base)
+            return [f"class {class_name}({base}):", *body, address]
+        payload = self.emitter._payload_name(name, reg)
+        return [
+            f"class {class_name}(RegisterBase[{payloads[payload]}]):",
+            *body,
+            address,
+            f"{_INDENT}payload_type: ClassVar[PayloadType] = PayloadType.{reg.type.name}",
+            f"{_INDENT}payload_class = {payload}",
+        ]
+
+    # -- module -----------------------------------------------------------
+    def render(self) -> str:
+        emitter = self.emitter
+        blocks: list[list[str]] = []
+        for name, declaration in emitter.enums.items():
+            blocks.append(self._enum(name, declaration))
+        owners = emitter.payload_owners()
+        payloads: dict[str, str] = {}
+        for name, owner in owners.items():
+            lines, payloads[name] = self._payload(name, owner)
+            blocks.append(lines)
+        registers = emitter.class_names()
+        for class_name, name in registers.items():
+            blocks.append(self._register(name, class_name, payloads))
+        entries = [
+            f"{_INDENT}{emitter.device.registers[name].address}: {class_name},"
+            for class_name, name in registers.items()
+        ]
+        blocks.append(
+            [
+                "REGISTER_MAP: dict[int, type[RegisterBase[Any]]] = {",
+                f"{_INDENT}**_CORE_REGISTER_MAP,",
+                *entries,
+                "}",
+            ]
+        )
+        exported = ["DEVICE_NAME", "WHO_AM_I", *emitter.enums, *owners, *registers, "REGISTER_MAP"]
+        head = [
+            *self._imports(),
+            "",
+            "",
+            "__all__ = [",
+            *(f'{_INDENT}"{name}",' for name in exported),
+            "]",
+            "",
+            f"DEVICE_NAME: str = {json.dumps(self.name)}",
+            f"WHO_AM_I: int = {int(self.device.whoAmI or 0)}",
+        ]
+        return "\n\n\n".join("\n".join(block) for block in [head, *blocks]) + "\n"
+
+    def _imports(self) -> list[str]:
+        lines = [_HEADER]
+        if self.device.description:
+            lines.extend([*_docstring(self.device.description, ""), ""])
+        if self.emitter.enums:
+            lines.append("import enum")
+        lines.extend(["from typing import Any, ClassVar", "", "import numpy as np"])
+        if self.uses_ndarray:
+            lines.append("from numpy.typing import NDArray")
+        lines.extend(_import_block("harp.protocol", self.protocol))
+        if self.core:
+            lines.append(f"from harp.device.core import {', '.join(sorted(self.core))}")
+        lines.append("from harp.device.core import REGISTER_MAP as _CORE_REGISTER_MAP")
+        if self.converters:
+            lines.extend(["", *_import_block(".converters", self.converters)])
+        return lines
+
+
+def generate_device_module(
+    text: str | bytes,
+    *,
+    name: str | None = None,
+    require_converters: bool = True,
+) -> str:
+    """Render ``device.yml`` text as the source of a device module.
+
+    The source declares what :func:`create_device_module` would build from the same
+    schema, by the same names: the enums, payload and register classes, each payload
+    field with its converter, mask, offset and default resolved, ``DEVICE_NAME``,
+    ``WHO_AM_I`` and a ``REGISTER_MAP`` merging the common registers. A register marked
+    ``private`` keeps its underscore-prefixed class, and the ``description`` of the
+    schema becomes the module docstring.
+
+    A custom ``interfaceType`` is written as a call to its converter symbol, such as
+    ``DataConverter()``, imported from a ``converters`` module beside the generated
+    one, which the caller provides. Pass ``require_converters=False`` to decode those
+    values natively instead, as :func:`create_device_module` does, so the module
+    imports nothing but ``harp``.
+
+    Raises the errors of :func:`create_device_module` for a schema it would reject,
+    such as ``NameCollisionError`` or ``UnknownMaskError``.
+    """
+    device = parse_device_schema(text)
+    return _Renderer(device, name, require_converters).render()
+
+
+def write_device_package(
+    text: str | bytes,
+    path: str | PathLike[str],
+    *,
+    name: str | None = None,
+    require_converters: bool = True,
+) -> Path:
+    """Write the device module of ``device.yml`` text as a package at ``path``.
+
+    The folder is created when missing and receives the module as ``__init__.py``,
+    replacing one generated earlier, with a ``py.typed`` marker so a type checker
+    reads its declarations once the package is installed. Other files in the folder,
+    such as the ``converters`` module, are left untouched. Arguments are those of
+    :func:`generate_device_module`. Returns the path of ``__init__.py``.
+    """
+    source = generate_device_module(text, name=name, require_converters=require_converters)
+    package = Path(path)
+    package.mkdir(parents=True, exist_ok=True)
+    (package / "py.typed").touch()
+    module = package / "__init__.py"
+    module.write_text(source, encoding="utf-8")
+    return module
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Generate a device package from a ``device.yml``."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("schema", type=Path, help="path to the device.yml")
+    parser.add_argument("output", type=Path, help="package folder to write __init__.py into")
+    parser.add_argument("--name", help="device name, overriding the one of the schema")
+    parser.add_argument(
+        "--native-converters",
+        action="store_true",
+        help="decode custom interfaceTypes natively instead of importing .converters",
+    )
+    args = parser.parse_args(argv)
+    module = write_device_package(
+        args.schema.read_bytes(),
+        args.output,
+        name=args.name,
+        require_converters=not args.native_converters,
+    )
+    print(f"Device package written to {module}")
@@ -234,6 +234,20 @@ def _is_native(interface_type: Optional[str]) -> bool:
     return entry is not None and entry.native_dtype is not None
 
 
+@dataclass(frozen=True)
+class _PayloadSpec:
+    """A payload class before it is built: its base, base element and field descriptors.
+
+    ``length`` is the element count a struct payload declares; an anonymous payload
+    derives its size from its single value, so it keeps the default of one.
+    """
+
+    base: Any  # StructPayload or AnonymousPayload, subscripted with ``element``
+    element: type[np.generic]
+    namespace: dict[str, Any]
+    length: int = 1
+
+
 def _new_class(name: str, bases: tuple, namespace: dict, kwds: Optional[dict] = None) -> type:
     return types.new_class(name, bases, kwds or {}, lambda ns: ns.update(namespace))
 
@@ -254,6 +268,8 @@ def __init__(
         # Payload classes are cached by name so registers sharing an ``interfaceType``
         # share one class, as the module-level payload list of the generator does.
         self.payloads: dict[str, type] = {}
+        # Register classes are cached by yml name, so each is built once however it is reached.
+        self.registers: dict[str, type[RegisterBase[Any]]] = {}
 
     def _find_mask(self, name: str) -> Any:
         return self.enums.get(name) or _CORE_MASKS.get(name)
@@ -415,6 +431,12 @@ def _build_payload(self, name: str, reg: Register) -> type:
         return payload
 
     def _new_payload(self, class_name: str, owner: str, reg: Register) -> type:
+        spec = self._payload_spec(owner, reg)
+        kwds = {"length": spec.length} if spec.length > 1 else {}
+        return _new_class(class_name, (spec.base[spec.element],), spec.namespace, kwds)
+
+    def _payload_spec(self, owner: str, reg: Register) -> _PayloadSpec:
+        """Resolve the descriptors of the payload of ``reg`` without building its class."""
         elem_np = _ELEMENT[reg.type]
         elem_size = np.dtype(elem_np).itemsize
         length = reg.length or 1
@@ -425,8 +447,7 @@ def _new_payload(self, class_name: str, owner: str, reg: Register) -> type:
                 renamed[key]: self._build_field(key, member, reg)
                 for key, member in reg.payloadSpec.items()
             }
-            kwds = {"length": length} if length > 1 else {}
-            return _new_class(class_name, (StructPayload[elem_np],), namespace, kwds)
+            return _PayloadSpec(StructPayload, elem_np, namespace, length)
 
         # anonymous single-value payload
         mt = reg.maskType.root if reg.maskType else None
@@ -456,25 +477,36 @@ def _new_payload(self, class_name: str, owner: str, reg: Register) -> type:
                 element_size=elem_size,
             )
             descriptor = Field(self._resolve_converter(ctx))
-        return _new_class(class_name, (AnonymousPayload[elem_np],), {"__value__": descriptor})
+        return _PayloadSpec(AnonymousPayload, elem_np, {"__value__": descriptor})
 
     # -- registers --------------------------------------------------------
     def _class_name(self, name: str, reg: Register) -> str:
         """The class of a private register is underscore-prefixed; its payload class is not."""
         return f"_{name}" if reg.visibility is Visibility.private else name
 
-    def _build_register(self, name: str, class_name: str, reg: Register) -> type[RegisterBase[Any]]:
-        length = reg.length or 1
+    def _needs_payload(self, reg: Register) -> bool:
+        """A plain scalar/array register needs no payload wrapper: its whole value is a
+        native passthrough (no payloadSpec, no maskType, no custom converter)."""
         it = reg.interfaceType.root if reg.interfaceType else None
-
-        # A plain scalar/array register needs no payload wrapper: its whole value is a
-        # native passthrough (no payloadSpec, no maskType, no custom converter).
-        if (
+        return not (
             reg.payloadSpec is None
             and reg.maskType is None
             and reg.converter is None
             and _is_native(it)
-        ):
+        )
+
+    def payload_owners(self) -> dict[str, str]:
+        """Payload class name -> yml name of the first register building it, without building it."""
+        owners: dict[str, str] = {}
+        for name, reg in self.device.registers.items():
+            if self._needs_payload(reg):
+                owners.setdefault(self._payload_name(name, reg), name)
+        return owners
+
+    def _build_register(self, name: str, class_name: str, reg: Register) -> type[RegisterBase[Any]]:
+        length = reg.length or 1
+
+        if not self._needs_payload(reg):
             if length > 1:  # plain array register
                 cls = _ARRAY_REGISTER[reg.type](reg.address, length=length)
                 cls.__name__ = cls.__qualname__ = class_name
@@ -492,12 +524,23 @@ def _build_register(self, name: str, class_name: str, reg: Register) -> type[Reg
             },
         )
 
+    def class_names(self) -> dict[str, str]:
+        """Register class name -> yml name, without building any class."""
+        return {self._class_name(name, reg): name for name, reg in self.device.registers.items()}
+
+    def emit_register(self, name: str) -> type[RegisterBase[Any]]:
+        """Build the register named ``name`` in the yml, and its payload, on first request."""
+        cls = self.registers.get(name)
+        if cls is None:
+            reg = self.device.registers[name]
+            cls = self._build_register(name, self._class_name(name, reg), reg)
+            self.registers[name] = cls
+        return cls
+
     def emit(self) -> dict[str, type[RegisterBase[Any]]]:
-        emitted: dict[str, type[RegisterBase[Any]]] = {}
-        for name, reg in self.device.registers.items():
-            class_name = self._class_name(name, reg)
-            emitted[class_name] = self._build_register(name, class_name, reg)
-        return emitted
+        return {
+            class_name: self.emit_register(name) for class_name, name in self.class_names().items()
+        }
 
 
 def parse_device_schema(text: str | bytes) -> DeviceModel:
@@ -7,17 +7,32 @@
 module or by address through ``REGISTER_MAP``.
 """
 
+import hashlib
+import os
+import threading
 import types
-from typing import Any, Mapping, Optional, Protocol, runtime_checkable
+from collections import OrderedDict
+from collections.abc import Mapping
+from functools import cached_property
+from os import PathLike
+from pathlib import Path
+from typing import Any, Protocol, runtime_checkable
 
+from harp.device.core import REGISTER_MAP as CORE_REGISTER_MAP
 from harp.protocol import RegisterBase
 
-from harp.device.core import REGISTER_MAP as CORE_REGISTER_MAP
 from ._emit import ConverterValue, _Emitter, parse_device_schema
+from ._model import DeviceModel
 
 _DEFAULT_NAME = "Device"
 """Module name used when the schema carries no ``device`` header."""
 
+_MODULE_CACHE_SIZE = 64
+"""How many distinct schemas keep their emitted declarations in memory."""
+
+_SCHEMA_CACHE_VERSION = 1
+"""Revision of the on-disk schema cache, part of every file name so a change invalidates it."""
+
 
 @runtime_checkable
 class DeviceModuleLike(Protocol):
@@ -58,13 +73,183 @@ class DeviceModule(types.ModuleType):
     __all__: list[str]
     """The declarations of the schema, beside ``REGISTER_MAP`` and ``WHO_AM_I``."""
 
+    def __getattr__(self, name: str) -> Any:
+        # Reached only for a name not yet in the module namespace, so a lazily built
+        # module emits each declaration here on first access and binds it for the next.
+        declarations: _Declarations | None = vars(self).get("_declarations")
+        value = None if declarations is None else declarations.resolve(name)
+        if value is None:
+            raise AttributeError(f"module {self.__name__!r} has no attribute {name!r}")
+        setattr(self, name, value)
+        return value
+
+    def __dir__(self) -> list[str]:
+        return sorted({*super().__dir__(), *vars(self).get("__all__", ())})
+
+
+def _lazy_register_map(module: DeviceModule) -> dict[int, type[RegisterBase[Any]]]:
+    declarations: _Declarations | None = vars(module).get("_declarations")
+    if declarations is None:
+        raise AttributeError(f"module {module.__name__!r} has no attribute 'REGISTER_MAP'")
+    return declarations.resolve("REGISTER_MAP")
+
+
+# A module built eagerly binds its map, which shadows this, and a lazily built one
+# emits it here on first access. Declaring it on the class means a lazy module matches
+# DeviceModuleLike before anything is emitted, since isinstance looks it up statically.
+_register_map = cached_property(_lazy_register_map)
+_register_map.__set_name__(DeviceModule, "REGISTER_MAP")
+setattr(DeviceModule, "REGISTER_MAP", _register_map)  # noqa: B010
+
+
+class _Declarations:
+    """The declarations of one schema, each emitted on its first request.
+
+    Shared by every module built from the same schema and options, so however many
+    modules are built, each class is emitted once and they all hold the same classes.
+    """
+
+    def __init__(
+        self,
+        device: DeviceModel,
+        converters: Mapping[str, ConverterValue] | None,
+        require_converters: bool,
+        module_name: str,
+    ) -> None:
+        self.device = device
+        self._emitter = _Emitter(device, converters, require_converters)
+        self._module_name = module_name
+        self._lock = threading.RLock()
+        self._registers = self._emitter.class_names()
+        self._payloads = self._emitter.payload_owners()
+        self._register_map: dict[int, type[RegisterBase[Any]]] | None = None
+        for declaration in self._emitter.enums.values():
+            declaration.__module__ = module_name
+        self.names = sorted({**self._emitter.enums, **self._payloads, **self._registers})
+
+    def resolve(self, name: str) -> Any:
+        """The declaration or module constant called ``name``, or ``None`` if there is none."""
+        if name == "REGISTER_MAP":
+            return dict(self.register_map())
+        with self._lock:
+            if name in self._registers:
+                return self._emit(self._registers[name])
+            if name in self._payloads:
+                self._emit(self._payloads[name])
+                return self._emitter.payloads[name]
+        return self._emitter.enums.get(name)
+
+    def contents(self) -> dict[str, Any]:
+        """Every declaration by name, emitting those not emitted yet."""
+        return {name: self.resolve(name) for name in self.names}
+
+    def register_map(self) -> dict[int, type[RegisterBase[Any]]]:
+        """Address -> register class, the common registers merged with those of the schema."""
+        with self._lock:
+            if self._register_map is None:
+                register_map = {cls.address: cls for cls in CORE_REGISTER_MAP.values()}
+                for name in self._registers.values():
+                    cls = self._emit(name)
+                    register_map[cls.address] = cls
+                self._register_map = register_map
+            return self._register_map
+
+    def _emit(self, name: str) -> type[RegisterBase[Any]]:
+        cls = self._emitter.emit_register(name)
+        if cls.__module__ != self._module_name:
+            cls.__module__ = self._module_name
+            payload = cls.payload_class
+            if self._emitter.payloads.get(payload.__name__) is payload:
+                payload.__module__ = self._module_name
+        return cls
+
+
+_module_cache: OrderedDict[tuple[Any, ...], _Declarations] = OrderedDict()
+_module_cache_lock = threading.Lock()
+
+
+def clear_module_cache() -> None:
+    """Drop every schema held by the in-memory cache of :func:`create_device_module`.
+
+    Modules already built keep working, since each holds its own declarations. The
+    next module built from any schema emits its classes afresh.
+    """
+    with _module_cache_lock:
+        _module_cache.clear()
+
+
+def _load_schema(
+    text: str | bytes, digest: str, cache_dir: str | PathLike[str] | None
+) -> DeviceModel:
+    """Parse ``text``, through the JSON of an earlier parse under ``cache_dir`` when there is one.
+
+    Restoring the validated model from JSON skips the YAML parse, which dominates the
+    cost of building a module. A cache file that is unreadable or no longer validates
+    is parsed afresh and rewritten, and a cache folder that cannot be written is skipped.
+    """
+    if cache_dir is None:
+        return parse_device_schema(text)
+    path = Path(cache_dir) / f"{digest}.v{_SCHEMA_CACHE_VERSION}.json"
+    try:
+        return DeviceModel.model_validate_json(path.read_bytes())
+    except (OSError, ValueError):
+        pass
+    device = parse_device_schema(text)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_suffix(f".{os.getpid()}.tmp")
+        partial.write_text(device.model_dump_json(), encoding="utf-8")
+        os.replace(partial, path)  # atomic, so a concurrent reader never sees half a file
+    except OSError:
+        pass
+    return device
+
+
+def _declarations(
+    text: str | bytes,
+    name: str | None,
+    converters: Mapping[str, ConverterValue] | None,
+    require_converters: bool,
+    cache: bool,
+    cache_dir: str | PathLike[str] | None,
+) -> _Declarations:
+    raw = text.encode("utf-8") if isinstance(text, str) else text
+    digest = hashlib.sha256(raw).hexdigest()
+    # Converters are arbitrary objects, so they key the cache by identity; the entry
+    # holds them alive, so an identity cannot be reused while the entry is cached.
+    key = (
+        digest,
+        name,
+        require_converters,
+        tuple(sorted((symbol, id(value)) for symbol, value in (converters or {}).items())),
+    )
+    if cache:
+        with _module_cache_lock:
+            declarations = _module_cache.get(key)
+            if declarations is not None:
+                _module_cache.move_to_end(key)
+                return declarations
+    device = _load_schema(text, digest, cache_dir)
+    module_name = name or device.device or _DEFAULT_NAME
+    declarations = _Declarations(device, converters, require_converters, module_name)
+    if cache:
+        with _module_cache_lock:
+            declarations = _module_cache.setdefault(key, declarations)
+            _module_cache.move_to_end(key)
+            while len(_module_cache) > _MODULE_CACHE_SIZE:
+                _module_cache.popitem(last=False)
+    return declarations
+
 
 def create_device_module(
     text: str | bytes,
     *,
-    name: Optional[str] = None,
-    converters: Optional[Mapping[str, ConverterValue]] = None,
+    name: str | None = None,
+    converters: Mapping[str, ConverterValue] | None = None,
     require_converters: bool = True,
+    lazy: bool = False,
+    cache: bool = True,
+    cache_dir: str | PathLike[str] | None = None,
 ) -> DeviceModule:
     """Emit a module of register classes from ``device.yml`` text.
 
@@ -99,26 +284,42 @@ def create_device_module(
 
         behavior = create_device_module(Path("device.yml").read_bytes())
         behavior.AnalogData
+
+    Building a module from a schema already seen is nearly free. The emitted classes
+    are cached in memory, keyed by a hash of ``text`` together with ``name``,
+    ``require_converters`` and the identity of each converter, so every module built
+    from the same schema holds the same classes. Each call still returns a new module,
+    so one module can be changed without affecting the others. Pass ``cache=False``
+    to emit a private set of classes. Converters key the cache by identity, so pass
+    the same converter objects to share the cache across calls.
+    :func:`clear_module_cache` empties it.
+
+    ``cache_dir`` also keeps the parsed schema on disk, as JSON named by the hash of
+    ``text``. Parsing the YAML is most of the cost of a first build, so a new process
+    opening a schema it has seen before skips it.
+
+    ``lazy`` defers emitting each class until it is first accessed on the module.
+    ``REGISTER_MAP`` spans the whole address space, so reaching it emits every
+    register. ``__all__`` and ``dir()`` list every declaration from the start, but
+    ``vars()`` holds only those emitted so far. An error in the schema that only
+    emission reveals, such as a missing converter, is then raised on that access
+    rather than here.
     """
-    device = parse_device_schema(text)
-    emitter = _Emitter(device, converters, require_converters)
-    registers = emitter.emit()
+    declarations = _declarations(text, name, converters, require_converters, cache, cache_dir)
+    device = declarations.device
     device_name = name or device.device or ""
     module_name = device_name or _DEFAULT_NAME
 
-    contents: dict[str, Any] = {**emitter.enums, **emitter.payloads, **registers}
-    register_map = {cls.address: cls for cls in CORE_REGISTER_MAP.values()}
-    register_map.update({cls.address: cls for cls in registers.values()})
-
-    for declaration in contents.values():
-        declaration.__module__ = module_name
-
     module = DeviceModule(module_name, device.description)
     vars(module).update(
-        contents,
         DEVICE_NAME=device_name,
-        REGISTER_MAP=register_map,
         WHO_AM_I=int(device.whoAmI or 0),
-        __all__=[*sorted(contents), "DEVICE_NAME", "REGISTER_MAP", "WHO_AM_I"],
+        __all__=[*declarations.names, "DEVICE_NAME", "REGISTER_MAP", "WHO_AM_I"],
     )
+    if lazy:
+        vars(module)["_declarations"] = declarations
+    else:
+        vars(module).update(
+            declarations.contents(), REGISTER_MAP=declarations.resolve("REGISTER_MAP")
+        )
     return module
@@ -1,3 +1,4 @@
+from ._builder import FrameEncoder
 from ._message import HarpMessage, HarpParseError
 from ._message_type import MessageType
 from ._payload_converters import (
@@ -76,6 +77,7 @@
     # Message
     "HarpMessage",
     "HarpParseError",
+    "FrameEncoder",
     # Converters
     "Converter",
     "IdentityConverter",
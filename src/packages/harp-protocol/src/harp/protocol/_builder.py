@@ -2,11 +2,13 @@
 
 import struct
 
-from ._constants import _DEFAULT_PORT, _TICK_PERIOD_S
+from ._constants import _DEFAULT_PORT, _HEADER_LEN, _TICK_PERIOD_S, _TIMESTAMPED_PAYLOAD_OFFSET
 from ._message_type import MessageType
 from ._message_type import message_type_to_byte as _msg_type_byte
 from ._payload_type import PayloadType, encode_payload_type
 
+_TIMESTAMP = struct.Struct("<IH")
+
 
 def build_message_frame(
     message_type: MessageType,
@@ -31,3 +33,97 @@ def build_message_frame(
     frame = header + body
     checksum = sum(frame) & 0xFF
     return frame + bytes([checksum])
+
+
+class FrameEncoder:
+    """A precompiled frame template for one message shape, encoding frames that share it.
+
+    Every frame a register sends with the same message type, port and timestamp
+    presence carries the same five header bytes, and only the timestamp and payload
+    change. The header is laid out and summed once, so :meth:`encode` appends the
+    timestamp and payload to it and sums only those bytes into the checksum. The
+    frames are byte-identical to those of :func:`build_message_frame`.
+
+    ``payload_size`` is the byte count every encoded payload must have, ``0`` for a
+    request carrying none. ``timestamped`` fixes whether each frame carries a
+    timestamp, since it changes the layout of the frame. The template itself is
+    immutable, so one encoder is safe to share between threads.
+
+    :meth:`RegisterBase.encoder <harp.protocol.RegisterBase.encoder>` returns one
+    cached per register, sized for its payload::
+
+        encoder = DigitalOutputSet.encoder()
+        for value in values:
+            transport.write(encoder.encode(value.tobytes()))
+    """
+
+    __slots__ = ("_header", "_header_sum", "_payload_size", "_timestamped")
+
+    def __init__(
+        self,
+        message_type: MessageType,
+        address: int,
+        payload_type: PayloadType,
+        payload_size: int = 0,
+        *,
+        port: int = _DEFAULT_PORT,
+        timestamped: bool = False,
+    ) -> None:
+        payload_offset = _TIMESTAMPED_PAYLOAD_OFFSET if timestamped else _HEADER_LEN
+        length = payload_offset + payload_size - 1  # every byte past the length byte
+        if length > 0xFF:
+            raise ValueError(
+                f"A payload of {payload_size} bytes does not fit the length byte of a Harp frame."
+            )
+        self._header = bytes(
+            [
+                _msg_type_byte(message_type),
+                length,
+                address,
+                port,
+                encode_payload_type(payload_type, has_timestamp=timestamped),
+            ]
+        )
+        self._header_sum = sum(self._header)
+        self._payload_size = payload_size
+        self._timestamped = timestamped
+
+    @property
+    def payload_size(self) -> int:
+        """The byte count every payload passed to :meth:`encode` must have."""
+        return self._payload_size
+
+    @property
+    def timestamped(self) -> bool:
+        """Whether every encoded frame carries a timestamp."""
+        return self._timestamped
+
+    def encode(
+        self, payload: bytes | bytearray | memoryview = b"", *, timestamp: float | None = None
+    ) -> bytes:
+        """Return the complete frame carrying ``payload``, stamped with ``timestamp``.
+
+        Raises ``ValueError`` when ``payload`` is not :attr:`payload_size` bytes, or
+        when ``timestamp`` is given to an untimestamped template or missing from a
+        timestamped one.
+        """
+        if isinstance(payload, memoryview) and payload.format != "B":
+            payload = payload.cast("B")
+        if len(payload) != self._payload_size:
+            raise ValueError(
+                f"This frame template encodes {self._payload_size} payload bytes "
+                f"but {len(payload)} were given."
+            )
+        if (timestamp is not None) != self._timestamped:
+            raise ValueError(
+                "This frame template is timestamped, so every frame needs a timestamp."
+                if self._timestamped
+                else "This frame template carries no timestamp, so none can be given."
+            )
+        if timestamp is None:
+            checksum = (self._header_sum + sum(payload)) & 0xFF
+            return self._header + payload + bytes((checksum,))
+        seconds = int(timestamp)
+        ts_bytes = _TIMESTAMP.pack(seconds, round((timestamp - seconds) / _TICK_PERIOD_S))
+        checksum = (self._header_sum + sum(ts_bytes) + sum(payload)) & 0xFF
+        return self._header + ts_bytes + payload + bytes((checksum,))
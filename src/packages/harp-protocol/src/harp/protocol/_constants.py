@@ -3,6 +3,12 @@
 _TICK_PERIOD_S: float = 32e-6
 """Harp timestamp clock tick period in seconds, 32 microseconds per tick."""
 
+_TICK_PERIOD_NS: int = 32_000
+"""Harp timestamp clock tick period in integer nanoseconds, exact where seconds are not."""
+
+_TICKS_PER_S: int = 31_250
+"""Harp timestamp clock ticks per second, so seconds and ticks combine into whole ticks."""
+
 _TIMESTAMP_FLAG: int = 0x10
 """Payload-type byte bit that signals a timestamp is present in the frame."""
 
@@ -1,6 +1,9 @@
 import keyword
 import enum
+import math
+import struct
 from dataclasses import dataclass
+from collections.abc import Callable, Collection
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -28,25 +31,59 @@
 _MISSING = Sentinel("_MISSING")
 _DEFAULT_ELEMENT = np.dtype(np.uint8)
 
+_DENSE_TABLE_SPAN = 1 << 16
+"""The widest raw range of a ``GroupMask`` decoded through a dense code table."""
+
 
 @dataclass(frozen=True, slots=True, eq=False)
 class Column:
     """One column of a batched payload.
 
     ``data`` is a 1-D numpy array (one row per frame). When ``categories`` is
-    not ``None`` the column is enum-backed: ``data`` holds integer category
-    *codes* and ``categories`` the ordered labels, so a consumer can map codes
-    to labels without copying.
+    not ``None`` the column is categorical, an enum or the values of a converter
+    decoding categories: ``data`` holds integer category *codes* and
+    ``categories`` the ordered labels, so a consumer can map codes to labels
+    without copying.
 
     ``eq=False`` keeps identity comparison, since field-wise equality would hit
     the numpy ambiguous-truth-value error on the ``data`` array.
 
     ``name`` is ``None`` for an anonymous single value
+
+    When ``flags`` is not ``None`` the column is a packed flag set: ``data`` holds
+    the raw integers of a ``BitMask`` field and ``flags`` its ``enum.IntFlag``, so
+    a single flag is read with :meth:`flag` without demultiplexing the others.
+    ``mask`` is the mask of the field, whose bits are the only ones a flag can set.
     """
 
     name: str | None
     data: NDArray[Any]
     categories: Any | None = None
+    flags: "type[enum.IntFlag] | None" = None
+    mask: int | None = None
+
+    def flag(self, member: "str | enum.IntFlag") -> "NDArray[np.bool_]":
+        """Whether ``member``, a flag or its name, is set in each row of a flag set column."""
+        if self.flags is None:
+            raise TypeError(f"Column {self.name!r} is not a flag set.")
+        value = self.flags[member] if isinstance(member, str) else self.flags(member)
+        return (self.data & int(value)) != 0
+
+
+@dataclass(frozen=True, slots=True)
+class _DecodeStep:
+    """One descriptor compiled for batch decoding, a step of the decode plan of a payload.
+
+    ``extract`` renders the columns of the descriptor from its ``slot`` gathered across
+    the batch, given ``decode_enums`` and ``demux_bit_masks``. ``names`` and
+    ``demux_names`` are the names of those columns without and with
+    ``demux_bit_masks``, known without decoding anything.
+    """
+
+    slot: str
+    names: "tuple[str | None, ...]"
+    demux_names: "tuple[str | None, ...]"
+    extract: "Callable[[NDArray[Any], bool, bool], list[Column]]"
 
 
 @dataclass(frozen=True)
@@ -159,27 +196,60 @@ def _to_batch(self) -> "_FieldBatch[T]":
             dtype=self._dtype,
         )
 
-    def _columns(
-        self, arr: "NDArray[Any]", name: "str | None", *, decode_enums: bool, demux_bit_masks: bool
-    ) -> "list[Column]":
-        """Render this field as one or more batched :class:`Column`s (see ``to_columns``).
+    def _compile(self, name: "str | None", dtype: np.dtype) -> "_DecodeStep":
+        """Compile the batch rendering of this field over records of ``dtype``.
 
         ``name`` is the column name, or ``None`` for an anonymous root value (the
         consuming package decides the fallback label)."""
+        converter = self._converter
         if self._mask is not None:  # masked numeric sub-field
-            raw = (arr[self._slot] & self._mask) >> self._shift
-            return [Column(name, self._converter.decode_batch(raw.astype(self._converter.dtype)))]
-        if not isinstance(self._converter, _IdentityConverter):  # whole-element, decoded
-            return [Column(name, self._converter.decode_batch(arr[self._slot]))]
-        sub = arr[self._slot]  # whole-element, raw passthrough
-        if sub.ndim <= 1:
-            return [Column(name, sub)]
+            mask, shift = self._dtype.type(self._mask), self._dtype.type(self._shift)
+            target, decode = converter.dtype, converter.decode_batch
+
+            def masked(view: "NDArray[Any]", decode_enums: bool, demux: bool) -> "list[Column]":
+                raw = view & mask
+                if shift:
+                    raw >>= shift
+                return [Column(name, decode(raw.astype(target, copy=False)))]
+
+            return _DecodeStep(self._slot, (name,), (name,), masked)
+        if not isinstance(converter, _IdentityConverter):  # whole-element, decoded
+            split = converter.column_names
+            names = (name,) if not split else tuple(_component_name(name, c) for c in split)
+
+            def decoded(view: "NDArray[Any]", decode_enums: bool, demux: bool) -> "list[Column]":
+                parts = converter.decode_columns(view)
+                if parts is not None:  # one typed column per component, named after the field
+                    return [Column(_component_name(name, c), data) for c, data in parts.items()]
+                coded = converter.decode_categories(view)
+                if coded is not None:
+                    codes, categories = coded
+                    return [Column(name, codes, categories=categories)]
+                return [Column(name, converter.decode_batch(view))]
+
+            return _DecodeStep(self._slot, names, names, decoded)
+        shape = dtype[self._slot].shape
+        if not shape:  # whole-element, raw passthrough
+
+            def raw(view: "NDArray[Any]", decode_enums: bool, demux: bool) -> "list[Column]":
+                return [Column(name, view)]
+
+            return _DecodeStep(self._slot, (name,), (name,), raw)
         # sub-array -> one column per element; index is intrinsic identity, so a
         # nameless (root) array is positional, a named field is prefixed.
-        width = int(np.prod(sub.shape[1:]))
-        flat = sub.reshape(len(arr), width)
-        label = (lambda i: str(i)) if name is None else (lambda i: f"{name}_{i}")
-        return [Column(label(i), flat[:, i]) for i in range(flat.shape[1])]
+        width = int(np.prod(shape))
+        labels = tuple(str(i) if name is None else f"{name}_{i}" for i in range(width))
+
+        def elements(view: "NDArray[Any]", decode_enums: bool, demux: bool) -> "list[Column]":
+            flat = view.reshape(len(view), width)
+            return [Column(label, flat[:, i]) for i, label in enumerate(labels)]
+
+        return _DecodeStep(self._slot, labels, labels, elements)
+
+
+def _component_name(name: "str | None", component: str) -> str:
+    """The column name of one component of a field whose converter splits its column."""
+    return component if name is None else f"{name}_{component}"
 
 
 def _build_enum_lookup(enum_cls: type[enum.IntEnum]) -> "tuple[list[str], np.ndarray]":
@@ -278,31 +348,84 @@ def _to_batch(self) -> "_GroupMaskBatch[E]":
             dtype=self._dtype,
         )
 
-    def _columns(
-        self, arr: "NDArray[Any]", name: "str | None", *, decode_enums: bool, demux_bit_masks: bool
-    ) -> "list[Column]":
-        """One enum column: category codes and labels under ``decode_enums``, or raw codes."""
-        raw = (arr[self._slot] & self._mask) >> self._shift
-        if not decode_enums:
-            return [Column(name, raw)]
-        lookup = self._code_lookup
-        # ``_lookup_safe`` means the raw range of the field fits the table, so the bounds
-        # guard is skipped. An in-range gap still maps to -1, so the undefined branch
-        # below runs regardless.
-        if self._lookup_safe:
-            codes = lookup[raw]
-        else:
-            codes = np.where(raw < len(lookup), lookup.take(raw, mode="clip"), -1)
-        undefined = codes < 0
-        if not undefined.any():
-            return [Column(name, codes, self._categories)]
-        # An undefined code, either an in-range gap or a value past the range of the
-        # enum, is kept as its raw integer and becomes an extra category, matching the
-        # scalar decode and the unchecked cast in C#.
-        codes = codes.astype(np.intp)
-        extras = np.unique(raw[undefined])
-        codes[undefined] = len(self._categories) + np.searchsorted(extras, raw[undefined])
-        return [Column(name, codes, list(self._categories) + extras.tolist())]
+    def _compile(self, name: "str | None", dtype: np.dtype) -> "_DecodeStep":
+        """Compile the batch rendering of this field: one enum column, as category codes
+        and labels under ``decode_enums``, or raw codes.
+
+        Category codes come from a dense table holding the code of every element value of
+        an 8 or 16-bit slot, or of every raw code of a wider one, so a read is a single
+        ``take``. Undefined codes share a sentinel past the categories; only a read that
+        hits it counts its raw codes to name the extra categories. The table is built on
+        the first decode rather than when the class is defined, keeping imports cheap.
+        """
+        mask, shift = self._dtype.type(self._mask), self._dtype.type(self._shift)
+        categories, lookup = self._categories, self._code_lookup
+        # When the raw range of the field fits the table, the bounds guard is skipped. An
+        # in-range gap still maps to -1, so the undefined branch below runs regardless.
+        safe = self._lookup_safe
+        span = (self._mask >> self._shift) + 1
+        sentinel = len(categories)
+        by_element = self._dtype.itemsize <= 2
+        unsigned = np.dtype(f"u{self._dtype.itemsize}")
+        tables: list[tuple[NDArray[Any], NDArray[Any]]] = []
+
+        def dense_tables() -> "tuple[NDArray[Any], NDArray[Any]]":
+            """The code of every raw value, and of every element value when ``by_element``,
+            with ``sentinel`` for an undefined code."""
+            if not tables:
+                by_raw = np.full(span, sentinel, dtype=lookup.dtype)
+                known = lookup[: min(span, len(lookup))]
+                np.copyto(by_raw[: len(known)], known, where=known >= 0)
+                by_value = by_raw
+                if by_element:
+                    values = np.arange(1 << (8 * unsigned.itemsize), dtype=unsigned)
+                    by_value = by_raw.take((values & mask) >> shift)
+                tables.append((by_raw, by_value))
+            return tables[0]
+
+        def with_extras(
+            index: "NDArray[Any]", codes: "NDArray[Any]", table: "NDArray[Any]"
+        ) -> "list[Column]":
+            # An undefined code, either an in-range gap or a value past the range of the
+            # enum, is kept as its raw integer and becomes an extra category, matching the
+            # scalar decode and the unchecked cast in C#. A histogram of the few rows at the
+            # sentinel names them, so no row is sorted, and one more take remaps them.
+            seen = np.flatnonzero(np.bincount(index[codes == sentinel], minlength=len(table)))
+            raw = (seen & self._mask) >> self._shift if by_element else seen
+            extras = np.unique(raw)
+            remap = table.astype(np.min_scalar_type(-(sentinel + len(extras))))
+            remap[seen] = sentinel + np.searchsorted(extras, raw)
+            return [Column(name, remap.take(index), list(categories) + extras.tolist())]
+
+        def extract(view: "NDArray[Any]", decode_enums: bool, demux: bool) -> "list[Column]":
+            if decode_enums and span <= _DENSE_TABLE_SPAN:
+                by_raw, by_value = dense_tables()
+                if by_element:
+                    index, table = view.view(unsigned), by_value
+                else:
+                    index, table = (view & mask) >> shift, by_raw
+                codes = table.take(index)
+                if not codes.size or codes.max() < sentinel:
+                    return [Column(name, codes, categories)]
+                return with_extras(index, codes, table)
+            raw = view & mask
+            if shift:
+                raw >>= shift
+            if not decode_enums:
+                return [Column(name, raw)]
+            if safe:
+                codes = lookup[raw]
+            else:
+                codes = np.where(raw < len(lookup), lookup.take(raw, mode="clip"), -1)
+            undefined = codes < 0
+            if not undefined.any():
+                return [Column(name, codes, categories)]
+            codes = codes.astype(np.intp)
+            extras = np.unique(raw[undefined])
+            codes[undefined] = len(categories) + np.searchsorted(extras, raw[undefined])
+            return [Column(name, codes, list(categories) + extras.tolist())]
+
+        return _DecodeStep(self._slot, (name,), (name,), extract)
 
 
 class BitMask(Generic[F]):
@@ -384,20 +507,54 @@ def _to_batch(self) -> "_BitMaskBatch[F]":
             dtype=self._dtype,
         )
 
-    def _columns(
-        self, arr: "NDArray[Any]", name: "str | None", *, decode_enums: bool, demux_bit_masks: bool
-    ) -> "list[Column]":
-        """A single raw-integer column, or (``demux_bit_masks``) one bool column per flag member."""
+    def _compile(self, name: "str | None", dtype: np.dtype) -> "_DecodeStep":
+        """Compile the batch rendering of this field: a single raw-integer column, or
+        (``demux_bit_masks``) one bool column per flag member."""
         assert self._mask is not None  # _bind_slot ensures every masked field has a mask
-        raw = arr[self._slot] & self._mask
-        if not demux_bit_masks:
-            return [Column(name, raw)]
-        # One boolean column per flag member that fits the field.
-        return [
-            Column(member.name, (raw & int(member)) != 0)
-            for member in self._enum
-            if not (int(member) & ~self._mask)  # skip bits that can't fit the field
-        ]
+        mask, enum_cls = self._dtype.type(self._mask), self._enum
+        flags = [(str(member.name), int(member)) for member in self._flags()]
+        unpack = len(flags) > _UNPACK_MIN_FLAGS
+
+        def extract(view: "NDArray[Any]", decode_enums: bool, demux: bool) -> "list[Column]":
+            if not demux:
+                return [Column(name, view & mask, flags=enum_cls, mask=int(mask))]
+            # One boolean column per flag member that fits the field. The slot is strided
+            # across the frames, so it is gathered once rather than once per flag.
+            raw = np.ascontiguousarray(view)
+            if not unpack:
+                return [Column(flag, (raw & value) != 0) for flag, value in flags]
+            # Wide flag sets: every column is a view of a single unpacked bit block.
+            bits = _unpack_bits(raw)
+            cols: list[Column] = []
+            for flag, value in flags:
+                if value.bit_count() == 1:
+                    cols.append(Column(flag, bits[:, value.bit_length() - 1]))
+                else:  # a composite member counts as set when any of its bits is
+                    cols.append(Column(flag, (raw & value) != 0))
+            return cols
+
+        return _DecodeStep(self._slot, (name,), tuple(flag for flag, _ in flags), extract)
+
+    def _flags(self) -> "list[F]":
+        """The flag members that fit the field; a bit outside the mask cannot be set."""
+        assert self._mask is not None
+        return [member for member in self._enum if not (int(member) & ~self._mask)]
+
+
+# Demultiplexing masks a contiguous column once per flag, where unpacking every bit costs
+# about as much as 16 such passes regardless of the flag count; above it, unpacking wins.
+_UNPACK_MIN_FLAGS = 16
+
+
+def _unpack_bits(raw: "NDArray[Any]") -> "NDArray[np.bool_]":
+    """Expand integer elements into a ``(len(raw), bits)`` boolean block, bit 0 first.
+
+    The elements are read as little-endian bytes and unpacked in one pass, so column
+    ``i`` of the block holds bit ``i`` of every element.
+    """
+    little = raw.astype(raw.dtype.newbyteorder("<"), copy=False)
+    octets = np.ascontiguousarray(little).view(np.uint8).reshape(len(raw), raw.dtype.itemsize)
+    return np.unpackbits(octets, axis=1, bitorder="little").view(np.bool_)
 
 
 # ---------------------------------------------------------------------------
@@ -516,7 +673,11 @@ class Batch(Protocol[_PT]):
     def __len__(self) -> int: ...  # type: ignore[empty-body]
 
     def payload_as_columns(  # type: ignore[empty-body]
-        self, *, decode_enums: bool = True, demux_bit_masks: bool = False
+        self,
+        *,
+        decode_enums: bool = True,
+        demux_bit_masks: bool = False,
+        columns: "Collection[str | None] | None" = None,
     ) -> "list[Column]": ...
 
     def __getattr__(self, name: str) -> "NDArray[Any]": ...  # type: ignore[empty-body]
@@ -556,6 +717,46 @@ def _batch_init_disabled(self: "PayloadBase", *args: object, **kwargs: object) -
     )
 
 
+_STRUCT_CODES = {
+    "u1": "B",
+    "u2": "H",
+    "u4": "I",
+    "u8": "Q",
+    "i1": "b",
+    "i2": "h",
+    "i4": "i",
+    "i8": "q",
+    "f4": "f",
+    "f8": "d",
+}
+"""``struct`` format codes of the plain numeric dtypes, by kind and item size."""
+
+
+def _compile_scalar_parser(dtype: np.dtype) -> "Callable[[Any], Any] | None":
+    """Compile a reader of one plain numeric element from the start of a buffer.
+
+    The element is unpacked with a ``struct.Struct`` and boxed as the numpy scalar type
+    of ``dtype``, the value ``np.frombuffer`` would give without building an array.
+    A NaN still goes through numpy, so a signalling NaN keeps its exact bits. Returns
+    ``None`` for a structured or sub-array dtype.
+    """
+    code = _STRUCT_CODES.get(f"{dtype.kind}{dtype.itemsize}")
+    if code is None or dtype.fields is not None or dtype.subdtype is not None:
+        return None
+    unpack = struct.Struct((">" if dtype.str[0] == ">" else "<") + code).unpack_from
+    scalar = dtype.type
+    if dtype.kind != "f":
+        return lambda buf: scalar(unpack(buf)[0])
+
+    def parse_float(buf: Any) -> Any:
+        value = unpack(buf)[0]
+        if math.isnan(value):
+            return np.frombuffer(buf, dtype=dtype, count=1)[0]
+        return scalar(value)
+
+    return parse_float
+
+
 def _resolve_element_dtype(cls: type) -> np.dtype:
     """Resolve the base element dtype from the ``StructPayload[...]`` type arg.
 
@@ -667,6 +868,8 @@ class PayloadBase(Generic[NpStructT]):
     payload_dtype: ClassVar[np.dtype]
     # Field names shown in __repr__ and used as the column order.
     _repr_fields: ClassVar[tuple[str, ...]]
+    # The fields compiled for payload_as_columns, in column order (shared with Batch).
+    _decode_plan: ClassVar["tuple[_DecodeStep, ...]"] = ()
     # The scalar twin of this class (identity for scalar classes, points to scalar from Batch).
     _scalar_cls: ClassVar["type[PayloadBase]"]
     # The batch twin of this class (identity until the Batch sibling is generated).
@@ -680,6 +883,8 @@ class PayloadBase(Generic[NpStructT]):
     _elem_dtype: ClassVar[np.dtype] = _DEFAULT_ELEMENT
     # The ``__value__`` field of an AnonymousPayload root, else None: ``parse`` unwraps to it.
     _single_member: ClassVar[str | None] = None
+    # Reads a plain scalar payload straight from a buffer for ``parse``, else None.
+    _scalar_parser: ClassVar["Callable[[Any], Any] | None"] = None
     # The underlying numpy array holding one (0-D) or many (1-D) payload records.
     _arr: NDArray[NpStructT]
 
@@ -762,6 +967,22 @@ def _collect_repr_fields(cls) -> "tuple[str, ...]":
                     names.append(attr)
         return tuple(names)
 
+    @classmethod
+    def _compile_decode_plan(cls) -> "tuple[_DecodeStep, ...]":
+        """Compile every field listed in ``_repr_fields`` into its batch decoding step.
+
+        Descriptors are resolved, and their masks, lookup tables and column names worked
+        out, once per class rather than on every ``payload_as_columns`` call.
+        """
+        steps: list[_DecodeStep] = []
+        for f in cls._repr_fields:
+            desc = cls._mro_descriptor(f)
+            assert desc is not None
+            # The __value__ of an AnonymousPayload root is nameless; the consumer labels it.
+            name = None if getattr(cls, "_root", False) else f
+            steps.append(desc._compile(name, cls.payload_dtype))
+        return tuple(steps)
+
     def __init_subclass__(
         cls,
         *,
@@ -776,6 +997,7 @@ def __init_subclass__(
             # scalar twin and wire the pointers between scalar and batch.
             cls.payload_dtype = _batch_of.payload_dtype
             cls._repr_fields = _batch_of._repr_fields
+            cls._decode_plan = _batch_of._decode_plan
             cls._elem_dtype = _batch_of._elem_dtype
             cls._single_member = _batch_of._single_member
             cls._scalar_cls = _batch_of
@@ -807,6 +1029,8 @@ def __init_subclass__(
 
         if "_repr_fields" not in cls.__dict__:
             cls._repr_fields = cls._collect_repr_fields()
+        if hasattr(cls, "payload_dtype"):
+            cls._decode_plan = cls._compile_decode_plan()
 
         cls._scalar_cls = cls
         cls._batch_cls = cls  # rebound below once Batch is generated
@@ -842,7 +1066,11 @@ def payload_array(self) -> NDArray[NpStructT]:
         return self._arr
 
     def payload_as_columns(
-        self, *, decode_enums: bool = True, demux_bit_masks: bool = False
+        self,
+        *,
+        decode_enums: bool = True,
+        demux_bit_masks: bool = False,
+        columns: "Collection[str | None] | None" = None,
     ) -> list[Column]:
         """Returns a list of Column where each member represents a field from a payload across multiple messages.
 
@@ -853,17 +1081,29 @@ def payload_as_columns(
         column per flag member when ``True``, or kept as a single raw-integer
         column when ``False``, which is a shape change. The two are orthogonal
         and apply to different descriptor kinds.
+
+        ``columns`` keeps only the columns with those names, in declaration order,
+        where the nameless value of an anonymous payload is named ``None``. A field
+        rendering no selected column is never decoded, so selecting a few columns of
+        a wide payload skips the decoding of the rest. A name matching no column is
+        ignored, leaving the caller to check the result.
+
+        The fields are decoded through the decode plan compiled with the class, and
+        each slot shared by several masked fields is gathered from the records once.
         """
-        arr = np.atleast_1d(self._arr)
-        # Each descriptor renders its own column(s); resolve via the scalar twin.
-        scalar_cls = type(self)._scalar_cls
+        arr: NDArray[Any] = np.atleast_1d(self._arr)
+        views: dict[str, NDArray[Any]] = {}
         cols: list[Column] = []
-        for f in self._repr_fields:
-            desc = scalar_cls._mro_descriptor(f)
-            assert desc is not None
-            cols.extend(
-                desc._columns(arr, f, decode_enums=decode_enums, demux_bit_masks=demux_bit_masks)
-            )
+        for step in self._decode_plan:
+            if columns is not None:
+                names = step.demux_names if demux_bit_masks else step.names
+                if not any(n in columns for n in names):
+                    continue
+            view = views.get(step.slot)
+            if view is None:
+                view = views[step.slot] = arr[step.slot]
+            rendered = step.extract(view, decode_enums, demux_bit_masks)
+            cols.extend(rendered if columns is None else [c for c in rendered if c.name in columns])
         return cols
 
     def __len__(self) -> int:
@@ -1014,6 +1254,10 @@ def __init_subclass__(
             cls.payload_dtype = np.dtype(scalar_dtype)
             cls._repr_fields = ()
         super().__init_subclass__(**kwargs)  # pyright: ignore[reportArgumentType]
+        # An array register gives its payload a sub-array dtype, which has no parser, and
+        # a subclass overriding _unwrap keeps the array path it expects.
+        unwraps = cls._unwrap.__func__ is AnonymousPayload._unwrap.__func__
+        cls._scalar_parser = _compile_scalar_parser(cls.payload_dtype) if unwraps else None
 
     def __init__(self, value: object = _MISSING_INIT, /, **kwargs: object) -> None:  # type: ignore[override]
         if type(self)._root:
@@ -1060,21 +1304,24 @@ def __repr__(self) -> str:
         return f"{type(self).__name__}({self._repr_kwargs()})"
 
     def payload_as_columns(
-        self, *, decode_enums: bool = True, demux_bit_masks: bool = False
+        self,
+        *,
+        decode_enums: bool = True,
+        demux_bit_masks: bool = False,
+        columns: "Collection[str | None] | None" = None,
     ) -> list[Column]:
         # Anonymous values carry no name (name=None); the consumer supplies the label.
         if type(self)._root:
-            arr = np.atleast_1d(self._arr)
-            root = type(self)._scalar_cls._mro_descriptor(self._VALUE_FIELD)
-            assert root is not None
-            return root._columns(
-                arr, None, decode_enums=decode_enums, demux_bit_masks=demux_bit_masks
+            return super().payload_as_columns(
+                decode_enums=decode_enums, demux_bit_masks=demux_bit_masks, columns=columns
             )
         arr = np.atleast_1d(self._arr)
         # Sub-array dtype (array register): one column per element, positionally named.
         if arr.ndim > 1:
-            return [Column(str(i), arr[:, i]) for i in range(arr.shape[1])]
-        return [Column(None, arr)]
+            cols = [Column(str(i), arr[:, i]) for i in range(arr.shape[1])]
+        else:
+            cols = [Column(None, arr)]
+        return cols if columns is None else [c for c in cols if c.name in columns]
 
 
 @final
@@ -1,5 +1,6 @@
 import enum as _enum
 from abc import ABC, abstractmethod
+from collections.abc import Mapping
 from typing import TYPE_CHECKING, Any, Generic, TypeVar, cast
 from dataclasses import dataclass
 import numpy as np
@@ -22,6 +23,9 @@ class Converter(ABC, Generic[T]):
 
     dtype: np.dtype  # dtype of the raw numpy slot passed to decode/encode
 
+    column_names: "tuple[str, ...] | None" = None
+    """The typed columns :meth:`decode_columns` splits a batch column into, if any."""
+
     @abstractmethod
     def decode_scalar(self, view: np.generic) -> T:
         """Decode a 0-D structured-array element into a Python value."""
@@ -34,6 +38,28 @@ def decode_batch(self, view: "NDArray[np.generic]") -> Any:
     def encode_into(self, view: NDArray[np.generic], value: T) -> None:
         """Write a Python value back into a structured-array element."""
 
+    def decode_categories(
+        self, view: "NDArray[np.generic]"
+    ) -> "tuple[NDArray[np.intp], Any] | None":
+        """Decode a 1-D column as category codes and their labels, for a batch column.
+
+        A converter whose values repeat across frames can override this to decode each
+        distinct value once; the column then reaches pandas as a ``Categorical``. The
+        default of ``None`` makes the column go through :meth:`decode_batch` instead.
+        """
+        return None
+
+    def decode_columns(self, view: "NDArray[np.generic]") -> "Mapping[str, NDArray[Any]] | None":
+        """Decode a 1-D column as several typed columns, keyed by :attr:`column_names`.
+
+        A converter whose values are records of numbers, which :meth:`decode_batch` can
+        only return as an array of Python objects, can override this together with
+        :attr:`column_names` to keep a batch column numeric, one column per component.
+        A payload field named ``version`` then renders ``version_major`` and so on.
+        The default of ``None`` makes the column go through :meth:`decode_batch`.
+        """
+        return None
+
 
 # ---------------------------------------------------------------------------
 # Built-in converters
@@ -190,11 +216,17 @@ def encode_into(self, view: NDArray[np.generic], value: E) -> None:
 
 
 class StringConverter(Converter[str]):
-    """Converts a fixed-length byte array to/from a Python ``str``."""
+    """Converts a fixed-length byte array to/from a Python ``str``.
 
-    def __init__(self, length: int, encoding: str = "ascii") -> None:
+    ``categorical`` decodes a batch column as categories, allocating one ``str`` per
+    distinct value rather than one per frame, for strings that take a handful of values
+    such as a device name.
+    """
+
+    def __init__(self, length: int, encoding: str = "ascii", *, categorical: bool = False) -> None:
         self._length = length
         self._encoding = encoding
+        self._categorical = categorical
         self.dtype = np.dtype((np.uint8, (length,)))
 
     def decode_scalar(self, view: np.generic) -> str:
@@ -210,6 +242,20 @@ def decode_batch(self, view: NDArray[np.generic]) -> Any:
             )
         return view.reshape(-1, self._length).view(f"S{self._length}").reshape(-1).astype(str)
 
+    def decode_categories(self, view: NDArray[np.generic]) -> "tuple[NDArray[np.intp], Any] | None":
+        if not self._categorical:
+            return None
+        rows = np.ascontiguousarray(view).reshape(-1, self._length)
+        # A run of frames repeating one value is a single candidate for np.unique, so a
+        # slowly changing string costs a pass over the bytes rather than a sort of them.
+        starts = np.ones(len(rows), dtype=np.bool_)
+        np.any(rows[1:] != rows[:-1], axis=1, out=starts[1:])
+        labels, inverse = np.unique(
+            rows[starts].view(f"S{self._length}").reshape(-1), return_inverse=True
+        )
+        codes = inverse.reshape(-1)[np.cumsum(starts) - 1]
+        return codes, [label.decode(self._encoding) for label in labels]
+
     def encode_into(self, view: NDArray[np.generic], value: str) -> None:
         encoded = value.encode(self._encoding)[: self._length]
         padded = encoded.ljust(self._length, b"\x00")
@@ -229,7 +275,12 @@ def __str__(self) -> str:
 
 
 class HarpVersionConverter(Converter[HarpVersion]):
-    """A built-in converter for a HarpVersion object."""
+    """A built-in converter for a HarpVersion object.
+
+    A batch column splits into ``major``, ``minor`` and ``patch`` integer columns.
+    """
+
+    column_names = ("major", "minor", "patch")
 
     def __init__(self, component: "np.dtype | str | type" = np.uint8) -> None:
         self.dtype = np.dtype((component, (3,)))
@@ -242,5 +293,9 @@ def decode_batch(self, view: NDArray[np.generic]) -> Any:
         v = np.atleast_2d(view)
         return np.frompyfunc(HarpVersion, 3, 1)(v[:, 0], v[:, 1], v[:, 2])
 
+    def decode_columns(self, view: NDArray[np.generic]) -> "Mapping[str, NDArray[Any]] | None":
+        v = np.asarray(view).reshape(-1, 3)
+        return {"major": v[:, 0], "minor": v[:, 1], "patch": v[:, 2]}
+
     def encode_into(self, view: NDArray[np.generic], value: HarpVersion) -> None:
         view[...] = np.array([value.major, value.minor, value.patch], dtype=self.dtype.base)
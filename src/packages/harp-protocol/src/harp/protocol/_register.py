@@ -1,16 +1,19 @@
 from abc import ABC, ABCMeta
+from collections.abc import Iterator
 from typing import Any, ClassVar, Generic, TypeVar, cast, final, overload
 
 import numpy as np
 from numpy.typing import ArrayLike, NDArray
 from typing_extensions import Sentinel
 
-from ._builder import build_message_frame
+from ._builder import FrameEncoder
 from ._constants import (
     _DEFAULT_PORT,
     _HEADER_LEN,
     _MIN_FRAME_LEN,
+    _TICK_PERIOD_NS,
     _TICK_PERIOD_S,
+    _TICKS_PER_S,
     _TIMESTAMP_FLAG,
     _TIMESTAMPED_PAYLOAD_OFFSET,
     _TS_MICROS_OFFSET,
@@ -59,6 +62,52 @@ def _encode_message_types(message_type: MessageType | ArrayLike, nrows: int) ->
     return values.astype(np.uint8)
 
 
+def _chunked_timestamps(timestamps: ArrayLike, nrows: int) -> np.ndarray:
+    """``timestamps`` as N seconds, a scalar repeated for every frame.
+
+    A chunk only slices them, so the length is checked up front rather than when a
+    short array runs out partway through the frames.
+    """
+    ts = np.asarray(timestamps)
+    if ts.ndim == 0:
+        return np.broadcast_to(ts, (nrows,))
+    if len(ts) != nrows:
+        raise ValueError(f"timestamps holds {len(ts)} values for {nrows} frames.")
+    return ts
+
+
+_COLUMNWISE_CHECKSUM_MAX_STRIDE = 24
+"""Widest frame whose checksums are summed a column at a time rather than row by row."""
+
+
+def _bulk_buffer(out: "NDArray[np.uint8] | bytearray | memoryview | None", size: int) -> np.ndarray:
+    """The leading ``size`` bytes of ``out`` as a flat uint8 array, or a new one."""
+    if out is None:
+        return np.empty(size, dtype=np.uint8)
+    buf = out if isinstance(out, np.ndarray) else np.frombuffer(out, dtype=np.uint8)
+    if buf.dtype != np.uint8 or not buf.flags.c_contiguous or not buf.flags.writeable:
+        raise ValueError("format_bulk: out must be a writable, contiguous uint8 buffer")
+    if buf.size < size:
+        raise ValueError(f"format_bulk: out holds {buf.size} bytes but the frames need {size}")
+    return buf.reshape(-1)[:size]
+
+
+def _fill_checksums(rows: NDArray[np.uint8]) -> None:
+    """Write the checksum of every frame row into its last byte, in place.
+
+    A wrapping uint8 sum is the checksum itself, so no wider accumulator is needed.
+    Narrow frames add whole columns, a few passes of one vectorized add; wider frames
+    reduce each row instead, since a pass per column then costs more.
+    """
+    checksums = rows[:, -1]
+    if rows.shape[1] <= _COLUMNWISE_CHECKSUM_MAX_STRIDE:
+        np.copyto(checksums, rows[:, 0])
+        for column in range(1, rows.shape[1] - 1):
+            np.add(checksums, rows[:, column], out=checksums)
+    else:
+        np.add.reduce(rows[:, :-1], axis=1, dtype=np.uint8, out=checksums)
+
+
 U = TypeVar("U")
 _R = TypeVar("_R")
 _AR = TypeVar("_AR", bound="RegisterBase[Any]")
@@ -89,6 +138,18 @@ def _resolve(self) -> np.ndarray:
             self._values = out
         return self._values
 
+    def nanoseconds(self) -> np.ndarray:
+        """The timestamps as exact ``int64`` nanoseconds of the Harp clock.
+
+        Seconds and ticks combine into whole ticks, scaled to nanoseconds in place, in
+        integer arithmetic with no float intermediate. The array is new, owned by the
+        caller, who may offset or index it in place.
+        """
+        out = np.multiply(self._ts_s, _TICKS_PER_S, dtype=np.int64)
+        np.add(out, self._ts_us, out=out)
+        np.multiply(out, _TICK_PERIOD_NS, out=out)
+        return out
+
     def __array__(self, dtype: "np.dtype | None" = None) -> np.ndarray:
         arr = self._resolve()
         return arr if dtype is None else arr.astype(dtype)
@@ -156,6 +217,7 @@ class RegisterBase(ABC, Generic[U], metaclass=_RegisterBaseMeta):
     payload_type: ClassVar[PayloadType]
     payload_class: ClassVar[type[PayloadBase[Any]]]
     length: ClassVar[int | None] = None
+    _encoders: ClassVar[dict[tuple[MessageType, int, bool, int], FrameEncoder]]
 
     @classmethod
     def parse(cls, value: HarpMessage | bytes | bytearray | memoryview) -> U:
@@ -166,14 +228,17 @@ def parse(cls, value: HarpMessage | bytes | bytearray | memoryview) -> U:
         registers) return the raw numpy scalar or ndarray directly.
         """
         buf = value.payload_bytes if isinstance(value, HarpMessage) else value
-        expected = cls.payload_class.payload_dtype.itemsize
+        payload_class = cls.payload_class
+        expected = payload_class.payload_dtype.itemsize
         if len(buf) < expected:
             raise HarpParseError(
                 f"{cls.__name__} reads {expected} payload bytes as {cls.payload_type!r} "
                 f"but only {len(buf)} are available."
             )
-        record = np.frombuffer(buf, dtype=cls.payload_class.payload_dtype, count=1)[0]
-        return cast(U, cls.payload_class._unwrap(record))
+        if payload_class._scalar_parser is not None:  # scalar registers skip the array
+            return cast(U, payload_class._scalar_parser(buf))
+        record = np.frombuffer(buf, dtype=payload_class.payload_dtype, count=1)[0]
+        return cast(U, payload_class._unwrap(record))
 
     @classmethod
     def parse_bulk(
@@ -241,6 +306,7 @@ def format_bulk(
         timestamps: ArrayLike | None = None,
         message_type: MessageType | ArrayLike = MessageType.Event,
         port: int = _DEFAULT_PORT,
+        out: "NDArray[np.uint8] | bytearray | memoryview | None" = None,
     ) -> NDArray[np.uint8]:
         """Build a flat buffer of N frames of this register type, the inverse of
         :meth:`parse_bulk`.
@@ -251,6 +317,101 @@ def format_bulk(
         is one :class:`MessageType` for all frames, or a length-N array of
         message-type bytes or values, for example the ``msgtype`` view returned by
         ``parse_bulk``.
+
+        Frames are written in place into one buffer through a structured view of the
+        frame layout, so the payload, timestamp and checksum columns are filled
+        without intermediate byte copies. ``out`` supplies that buffer, a writable
+        contiguous byte buffer of at least N frames, and the returned array is a view
+        of its leading frames; by default one is allocated. For output larger than
+        memory, see :meth:`format_bulk_chunks`.
+        """
+        records = cls._bulk_records(values)
+        is_timestamped = timestamps is not None
+        stride = cls._bulk_stride(is_timestamped)
+        nrows = len(records)
+        buf = _bulk_buffer(out, nrows * stride)
+        frames = buf.view(cls._bulk_frame_dtype(is_timestamped))
+        cls._format_frames(
+            frames,
+            records,
+            None if timestamps is None else np.atleast_1d(np.asarray(timestamps, dtype=np.float64)),
+            _encode_message_types(message_type, nrows),
+            port,
+        )
+        return buf
+
+    @classmethod
+    def format_bulk_chunks(
+        cls,
+        values: PayloadBase | ArrayLike,
+        *,
+        timestamps: ArrayLike | None = None,
+        message_type: MessageType | ArrayLike = MessageType.Event,
+        port: int = _DEFAULT_PORT,
+        chunk_frames: int = 1 << 16,
+    ) -> Iterator[NDArray[np.uint8]]:
+        """Yield the frames of :meth:`format_bulk` in chunks of at most ``chunk_frames``.
+
+        One buffer of ``chunk_frames`` frames is allocated up front and refilled for
+        every chunk, so memory stays bounded by the chunk size however many frames
+        are encoded. ``values``, ``timestamps`` and ``message_type`` are only sliced,
+        so a memory-mapped array streams straight from disk::
+
+            with open("AnalogData_44.bin", "wb") as f:
+                f.writelines(AnalogData.format_bulk_chunks(values, timestamps=seconds))
+
+        Each chunk is a view of the shared buffer and is overwritten by the next one,
+        so copy it to keep it past the next iteration.
+
+        The arguments are checked when this is called, before any chunk is encoded: a
+        scalar timestamp stamps every frame, and ``timestamps`` or a ``message_type``
+        array of another length than ``values`` raises ``ValueError``. Nothing is
+        yielded for a batch that cannot be encoded whole.
+        """
+        if chunk_frames < 1:
+            raise ValueError(f"chunk_frames must be positive, not {chunk_frames}.")
+        records = cls._bulk_records(values)
+        nrows = len(records)
+        ts = None if timestamps is None else _chunked_timestamps(timestamps, nrows)
+        message_types = _encode_message_types(message_type, nrows)
+        if len(message_types) != nrows:
+            raise ValueError(f"message_type holds {len(message_types)} values for {nrows} frames.")
+        return cls._bulk_chunks(records, ts, message_types, port, chunk_frames)
+
+    @classmethod
+    def _bulk_chunks(
+        cls,
+        records: np.ndarray,
+        ts: np.ndarray | None,
+        message_types: NDArray[np.uint8],
+        port: int,
+        chunk_frames: int,
+    ) -> Iterator[NDArray[np.uint8]]:
+        """The chunks of :meth:`format_bulk_chunks`, from arguments already checked."""
+        is_timestamped = ts is not None
+        stride = cls._bulk_stride(is_timestamped)
+        nrows = len(records)
+        buf = np.empty(min(nrows, chunk_frames) * stride, dtype=np.uint8)
+        frame_dtype = cls._bulk_frame_dtype(is_timestamped)
+        for start in range(0, nrows, chunk_frames):
+            stop = min(start + chunk_frames, nrows)
+            chunk = buf[: (stop - start) * stride]
+            cls._format_frames(
+                chunk.view(frame_dtype),
+                records[start:stop],
+                None if ts is None else np.asarray(ts[start:stop], dtype=np.float64),
+                message_types[start:stop],
+                port,
+            )
+            yield chunk
+
+    @classmethod
+    def _bulk_records(cls, values: PayloadBase | ArrayLike) -> np.ndarray:
+        """Resolve ``values`` to N payload records, each one opaque ``V{itemsize}`` scalar.
+
+        Reinterpreting a record as raw bytes copies it into a frame in one assignment,
+        gap bytes and all, without serializing the whole batch first. A strided view,
+        such as the payload returned by ``parse_bulk``, is reinterpreted in place.
         """
         payload_cls = cls.payload_class
         record_dtype = payload_cls.payload_dtype
@@ -283,39 +444,71 @@ def format_bulk(
         ):
             records = records.astype(record_dtype)
         nrows = len(records)
-        flat = np.ascontiguousarray(records).tobytes()
-        if len(flat) != nrows * itemsize:
+        if records.nbytes != nrows * itemsize:
             raise ValueError(
-                f"{cls.__name__}.format_bulk: {len(flat)} payload bytes for {nrows} frames "
+                f"{cls.__name__}.format_bulk: {records.nbytes} payload bytes for {nrows} frames "
                 f"is not a multiple of itemsize {itemsize}; check the values shape/dtype"
             )
+        raw = np.dtype((np.void, itemsize))
+        try:
+            return records.view(raw).reshape(nrows)
+        except ValueError:  # the record axis itself is not contiguous
+            return np.ascontiguousarray(records).view(raw).reshape(nrows)
 
-        is_timestamped = timestamps is not None
+    @classmethod
+    def _bulk_stride(cls, is_timestamped: bool) -> int:
         payload_offset = _TIMESTAMPED_PAYLOAD_OFFSET if is_timestamped else _HEADER_LEN
-        stride = payload_offset + itemsize + 1  # trailing checksum byte
-
-        buf = np.zeros((nrows, stride), dtype=np.uint8)
-        buf[:, 0] = _encode_message_types(message_type, nrows)
-        buf[:, 1] = stride - 2
-        buf[:, 2] = cls.address
-        buf[:, 3] = port
-        buf[:, 4] = encode_payload_type(cls.payload_type, has_timestamp=is_timestamped)
+        return payload_offset + cls.payload_class.payload_dtype.itemsize + 1  # checksum byte
 
+    @classmethod
+    def _bulk_frame_dtype(cls, is_timestamped: bool) -> np.dtype:
+        """The layout of one frame, so every column is written through a field view."""
+        itemsize = cls.payload_class.payload_dtype.itemsize
+        stride = cls._bulk_stride(is_timestamped)
+        fields: dict[str, tuple[Any, int]] = {"header": ((np.uint8, (_HEADER_LEN,)), 0)}
         if is_timestamped:
-            ts = np.atleast_1d(np.asarray(timestamps, dtype=np.float64))
-            seconds = ts.astype(np.uint32)
-            micros = np.round((ts - seconds.astype(np.float64)) / _TICK_PERIOD_S).astype(np.uint16)
-            buf[:, _HEADER_LEN:_TS_MICROS_OFFSET] = np.frombuffer(
-                seconds.astype("<u4").tobytes(), dtype=np.uint8
-            ).reshape(nrows, 4)
-            buf[:, _TS_MICROS_OFFSET:_TIMESTAMPED_PAYLOAD_OFFSET] = np.frombuffer(
-                micros.astype("<u2").tobytes(), dtype=np.uint8
-            ).reshape(nrows, 2)
-
-        payload_bytes = np.frombuffer(flat, dtype=np.uint8).reshape(nrows, itemsize)
-        buf[:, payload_offset : payload_offset + itemsize] = payload_bytes
-        buf[:, -1] = buf[:, :-1].sum(axis=1, dtype=np.uint64).astype(np.uint8)
-        return buf.reshape(-1)
+            fields["seconds"] = (np.dtype("<u4"), _HEADER_LEN)
+            fields["micros"] = (np.dtype("<u2"), _TS_MICROS_OFFSET)
+        fields["payload"] = (np.dtype((np.void, itemsize)), stride - itemsize - 1)
+        fields["checksum"] = (np.uint8, stride - 1)
+        return np.dtype(
+            {
+                "names": list(fields),
+                "formats": [fmt for fmt, _ in fields.values()],
+                "offsets": [offset for _, offset in fields.values()],
+                "itemsize": stride,
+            }
+        )
+
+    @classmethod
+    def _format_frames(
+        cls,
+        frames: np.ndarray,
+        records: np.ndarray,
+        timestamps: "NDArray[np.float64] | None",
+        message_types: NDArray[np.uint8],
+        port: int,
+    ) -> None:
+        """Fill the structured ``frames`` view in place, one column at a time."""
+        is_timestamped = timestamps is not None
+        stride = frames.dtype.itemsize
+        header = frames["header"]
+        header[:] = (
+            0,
+            stride - 2,
+            cls.address,
+            port,
+            encode_payload_type(cls.payload_type, has_timestamp=is_timestamped),
+        )
+        header[:, 0] = message_types
+        if timestamps is not None:
+            seconds = frames["seconds"]
+            seconds[:] = timestamps
+            fraction = np.subtract(timestamps, seconds)
+            fraction /= _TICK_PERIOD_S
+            frames["micros"] = np.round(fraction, out=fraction)
+        frames["payload"] = records
+        _fill_checksums(frames.view(np.uint8).reshape(len(frames), stride))
 
     @overload
     @classmethod
@@ -349,26 +542,81 @@ def format(
         timestamp: float | None = None,
         port: int = _DEFAULT_PORT,
     ) -> bytes:
-        """Build a Harp frame for this register. No value gives a Read, a value gives a Write."""
+        """Build a Harp frame for this register. No value gives a Read, a value gives a Write.
+
+        Frames are encoded through a :class:`~harp.protocol.FrameEncoder` cached on the
+        register, so repeated requests of the same shape reuse one precompiled header.
+        """
         if value is _MISSING:
             mt = MessageType.Read if message_type is None else message_type
-            return build_message_frame(
-                mt, cls.address, cls.payload_type, port=port, timestamp=timestamp
-            )
+            raw = b""
         else:
             mt = MessageType.Write if message_type is None else message_type
-            if isinstance(value, PayloadBase):
-                raw = value.payload_array.tobytes()
-            elif isinstance(value, np.ndarray):
-                raw = value.tobytes()
-            else:
-                # A bare high-level value (the symmetric counterpart of what
-                # parse() returns): let the payload class encode it, so any
-                # converter (e.g. a str via StringConverter) is applied.
-                raw = cls.payload_class(value).payload_array.tobytes()
-            return build_message_frame(
-                mt, cls.address, cls.payload_type, raw, port=port, timestamp=timestamp
+            raw = cls._encode_payload(value)
+        encoder = cls._encoder(mt, port, timestamp is not None, len(raw))
+        return encoder.encode(raw, timestamp=timestamp)
+
+    @classmethod
+    def encoder(
+        cls,
+        message_type: MessageType = MessageType.Write,
+        *,
+        port: int = _DEFAULT_PORT,
+        timestamped: bool = False,
+    ) -> FrameEncoder:
+        """The precompiled :class:`~harp.protocol.FrameEncoder` for frames of this register.
+
+        A ``Read`` request carries no payload, and every other message type carries one
+        full payload of ``payload_class.payload_dtype``. The encoder is built on first
+        use and cached on the register, so a controller writing the same register at a
+        high rate pays for the header once::
+
+            encoder = DigitalOutputSet.encoder()
+            frame = encoder.encode(np.uint16(0x3).tobytes())
+        """
+        size = 0 if message_type is MessageType.Read else cls.payload_class.payload_dtype.itemsize
+        return cls._encoder(message_type, port, timestamped, size)
+
+    @classmethod
+    def _encoder(
+        cls, message_type: MessageType, port: int, timestamped: bool, payload_size: int
+    ) -> FrameEncoder:
+        # Looked up in the own namespace of the class, so a subclass at another address
+        # never reuses the templates of its base.
+        encoders = cls.__dict__.get("_encoders")
+        if encoders is None:
+            encoders = {}
+            cls._encoders = encoders
+        key = (message_type, port, timestamped, payload_size)
+        encoder = encoders.get(key)
+        if encoder is None:
+            encoder = FrameEncoder(
+                message_type,
+                cls.address,
+                cls.payload_type,
+                payload_size,
+                port=port,
+                timestamped=timestamped,
             )
+            encoders[key] = encoder
+        return encoder
+
+    @classmethod
+    def _encode_payload(cls, value: Any) -> bytes:
+        """The payload bytes of ``value``, a payload, an ndarray, or a bare high-level value."""
+        if isinstance(value, PayloadBase):
+            return value.payload_array.tobytes()
+        if isinstance(value, np.ndarray):
+            return value.tobytes()
+        dtype = cls.payload_class.payload_dtype
+        if dtype.names is None and dtype.subdtype is None:
+            # A plain scalar register: cast straight to the wire type, which is all
+            # constructing its anonymous payload would do.
+            return np.asarray(value, dtype=dtype).tobytes()
+        # A bare high-level value (the symmetric counterpart of what parse() returns):
+        # let the payload class encode it, so any converter (e.g. a str via
+        # StringConverter) is applied.
+        return cls.payload_class(value).payload_array.tobytes()
 
 
 class RegisterU8(RegisterBase[np.uint8], metaclass=_ScalarRegisterMeta):
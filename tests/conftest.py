@@ -2,7 +2,9 @@
 
 from pathlib import Path
 
+import numpy as np
 import pytest
+from harp.device.schema import create_device_module
 
 from tests.fixtures import (  # re-export so conftest-aware code still works
     TIMESTAMP_1S,
@@ -25,3 +27,19 @@ def device_yml() -> str:
 def core_yml() -> str:
     """The generators core metadata ``core.yml`` as text."""
     return (ASSETS / "core.yml").read_text()
+
+
+@pytest.fixture
+def emitted_module(device_yml):
+    """The device module emitted from ``device_yml``."""
+    # require_converters=False: the test device.yml uses a custom DataConverter we don't inject
+    # here; native decoding is enough to exercise file resolution and parsing.
+    return create_device_module(device_yml, require_converters=False)
+
+
+def make_records(cls, n, seed):
+    """``n`` seeded payload records of register ``cls``."""
+    dtype = cls.payload_class.payload_dtype
+    rng = np.random.default_rng(seed)
+    raw = rng.integers(0, 128, size=n * dtype.itemsize, dtype=np.uint8)
+    return raw.view(dtype).copy()
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+from harp.data import Catalog, create_dataset, scan_catalog
+from harp.device.core import WhoAmI
+
+from tests.conftest import ASSETS
+
+SCHEMA = ASSETS / "device.yml"
+
+
+def _record(root, registers, *, start=0.0, max_frames=None):
+    """A device folder with ``frames`` frames of each register address in ``registers``."""
+    with create_dataset(root, SCHEMA, require_converters=False, max_frames=max_frames) as writer:
+        for address, frames in registers.items():
+            cls = writer.device_module.REGISTER_MAP[address]
+            dtype = cls.payload_class.payload_dtype
+            records = np.zeros(frames * dtype.itemsize, dtype=np.uint8).view(dtype)
+            writer.write(address, records, timestamps=start + np.arange(frames) * 0.5)
+    return writer.device_module
+
+
+@pytest.fixture
+def archive(tmp_path):
+    module = _record(tmp_path / "a" / "Tests", {0: 1, 33: 4})
+    register = module.REGISTER_MAP[33].__name__
+    # A nested session, its registers split across chunk files.
+    _record(tmp_path / "b" / "day" / "Tests", {33: 10}, start=100.0, max_frames=3)
+    (tmp_path / "b" / "notes").mkdir()
+    (tmp_path / "c").mkdir()
+    return tmp_path, register
+
+
+def test_scan_indexes_every_device_folder_from_headers(archive):
+    root, register = archive
+    entries = scan_catalog(root, workers=2).entries
+    assert entries["root"].tolist() == [str(root / "a" / "Tests")] * 2 + [
+        str(root / "b" / "day" / "Tests")
+    ]
+    assert set(entries["device"]) == {"Tests"}
+    assert entries["register"].tolist() == [WhoAmI.__name__, register, register]
+    assert entries["files"].tolist() == [1, 1, 4]
+    assert entries["frames"].tolist() == [1, 4, 10]
+    assert entries["first"].tolist() == [0.0, 0.0, 100.0]
+    assert entries["last"].tolist() == [0.0, 1.5, 104.5]
+
+
+def test_scan_keeps_going_past_a_schema_that_is_not_yaml(archive):
+    root, register = archive
+    (root / "b" / "day" / "Tests" / "device.yml").write_text("device: [Tests\nwhoAmI: 0\n")
+    entries = scan_catalog(root, workers=2).entries
+    # The folder stays in the index, as one row of unknown device and registers.
+    assert entries["root"].tolist()[-1] == str(root / "b" / "day" / "Tests")
+    assert entries["register"].tolist()[:2] == [WhoAmI.__name__, register]
+    assert entries.iloc[-1][["device", "register", "frames"]].isna().all()
+
+
+def test_catalog_round_trips_and_answers_queries(archive, tmp_path):
+    root, register = archive
+    path = tmp_path / "catalog.json"
+    scan_catalog(root).save(path)
+    catalog = Catalog.load(path)
+    assert catalog.entries.equals(scan_catalog(root).entries)
+    assert len(catalog.find(register=register)) == 2
+    assert len(catalog.find(register=33, start=50.0)) == 1
+    assert catalog.find(register=register, end=50.0)["frames"].tolist() == [4]
+    assert catalog.devices()["registers"].tolist() == [2, 1]
+
+
+def test_catalog_of_another_version_is_refused(tmp_path):
+    path = tmp_path / "catalog.json"
+    path.write_text('{"version": 0, "entries": []}')
+    with pytest.raises(ValueError, match="version 0"):
+        Catalog.load(path)
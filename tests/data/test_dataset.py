@@ -12,25 +12,13 @@
 from harp.device.core import TimestampSeconds, WhoAmI
 from harp.device.schema import create_device_module
 
+from tests.conftest import make_records
+
 
 def _timestamps(n):
     return np.arange(n, dtype=np.float64)
 
 
-def _records(cls, n, seed):
-    dtype = cls.payload_class.payload_dtype
-    rng = np.random.default_rng(seed)
-    raw = rng.integers(0, 128, size=n * dtype.itemsize, dtype=np.uint8)
-    return raw.view(dtype).copy()
-
-
-@pytest.fixture
-def emitted_module(device_yml):
-    # require_converters=False: the test device.yml uses a custom DataConverter we don't inject
-    # here; native decoding is enough to exercise file resolution and parsing.
-    return create_device_module(device_yml, require_converters=False)
-
-
 @pytest.fixture
 def dataset(emitted_module, tmp_path):
     """A dataset folder with three app registers."""
@@ -40,7 +28,7 @@ def dataset(emitted_module, tmp_path):
     specs = {}
     for address in addresses:
         cls = mod.REGISTER_MAP[address]
-        records = _records(cls, 5, seed=address)
+        records = make_records(cls, 5, seed=address)
         timestamps = _timestamps(5)
         buf = bytes(cls.format_bulk(records, timestamps=timestamps))
         (tmp_path / f"{name}_{address}.bin").write_bytes(buf)
@@ -86,7 +74,7 @@ def test_reads_common_registers_not_named_by_module(emitted_module, tmp_path):
     assert not hasattr(mod, "WhoAmI")  # imported from harp.device, not re-exported
 
     for cls in (WhoAmI, TimestampSeconds):
-        records = _records(cls, 4, seed=cls.address)
+        records = make_records(cls, 4, seed=cls.address)
         buf = bytes(cls.format_bulk(records, timestamps=_timestamps(4)))
         (tmp_path / f"{mod.DEVICE_NAME}_{cls.address}.bin").write_bytes(buf)
 
@@ -122,7 +110,7 @@ def test_untimestamped_frames_raise_value_error(emitted_module, tmp_path):
     address = next(a for a in sorted(mod.REGISTER_MAP) if a >= 32)
     cls = mod.REGISTER_MAP[address]
     (tmp_path / f"{mod.DEVICE_NAME}_{address}.bin").write_bytes(
-        bytes(cls.format_bulk(_records(cls, 3, seed=1)))
+        bytes(cls.format_bulk(make_records(cls, 3, seed=1)))
     )
 
     reader = DatasetReader(mod, tmp_path)
@@ -132,6 +120,35 @@ def test_untimestamped_frames_raise_value_error(emitted_module, tmp_path):
     assert len(reader.read(address, time_index=False)) == 3
 
 
+def test_read_selected_columns_match_full_read(dataset):
+    mod, _name, root, specs = dataset
+    reader = DatasetReader(mod, root)
+    address = next(a for a, (cls, _buf) in specs.items() if cls.__name__ == "AnalogData")
+    full = reader.read(address, keep_type=True)
+
+    df = reader.read(address, keep_type=True, columns=["accelerometer_2", "analog0"])
+
+    assert list(df.columns) == ["message_type", "accelerometer_2", "analog0"]
+    pd.testing.assert_frame_equal(df, full[list(df.columns)])
+
+
+@pytest.mark.parametrize("layout", ["records", "block"])
+def test_read_layouts_match_views(dataset, layout):
+    mod, _name, root, specs = dataset
+    reader = DatasetReader(mod, root)
+    for address, (cls, _buf) in specs.items():
+        views = reader.read(address, keep_type=True)
+        df = reader.read(address, keep_type=True, layout=layout)
+        pd.testing.assert_frame_equal(df, views)
+        if layout == "block":
+            assert all(df[c].to_numpy().flags.c_contiguous for c in df.columns), cls.__name__
+    analog = next(a for a, (cls, _buf) in specs.items() if cls.__name__ == "AnalogData")
+    if layout == "block":  # homogeneous float32 columns share one block
+        assert reader.read(analog, layout=layout)._mgr.nblocks == 1
+    with pytest.raises(ValueError, match="layout"):
+        reader.read(analog, layout="packed")  # type: ignore[arg-type]
+
+
 def test_time_index_is_float_seconds_without_epoch(dataset):
     mod, _name, root, specs = dataset
     reader = DatasetReader(mod, root)
@@ -171,6 +188,134 @@ def test_parse_takes_epoch_without_dataset(dataset):
     assert df.index[0] == pd.Timestamp(REFERENCE_EPOCH)
 
 
+def test_epoch_index_is_exact_integer_nanoseconds(dataset):
+    # Late in the Harp clock float seconds carry a few hundred ns of error; the integer
+    # path lands every tick exactly.
+    _mod, _name, _root, specs = dataset
+    cls, _buf = specs[next(iter(specs))]
+    seconds = np.array([4_000_000_000, 4_000_000_000, 4_100_000_123], dtype=np.int64)
+    ticks = np.array([0, 1, 31_249], dtype=np.int64)
+    buf = bytes(cls.format_bulk(make_records(cls, 3, seed=0), timestamps=seconds + ticks * 32e-6))
+    df = parse_to_dataframe(cls, buf, epoch=REFERENCE_EPOCH)
+    expected = seconds * 1_000_000_000 + ticks * 32_000
+    assert (df.index.asi8 - pd.Timestamp(REFERENCE_EPOCH).value).tolist() == expected.tolist()
+
+
+def test_time_range_keeps_frames_in_half_open_interval(dataset):
+    mod, _name, root, specs = dataset
+    address = next(iter(specs))
+    df = DatasetReader(mod, root).read(address, start=1.0, end=3.0)
+    assert list(df.index) == [1.0, 2.0]
+    anchored = DatasetReader(mod, root, epoch=REFERENCE_EPOCH)
+    later = pd.Timestamp(REFERENCE_EPOCH) + pd.Timedelta(seconds=3)
+    assert len(anchored.read(address, start=later.to_pydatetime())) == 2
+    assert anchored.read(address, start=1.0, end=1.0).empty
+
+
+def test_time_range_selects_unordered_frames(dataset):
+    _mod, _name, _root, specs = dataset
+    cls, _buf = specs[next(iter(specs))]
+    records = make_records(cls, 5, seed=1)
+    buf = bytes(cls.format_bulk(records, timestamps=np.array([0.0, 3.0, 1.0, 4.0, 2.0])))
+    full = parse_to_dataframe(cls, buf, keep_type=True)
+    df = parse_to_dataframe(cls, buf, keep_type=True, start=1.0, end=3.0)
+    pd.testing.assert_frame_equal(df, full.iloc[[2, 4]])
+    with pytest.raises(ValueError, match="timestamp"):
+        parse_to_dataframe(cls, bytes(cls.format_bulk(records)), start=1.0)
+
+
+def test_summary_counts_frames_and_spans_without_decoding(dataset):
+    mod, _name, root, specs = dataset
+    summary = DatasetReader(mod, root).summary()
+    assert summary.index.tolist() == [cls.__name__ for cls, _buf in specs.values()]
+    assert summary["frames"].tolist() == [5, 5, 5]
+    assert summary["bytes"].tolist() == [len(buf) for _cls, buf in specs.values()]
+    assert summary[["first", "last", "duration", "rate"]].iloc[0].tolist() == [0.0, 4.0, 4.0, 1.0]
+
+
+def test_summary_samples_rates_and_gaps(emitted_module, tmp_path):
+    mod = emitted_module
+    address = next(a for a in sorted(mod.REGISTER_MAP) if a >= 32)
+    cls = mod.REGISTER_MAP[address]
+    # 1 kHz frames with one 2 s pause, split across two chunk files.
+    seconds = np.arange(1000) * 1e-3
+    seconds[600:] += 2.0
+    buf = bytes(cls.format_bulk(make_records(cls, 1000, seed=0), timestamps=seconds))
+    stride = len(buf) // 1000
+    (tmp_path / f"{mod.DEVICE_NAME}_{address}_0.bin").write_bytes(buf[: 400 * stride])
+    (tmp_path / f"{mod.DEVICE_NAME}_{address}_1.bin").write_bytes(buf[400 * stride :])
+    reader = DatasetReader(mod, tmp_path)
+    exact = reader.summary(sample=1000, gap=0.5).loc[cls.__name__]
+    assert (exact["files"], exact["frames"], exact["gaps"]) == (2, 1000, 1)
+    assert exact["median_rate"] == pytest.approx(1000, rel=0.05)
+    sampled = reader.summary(gap=0.5, sample=100).loc[cls.__name__]
+    assert sampled["gaps"] == 1
+    assert sampled["median_rate"] == pytest.approx(1000, rel=0.05)
+    assert "median_rate" not in reader.summary().columns
+
+
+@pytest.fixture
+def interleaved(emitted_module, tmp_path):
+    """Two registers, one every second from 0 s and one every 2 s from 0.5 s."""
+    mod = emitted_module
+    first, second = [mod.REGISTER_MAP[a] for a in sorted(mod.REGISTER_MAP) if a >= 32][:2]
+    for cls, seconds in ((first, [0.0, 1.0, 2.0, 3.0]), (second, [0.5, 2.5])):
+        buf = cls.format_bulk(make_records(cls, len(seconds), seed=1), timestamps=seconds)
+        (tmp_path / f"{mod.DEVICE_NAME}_{cls.address}.bin").write_bytes(bytes(buf))
+    return DatasetReader(mod, tmp_path), first.__name__, second.__name__
+
+
+def test_read_aligned_asof_matches_merge_asof(interleaved):
+    reader, first, second = interleaved
+    df = reader.read_aligned([first, second])
+    assert df.index.tolist() == [0.0, 1.0, 2.0, 3.0]
+    assert df.columns.get_level_values("register").unique().tolist() == [first, second]
+    left, right = reader.read(first), reader.read(second)
+    expected = pd.merge_asof(left.add_prefix("l_"), right, left_index=True, right_index=True)
+    aligned = df[second].astype(float).to_numpy()
+    np.testing.assert_array_equal(aligned, expected[right.columns].astype(float).to_numpy())
+    assert (df[first].to_numpy() == left.to_numpy()).all()
+    # Within 0.6 s, the frame at 2 s is 1.5 s past the latest of the second register.
+    tolerant = reader.read_aligned([first, second], tolerance=0.6)
+    assert tolerant[second].notna().all(axis=1).tolist() == [False, True, False, True]
+
+
+def test_read_aligned_gathers_every_dtype_like_merge_asof(emitted_module, tmp_path):
+    # Out-of-order frames of integer, enum and boolean columns, missing before the first.
+    mod = emitted_module
+    axis_cls, other_cls = mod.REGISTER_MAP[33], mod.REGISTER_MAP[34]
+    frames = ((axis_cls, np.arange(8) * 0.5), (other_cls, [3.25, 1.25, 2.0, 0.25, 3.0]))
+    for cls, seconds in frames:
+        buf = cls.format_bulk(make_records(cls, len(seconds), seed=4), timestamps=seconds)
+        (tmp_path / f"{mod.DEVICE_NAME}_{cls.address}.bin").write_bytes(bytes(buf))
+    reader = DatasetReader(mod, tmp_path)
+
+    df = reader.read_aligned([axis_cls, other_cls], start=1.0)
+    left = reader.read(axis_cls, start=1.0)
+    right = reader.read(other_cls, start=1.0).sort_index(kind="stable")
+    expected = pd.merge_asof(left.add_prefix("l_"), right, left_index=True, right_index=True)
+    pd.testing.assert_frame_equal(
+        df[other_cls.__name__], expected[right.columns], check_names=False
+    )
+    assert df[other_cls.__name__].iloc[0].isna().all()
+
+
+def test_read_aligned_outer_and_resample_axes(interleaved):
+    reader, first, second = interleaved
+    outer = reader.read_aligned([first, second], how="outer")
+    assert outer.index.tolist() == [0.0, 0.5, 1.0, 2.0, 2.5, 3.0]
+    assert outer[second].notna().all(axis=1).tolist() == [False, True, False, False, True, False]
+    assert outer[first].notna().all(axis=1).tolist() == [True, False, True, True, False, True]
+    resampled = reader.read_aligned([second, first], how="resample", period=0.5, start=0.5)
+    assert resampled.index.tolist() == [0.5, 1.0, 1.5, 2.0, 2.5, 3.0]
+    # Its frame at 0 s is before start, so the first step has no frame of it yet.
+    assert resampled[first].notna().all(axis=1).tolist() == [False] + [True] * 5
+    with pytest.raises(ValueError, match="period"):
+        reader.read_aligned([first, second], period=1.0)
+    with pytest.raises(ValueError, match="tolerance"):
+        reader.read_aligned([first, second], how="outer", tolerance=1.0)
+
+
 def test_suffix_chunks_are_concatenated(emitted_module, tmp_path):
     # Chunk suffixes in this test are ISO 8601 UTC timestamps in basic format, so
     # filename order is chronological order. Written newest first to test the sorting.
@@ -180,10 +325,10 @@ def test_suffix_chunks_are_concatenated(emitted_module, tmp_path):
     cls = mod.REGISTER_MAP[address]
     chunks = {
         "20260816T090000Z": bytes(
-            cls.format_bulk(_records(cls, 3, seed=1), timestamps=_timestamps(3))
+            cls.format_bulk(make_records(cls, 3, seed=1), timestamps=_timestamps(3))
         ),
         "20260816T100000Z": bytes(
-            cls.format_bulk(_records(cls, 2, seed=2), timestamps=_timestamps(2))
+            cls.format_bulk(make_records(cls, 2, seed=2), timestamps=_timestamps(2))
         ),
     }
     for suffix in reversed(list(chunks)):
@@ -245,7 +390,7 @@ def test_unlogged_register_reads_empty(dataset):
     reader = DatasetReader(mod, root)
 
     df = reader.read(0)
-    buf = bytes(WhoAmI.format_bulk(_records(WhoAmI, 2, seed=0), timestamps=_timestamps(2)))
+    buf = bytes(WhoAmI.format_bulk(make_records(WhoAmI, 2, seed=0), timestamps=_timestamps(2)))
     populated = parse_to_dataframe(WhoAmI, buf)
 
     assert len(df) == 0
@@ -276,7 +421,7 @@ def test_custom_file_resolver_supports_alternative_layout(emitted_module, tmp_pa
     expected = {}
     for address in addresses:
         cls = mod.REGISTER_MAP[address]
-        buf = bytes(cls.format_bulk(_records(cls, 3, seed=address), timestamps=_timestamps(3)))
+        buf = bytes(cls.format_bulk(make_records(cls, 3, seed=address), timestamps=_timestamps(3)))
         (tmp_path / f"reg{address}.bin").write_bytes(buf)  # not the Harp layout
         expected[cls.__name__] = parse_to_dataframe(cls, buf)
 
@@ -311,7 +456,7 @@ def test_contents_maps_names_to_addresses(dataset):
 def test_contents_sorted_by_address(dataset):
     mod, name, root, _specs = dataset
     cls = mod.REGISTER_MAP[0]
-    (root / f"{name}_0.bin").write_bytes(bytes(cls.format_bulk(_records(cls, 2, seed=0))))
+    (root / f"{name}_0.bin").write_bytes(bytes(cls.format_bulk(make_records(cls, 2, seed=0))))
 
     reader = DatasetReader(mod, root)
 
@@ -352,7 +497,7 @@ def test_every_register_round_trips(emitted_module, tmp_path):
     name = mod.DEVICE_NAME
     expected = {}
     for address, cls in mod.REGISTER_MAP.items():
-        records = _records(cls, 4, seed=address)
+        records = make_records(cls, 4, seed=address)
         buf = bytes(cls.format_bulk(records, timestamps=_timestamps(4)))
         (tmp_path / f"{name}_{address}.bin").write_bytes(buf)
         expected[cls.__name__] = parse_to_dataframe(cls, buf)
@@ -523,3 +668,69 @@ def test_external_schema_mismatch_raises_on_construction(dataset, device_yml, tm
 
     with pytest.raises(ValueError, match="WhoAmI mismatch"):
         open_dataset(root, schema=schema_path, require_converters=False)
+
+
+@pytest.fixture
+def analog(emitted_module, tmp_path):
+    """AnalogData at irregular times, split across two chunk files."""
+    mod = emitted_module
+    cls = mod.REGISTER_MAP[33]
+    rng = np.random.default_rng(7)
+    seconds = np.cumsum(rng.uniform(0.0, 0.3, size=400))
+    seconds[200:210] += 5.0  # a pause leaving empty bins
+    seconds[210:] += 5.0
+    itemsize = cls.payload_class.payload_dtype.itemsize
+    values = rng.normal(size=len(seconds) * itemsize // 4).astype("<f4")
+    records = values.view(np.uint8).view(cls.payload_class.payload_dtype)
+    for suffix, rows in (("a", slice(0, 250)), ("b", slice(250, None))):
+        buf = cls.format_bulk(records[rows], timestamps=seconds[rows])
+        (tmp_path / f"{mod.DEVICE_NAME}_33_{suffix}.bin").write_bytes(bytes(buf))
+    return DatasetReader(mod, tmp_path), cls.__name__
+
+
+@pytest.mark.parametrize("how", ["min", "max", "mean", "last"])
+def test_read_resample_matches_pandas_over_chunks(analog, how, monkeypatch):
+    reader, name = analog
+    # Chunks of a few frames, so bins straddle chunks as well as files.
+    monkeypatch.setattr("harp.data._resample._CHUNK_BYTES", 100)
+    df = reader.read(name, resample=2.0, aggregate=how)
+    full = reader.read(name).astype("float64")  # as the mean sums
+    bins = np.floor_divide(np.round(full.index.to_numpy() * 1e9), 2e9)
+    expected = full.groupby(bins).agg(how)
+    expected = expected.reindex(np.arange(bins.min(), bins.max() + 1))
+    assert df.index.tolist() == (expected.index * 2.0).tolist()
+    np.testing.assert_allclose(df.to_numpy(float), expected.to_numpy(float))
+
+
+def test_read_resample_several_aggregations_and_options(analog):
+    reader, name = analog
+    df = reader.read(name, resample=5.0, aggregate=["min", "max"], start=10.0, end=40.0)
+    assert df.columns.names == ["column", "aggregation"]
+    column = df.columns.get_level_values("column")[0]
+    assert (df[column, "min"] <= df[column, "max"]).all()
+    assert df.index[0] >= 10.0 and df.index[-1] < 40.0
+    with pytest.raises(ValueError, match="aggregate"):
+        reader.read(name, aggregate="mean")
+    with pytest.raises(ValueError, match="keep_type"):
+        reader.read(name, resample=1.0, keep_type=True)
+    with pytest.raises(ValueError, match="positive"):
+        reader.read(name, resample=0.0)
+
+
+def test_read_resample_last_of_enum_with_undefined_codes_over_chunks(
+    emitted_module, tmp_path, monkeypatch
+):
+    mod = emitted_module
+    cls = mod.REGISTER_MAP[103]  # EncoderMode, whose enum declares 0 and 1 only
+    codes = np.array([0, 1, 5, 1, 0, 7, 7, 0, 1, 5], dtype=np.uint8)
+    seconds = np.arange(len(codes), dtype=np.float64)
+    buf = cls.format_bulk(codes.view(cls.payload_class.payload_dtype), timestamps=seconds)
+    (tmp_path / f"{mod.DEVICE_NAME}_103.bin").write_bytes(bytes(buf))
+    reader = DatasetReader(mod, tmp_path)
+    # A chunk of two frames, so the undefined codes first appear in different chunks.
+    stride = len(bytes(buf)) // len(codes)
+    monkeypatch.setattr("harp.data._resample._CHUNK_BYTES", 2 * stride)
+    df = reader.read(cls.__name__, resample=2.0, aggregate="last")
+    full = reader.read(cls.__name__)
+    column = full.columns[0]
+    assert df[column].astype(str).tolist() == full[column].iloc[1::2].astype(str).tolist()
@@ -0,0 +1,98 @@
+import enum
+
+import numpy as np
+import pandas as pd
+import pytest
+from harp.data import FlagArray, FlagDtype, parse_to_dataframe, payload_to_dataframe
+from harp.protocol import AnonymousPayload, BitMask, PayloadType, RegisterBase
+
+
+class _Lines(enum.IntFlag):
+    DI0 = 0x0001
+    DI1 = 0x0002
+    DI8 = 0x0100
+    DI15 = 0x8000
+    DO0 = 0x10000  # does not fit a U16 port, so it is never a column
+
+
+class _PortPayload(AnonymousPayload[np.uint16]):
+    __value__ = BitMask(enum=_Lines)
+
+
+class _Port(RegisterBase[_Lines]):
+    address = 32
+    payload_type = PayloadType.U16
+    payload_class = _PortPayload
+
+
+def _frames(values):
+    values = np.asarray(values, dtype=np.uint16)
+    return bytes(_Port.format_bulk(values, timestamps=np.arange(len(values), dtype=np.float64)))
+
+
+def test_packed_column_reads_like_demuxed_columns():
+    values = np.random.default_rng(7).integers(0, 1 << 16, size=256, dtype=np.uint16)
+    raw = _frames(values)
+
+    packed = parse_to_dataframe(_Port, raw, pack_bit_masks=True)
+    demuxed = parse_to_dataframe(_Port, raw, demux_bit_masks=True)
+
+    assert list(packed.columns) == ["value"]
+    assert packed["value"].dtype == FlagDtype(_Lines, np.uint16)
+    assert packed["value"].bitmask.members == ["DI0", "DI1", "DI8", "DI15"]
+    pd.testing.assert_series_equal(packed["value"].bitmask["DI8"], demuxed["DI8"])
+    pd.testing.assert_frame_equal(packed["value"].bitmask.demux(), demuxed)
+    # One integer per frame rather than a bool per flag per frame.
+    assert packed["value"].array.nbytes < demuxed.memory_usage(index=False).sum()
+
+
+class _LowPortPayload(AnonymousPayload[np.uint16]):
+    __value__ = BitMask(enum=_Lines, mask=0x00FF)
+
+
+class _LowPort(RegisterBase[_Lines]):
+    address = 33
+    payload_type = PayloadType.U16
+    payload_class = _LowPortPayload
+
+
+def test_packed_column_of_a_partial_mask_lists_the_flags_demux_reads():
+    values = np.array([0x0103, 0x8001, 0x0002], dtype=np.uint16)
+    raw = bytes(_LowPort.format_bulk(values, timestamps=np.arange(3, dtype=np.float64)))
+
+    packed = parse_to_dataframe(_LowPort, raw, pack_bit_masks=True)
+    demuxed = parse_to_dataframe(_LowPort, raw, demux_bit_masks=True)
+
+    assert packed["value"].dtype == FlagDtype(_Lines, np.uint16, 0x00FF)
+    assert packed["value"].bitmask.members == ["DI0", "DI1"] == list(demuxed.columns)
+    pd.testing.assert_frame_equal(packed["value"].bitmask.demux(), demuxed)
+
+
+def test_packed_elements_are_flags():
+    df = parse_to_dataframe(_Port, _frames([0x0003, 0x0000]), pack_bit_masks=True)
+    assert df["value"].iloc[0] == _Lines.DI0 | _Lines.DI1
+    assert repr(df["value"].iloc[1]) == repr(_Lines(0))
+    assert "DI0|DI1" in repr(df)
+    assert df["value"].to_numpy().tolist() == [3, 0]
+
+
+def test_reindex_marks_new_rows_missing():
+    df = parse_to_dataframe(_Port, _frames([0x0001, 0x0101]), pack_bit_masks=True)
+
+    grown = df.reindex([0.0, 1.0, 2.0])
+
+    assert grown["value"].isna().tolist() == [False, False, True]
+    assert grown["value"].bitmask[_Lines.DI8].tolist() == [False, True, False]
+    both = pd.concat([df, df])["value"]
+    assert isinstance(both.array, FlagArray)
+    assert both.bitmask["DI0"].tolist() == [True] * 4
+
+
+def test_pack_and_demux_are_exclusive():
+    batch = _PortPayload.payload_from_buffer(np.zeros(2, dtype=np.uint16).tobytes())
+    with pytest.raises(ValueError, match="exclusive"):
+        payload_to_dataframe(batch, demux_bit_masks=True, pack_bit_masks=True)
+
+
+def test_bitmask_accessor_needs_a_flag_column():
+    assert not hasattr(pd.Series([1, 2]), "bitmask")
@@ -0,0 +1,112 @@
+import queue
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from harp.data import REFERENCE_EPOCH, LiveTable, parse_to_dataframe
+from harp.device.client import Device
+from harp.device.schema import create_device_module
+from harp.protocol import HarpMessage, HarpParseError, MessageType, RegisterFloatArray
+
+
+class _EventTransport:
+    """A transport delivering whatever frames the test queues, one read each."""
+
+    def __init__(self) -> None:
+        self.inbox: queue.SimpleQueue[bytes] = queue.SimpleQueue()
+
+    def open(self) -> None: ...
+
+    def close(self) -> None: ...
+
+    def write(self, data: bytes) -> None: ...
+
+    def read(self) -> bytes:
+        try:
+            return self.inbox.get(timeout=0.01)
+        except queue.Empty:
+            return b""
+
+
+@pytest.fixture
+def analog(device_yml):
+    return create_device_module(device_yml, require_converters=False).AnalogData
+
+
+def _frames(register, n, *, start=0):
+    values = np.arange(start * 6, (start + n) * 6, dtype=np.float32).reshape(n, 6)
+    seconds = np.arange(start, start + n, dtype=np.float64) * 1e-3
+    return bytes(register.format_bulk(values, timestamps=seconds))
+
+
+def _messages(register, n, *, start=0):
+    raw = _frames(register, n, start=start)
+    stride = len(raw) // n
+    return [HarpMessage.parse(raw[i : i + stride]) for i in range(0, len(raw), stride)]
+
+
+def test_snapshot_matches_reading_the_same_frames(analog):
+    table = LiveTable(analog, capacity=2, keep_type=True, epoch=REFERENCE_EPOCH)
+    assert table.snapshot().empty
+    for message in _messages(analog, 5):
+        table.append(message)
+    expected = parse_to_dataframe(analog, _frames(analog, 5), keep_type=True, epoch=REFERENCE_EPOCH)
+    pd.testing.assert_frame_equal(table.snapshot(), expected)
+    assert len(table) == table.total == 5
+
+
+def test_snapshot_survives_growth_and_clear(analog):
+    # Frames appended are never written again, so an earlier snapshot keeps its rows.
+    table = LiveTable(analog, capacity=1)
+    messages = _messages(analog, 4)
+    table.append(messages[0])
+    first = table.snapshot()
+    for message in messages[1:]:
+        table.append(message)
+    table.clear()
+    table.append(messages[3])
+    assert first["analog0"].tolist() == [0.0]
+    assert table.snapshot()["analog0"].tolist() == [18.0]
+
+
+def test_ring_keeps_the_latest_rows_oldest_first(analog):
+    table = LiveTable(analog, max_rows=3)
+    for message in _messages(analog, 7):
+        table.append(message)
+    assert (len(table), table.total) == (3, 7)
+    expected = parse_to_dataframe(analog, _frames(analog, 3, start=4))
+    pd.testing.assert_frame_equal(table.snapshot(), expected)
+
+
+def test_frames_of_another_length_are_refused(analog):
+    table = LiveTable(analog)
+    table.append(_messages(analog, 1)[0])
+    untimestamped = HarpMessage.parse(analog.format(np.zeros(6, dtype=np.float32)))
+    with pytest.raises(HarpParseError):
+        table.append(untimestamped)
+
+
+@pytest.mark.parametrize("layout", ["array", "struct"])
+def test_subscription_feeds_the_table(layout, analog):
+    # A struct payload spans several values of its payload type, which decode must size.
+    samples = RegisterFloatArray(33, length=6) if layout == "array" else analog
+    transport = _EventTransport()
+    table = LiveTable(samples)
+    with Device(transport) as device, table.subscribe(device):
+        transport.inbox.put(
+            bytes(
+                samples.format_bulk(
+                    np.zeros((1, 6), dtype=np.float32), message_type=MessageType.Write
+                )
+            )
+        )
+        for message in _messages(samples, 3):
+            transport.inbox.put(message.bytes)
+        deadline = time.monotonic() + 2
+        while len(table) < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    # The write reply is filtered out by the subscription, as events alone are kept.
+    pd.testing.assert_frame_equal(
+        table.snapshot(), parse_to_dataframe(samples, _frames(samples, 3))
+    )
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+from harp.data import DatasetReader
+
+
+def _frames(cls, seconds, seed):
+    """AnalogData frames of normal values at ``seconds``."""
+    dtype = cls.payload_class.payload_dtype
+    values = np.random.default_rng(seed).normal(size=len(seconds) * dtype.itemsize // 4)
+    return bytes(
+        cls.format_bulk(values.astype("<f4").view(np.uint8).view(dtype), timestamps=seconds)
+    )
+
+
+@pytest.fixture
+def recording(emitted_module, tmp_path):
+    """Four minutes of AnalogData at 50 Hz with a pause, and the frames as written."""
+    cls = emitted_module.REGISTER_MAP[33]
+    seconds = np.arange(12_000) * 0.02
+    seconds[6_000:] += 30.0
+    raw = _frames(cls, seconds, seed=3)
+    return tmp_path, cls, raw
+
+
+def _compare(pyramid, reader, name, start, end, points):
+    df = pyramid.query(start, end, points=points)
+    period = df.index[1] - df.index[0]
+    expected = reader.read(
+        name, resample=period, aggregate=["min", "max", "mean"], start=start, end=end
+    )
+    expected = expected.reindex(df.index)
+    np.testing.assert_allclose(df.to_numpy(), expected.to_numpy(float), rtol=1e-12)
+    return df, period
+
+
+def test_queries_answer_from_levels_and_raw_frames(recording, emitted_module):
+    root, cls, raw = recording
+    (root / f"{emitted_module.DEVICE_NAME}_33.bin").write_bytes(raw)
+    reader = DatasetReader(emitted_module, root)
+    pyramid = reader.pyramid(cls.__name__, base=0.1, factor=4)
+    assert pyramid.folder == root / f"{emitted_module.DEVICE_NAME}_33.pyramid"
+    assert pyramid.periods[:3] == pytest.approx([0.1, 0.4, 1.6])
+    # The cache is not a register file.
+    assert reader.paths == DatasetReader(emitted_module, root).paths
+
+    # The whole span at 100 points, from the level of 1.6 s bins.
+    df, period = _compare(pyramid, reader, cls.__name__, None, None, 100)
+    assert period == pytest.approx(1.6)
+    assert df.columns.get_level_values("aggregation").unique().tolist() == ["min", "max", "mean"]
+    assert df.isna().all(axis=1).any()  # the pause
+    # Two seconds at 100 points is finer than any level, so the raw frames are binned.
+    _df, period = _compare(pyramid, reader, cls.__name__, 10.0, 12.0, 100)
+    assert period == pytest.approx(0.02)
+
+
+def test_update_folds_in_appended_frames(recording, emitted_module, tmp_path_factory):
+    root, _cls, raw = recording
+    path = root / f"{emitted_module.DEVICE_NAME}_33_a.bin"
+    stride = raw[1] + 2
+    path.write_bytes(raw[: 5_000 * stride])
+    reader = DatasetReader(emitted_module, root)
+    pyramid = reader.pyramid(33, base=0.1, factor=4)
+
+    with open(path, "ab") as file:
+        file.write(raw[5_000 * stride : 9_000 * stride])
+    (root / f"{emitted_module.DEVICE_NAME}_33_b.bin").write_bytes(raw[9_000 * stride :])
+    pyramid.update()
+
+    whole = tmp_path_factory.mktemp("whole")
+    (whole / f"{emitted_module.DEVICE_NAME}_33.bin").write_bytes(raw)
+    rebuilt = DatasetReader(emitted_module, whole).pyramid(33, base=0.1, factor=4)
+    assert pyramid.periods == rebuilt.periods
+    for points in (1, 30, 200, 2_000):
+        assert pyramid.query(points=points).equals(rebuilt.query(points=points))
+
+    # Other options rebuild the cache rather than mixing bins.
+    reader = DatasetReader(emitted_module, root)
+    coarse = reader.pyramid(33, base=0.5, factor=2)
+    assert coarse.periods[:2] == pytest.approx([0.5, 1.0])
+    _compare(coarse, reader, 33, None, None, 50)
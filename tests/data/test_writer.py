@@ -0,0 +1,168 @@
+import numpy as np
+import pytest
+from harp.data import (
+    DatasetReader,
+    DatasetWriter,
+    RegisterWriter,
+    create_dataset,
+    default_file_resolver,
+    open_dataset,
+    parse_to_dataframe,
+)
+
+from tests.conftest import make_records
+
+
+@pytest.fixture
+def register(emitted_module):
+    return emitted_module.REGISTER_MAP[
+        next(a for a in sorted(emitted_module.REGISTER_MAP) if a >= 32)
+    ]
+
+
+def _stride(cls):
+    return len(cls.format_bulk(make_records(cls, 1, seed=0), timestamps=[0.0]))
+
+
+def test_batches_append_to_one_file(register, tmp_path):
+    records = make_records(register, 10, seed=1)
+    timestamps = np.arange(10, dtype=np.float64)
+    with RegisterWriter(register, tmp_path, "Device") as writer:
+        assert writer.write(records[:4], timestamps=timestamps[:4]) == 4
+        assert writer.write(records[4:], timestamps=timestamps[4:]) == 6
+        assert writer.frame_count == 10
+
+    assert writer.closed
+    assert writer.paths == [tmp_path / f"Device_{register.address}.bin"]
+    expected = bytes(register.format_bulk(records, timestamps=timestamps))
+    assert writer.paths[0].read_bytes() == expected
+
+
+def test_flush_on_write_makes_batches_visible(register, tmp_path):
+    # The default policy hands every batch to the OS, so a reader sees it before close.
+    writer = RegisterWriter(register, tmp_path, "Device")
+    writer.write(make_records(register, 3, seed=1), timestamps=[0.0, 1.0, 2.0])
+    assert writer.paths[0].stat().st_size == 3 * _stride(register)
+    writer.close()
+
+
+def test_flush_on_chunk_defers_to_the_buffer(register, tmp_path):
+    writer = RegisterWriter(register, tmp_path, "Device", flush="chunk", fsync=True)
+    writer.write(make_records(register, 3, seed=1), timestamps=[0.0, 1.0, 2.0])
+    assert writer.paths[0].stat().st_size == 0
+    writer.flush()
+    assert writer.paths[0].stat().st_size == 3 * _stride(register)
+    writer.close()
+
+
+def test_rotation_by_frames_splits_batches_across_chunks(register, tmp_path):
+    records = make_records(register, 7, seed=2)
+    timestamps = np.arange(7, dtype=np.float64)
+    with RegisterWriter(register, tmp_path, "Device", max_frames=3) as writer:
+        writer.write(records[:2], timestamps=timestamps[:2])
+        writer.write(records[2:], timestamps=timestamps[2:])
+
+    stride = _stride(register)
+    assert [p.name for p in writer.paths] == [
+        f"Device_{register.address}_{i:04d}.bin" for i in range(3)
+    ]
+    assert [p.stat().st_size // stride for p in writer.paths] == [3, 3, 1]
+    joined = b"".join(p.read_bytes() for p in writer.paths)
+    assert joined == bytes(register.format_bulk(records, timestamps=timestamps))
+
+
+def test_chunks_past_the_padding_are_read_in_sequence(emitted_module, register, tmp_path):
+    # The 10,000th chunk outgrows four digits, and sorts before _9999 by name.
+    records = make_records(register, 4, seed=4)
+    timestamps = np.arange(4, dtype=np.float64)
+    for frame, number in enumerate((0, 9998, 9999, 10000)):
+        buf = register.format_bulk(records[frame : frame + 1], timestamps=timestamps[frame:][:1])
+        (tmp_path / f"Device_{register.address}_{number:04d}.bin").write_bytes(bytes(buf))
+
+    paths = default_file_resolver(tmp_path, "Device")[register.address]
+    assert [p.stem.rsplit("_", 1)[1] for p in paths] == ["0000", "9998", "9999", "10000"]
+    reader = DatasetReader(emitted_module, tmp_path, name="Device", validate=False)
+    assert reader.read(register).index.tolist() == timestamps.tolist()
+
+
+def test_rotation_by_bytes_keeps_whole_frames(register, tmp_path):
+    stride = _stride(register)
+    with RegisterWriter(register, tmp_path, "Device", max_bytes=2 * stride + 1) as writer:
+        writer.write(make_records(register, 5, seed=3), timestamps=np.arange(5.0))
+    assert [p.stat().st_size for p in writer.paths] == [2 * stride, 2 * stride, stride]
+
+
+def test_a_batch_that_cannot_be_encoded_writes_nothing(register, tmp_path):
+    # Spanning two encoding chunks, the short timestamps would only run out in the second.
+    records = make_records(register, 70_000, seed=5)
+    with RegisterWriter(register, tmp_path, "Device", max_frames=50_000) as writer:
+        writer.write(records[:2], timestamps=[0.0, 1.0])
+        with pytest.raises(ValueError, match="timestamps"):
+            writer.write(records, timestamps=np.arange(69_999, dtype=np.float64))
+        assert writer.frame_count == 2
+    assert [p.stat().st_size for p in writer.paths] == [2 * _stride(register)]
+
+
+def test_writer_rejects_bad_options_and_closed_writes(register, tmp_path):
+    with pytest.raises(ValueError, match="max_frames must be positive"):
+        RegisterWriter(register, tmp_path, "Device", max_frames=0)
+    with pytest.raises(ValueError, match="flush must be"):
+        RegisterWriter(register, tmp_path, "Device", flush="always")
+    writer = RegisterWriter(register, tmp_path, "Device")
+    writer.close()
+    with pytest.raises(ValueError, match="closed writer"):
+        writer.write(make_records(register, 1, seed=0), timestamps=[0.0])
+
+
+def test_writer_never_overwrites_a_recording(register, tmp_path):
+    (tmp_path / f"Device_{register.address}.bin").write_bytes(b"recorded")
+    writer = RegisterWriter(register, tmp_path, "Device")
+    with pytest.raises(FileExistsError):
+        writer.write(make_records(register, 1, seed=0), timestamps=[0.0])
+
+
+def test_created_dataset_opens_with_open_dataset(emitted_module, device_yml, tmp_path):
+    schema_path = tmp_path / "schema.yml"
+    schema_path.write_text(device_yml)
+    root = tmp_path / "session.harp"
+    addresses = [a for a in sorted(emitted_module.REGISTER_MAP) if a >= 32][:3]
+
+    expected = {}
+    with create_dataset(root, schema_path, require_converters=False, max_frames=4) as writer:
+        for address in addresses:
+            cls = writer.device_module.REGISTER_MAP[address]
+            records = make_records(cls, 6, seed=address)
+            timestamps = np.arange(6, dtype=np.float64)
+            writer.write(address, records[:3], timestamps=timestamps[:3])
+            writer.write(cls.__name__, records[3:], timestamps=timestamps[3:])
+            expected[address] = bytes(cls.format_bulk(records, timestamps=timestamps))
+
+    assert (root / "device.yml").read_text() == device_yml
+    assert {address: len(paths) for address, paths in writer.paths.items()} == {
+        address: 2 for address in addresses
+    }
+    reader = open_dataset(root, require_converters=False)
+    for address in addresses:
+        cls = reader.device_module.REGISTER_MAP[address]
+        assert reader.read(address).equals(parse_to_dataframe(cls, expected[address]))
+
+
+def test_dataset_writer_resolves_registers_like_the_reader(emitted_module, tmp_path):
+    address = next(a for a in sorted(emitted_module.REGISTER_MAP) if a >= 32)
+    cls = emitted_module.REGISTER_MAP[address]
+    with DatasetWriter(emitted_module, tmp_path) as writer:
+        assert writer.writer(cls) is writer.writer(address) is writer.writer(cls.__name__)
+        writer.write(cls, make_records(cls, 2, seed=0), timestamps=[0.0, 1.0])
+        with pytest.raises(KeyError):
+            writer.write("NotARegister", [])
+    assert DatasetReader(emitted_module, tmp_path).contents == {cls.__name__: address}
+    with pytest.raises(ValueError, match="closed dataset writer"):
+        writer.write(cls, make_records(cls, 1, seed=0), timestamps=[0.0])
+
+
+def test_dataset_writer_refuses_a_different_schema(emitted_module, device_yml, tmp_path):
+    # The same schema resumes writing into the folder, another would mislabel its files.
+    DatasetWriter(emitted_module, tmp_path, schema=device_yml).close()
+    DatasetWriter(emitted_module, tmp_path, schema=device_yml).close()
+    with pytest.raises(FileExistsError, match="different device schema"):
+        DatasetWriter(emitted_module, tmp_path, schema=f"whoAmI: 1216\n{device_yml}")
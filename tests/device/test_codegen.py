@@ -0,0 +1,156 @@
+import importlib
+import shutil
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from harp.device.core import EnableFlag
+from harp.device.schema import (
+    create_device_module,
+    generate_device_module,
+    write_device_package,
+)
+from harp.device.schema.__main__ import main
+from harp.device.schema._emit import NameCollisionError
+from harp.protocol import HarpMessage
+
+from . import expected_device
+from .converters import DataConverter
+
+CONVERTERS = {"DataConverter": DataConverter()}
+
+
+def _layout(dt):
+    if dt.names is None:
+        return ("scalar", dt.str, dt.shape, dt.itemsize)
+    return ("struct", dt.itemsize, tuple((n, dt.fields[n][0], dt.fields[n][1]) for n in dt.names))
+
+
+@pytest.fixture
+def import_package(tmp_path, monkeypatch):
+    """Import a package written under ``tmp_path``, unloading it afterwards."""
+    monkeypatch.syspath_prepend(str(tmp_path))
+    imported = []
+
+    def _import(name):
+        imported.append(name)
+        return importlib.import_module(name)
+
+    yield _import
+    for name in list(sys.modules):
+        if name.split(".")[0] in imported:
+            del sys.modules[name]
+
+
+def _round_trip(register, value, **kwargs):
+    return register.parse(HarpMessage.parse(register.format(value, **kwargs)))
+
+
+def _assert_same_declarations(generated, emitted):
+    assert set(generated.__all__) == set(emitted.__all__)
+    assert generated.DEVICE_NAME == emitted.DEVICE_NAME
+    assert generated.WHO_AM_I == emitted.WHO_AM_I
+    assert generated.REGISTER_MAP.keys() == emitted.REGISTER_MAP.keys()
+    for address, cls in emitted.REGISTER_MAP.items():
+        static = generated.REGISTER_MAP[address]
+        assert static.__name__ == cls.__name__
+        assert static.payload_type == cls.payload_type
+        assert _layout(static.payload_class.payload_dtype) == _layout(
+            cls.payload_class.payload_dtype
+        )
+
+
+def test_source_matches_generator_output(device_yml):
+    # expected_device is the output of the official generator for the same schema.
+    expected = Path(expected_device.__file__).read_text()
+    assert generate_device_module(device_yml) == expected
+
+
+def test_package_declares_what_create_device_module_builds(device_yml, tmp_path, import_package):
+    write_device_package(device_yml, tmp_path / "tests_device")
+    shutil.copy(Path(__file__).with_name("converters.py"), tmp_path / "tests_device")
+    generated = import_package("tests_device")
+
+    _assert_same_declarations(generated, create_device_module(device_yml, converters=CONVERTERS))
+    assert (tmp_path / "tests_device" / "py.typed").exists()
+    payload = _round_trip(generated.AnalogData, np.arange(6, dtype=np.float32), timestamp=1.5)
+    assert payload.accelerometer.tolist() == [3.0, 4.0, 5.0]
+
+
+def test_native_converters_need_no_converters_module(device_yml, tmp_path, import_package):
+    source = generate_device_module(device_yml, require_converters=False)
+    assert ".converters" not in source
+
+    write_device_package(device_yml, tmp_path / "native_device", require_converters=False)
+    generated = import_package("native_device")
+    _assert_same_declarations(generated, create_device_module(device_yml, require_converters=False))
+
+
+SCHEMA = """\
+device: Sampler
+whoAmI: 2048
+description: A device exercising every register shape.
+registers:
+  Samples:
+    address: 32
+    type: S16
+    length: 4
+    access: Event
+    description: Raw samples.
+  Reserved0:
+    address: 33
+    type: U8
+    access: Read
+    visibility: private
+  Control:
+    address: 34
+    type: U8
+    access: Write
+    payloadSpec:
+      Mode:
+        mask: 0x3
+        maskType: Modes
+        defaultValue: 1
+        description: Acquisition mode.
+      Indicators:
+        mask: 0x4
+        maskType: EnableFlag
+groupMasks:
+  Modes:
+    values:
+      Idle: {value: 0, description: Nothing is sampled.}
+      Run: {value: 1, description: Samples are reported.}
+"""
+
+
+def test_every_register_shape_round_trips(tmp_path, import_package):
+    write_device_package(SCHEMA, tmp_path / "sampler")
+    source = (tmp_path / "sampler" / "__init__.py").read_text()
+    generated = import_package("sampler")
+
+    _assert_same_declarations(generated, create_device_module(SCHEMA))
+    assert generated.__doc__ == "A device exercising every register shape."
+    assert generated.Samples.__doc__ == "Raw samples."
+    values = np.array([1, -2, 3, -4], dtype=np.int16)
+    assert _round_trip(generated.Samples, values).tolist() == [1, -2, 3, -4]
+    assert "_Reserved0" in generated.__all__
+    assert '    RUN = 1\n    """Samples are reported."""' in source
+    assert "default=Modes.RUN" in source
+    # A core mask is imported from harp.device.core rather than declared again.
+    assert "from harp.device.core import EnableFlag" in source
+    assert generated.ControlPayload._mro_descriptor("indicators")._enum is EnableFlag
+
+
+def test_schema_errors_match_create_device_module():
+    schema = "registers:\n  R: {address: 32, type: U8, access: Read, payloadSpec: {A: {}, a: {}}}\n"
+    with pytest.raises(NameCollisionError):
+        generate_device_module(schema)
+
+
+def test_cli_writes_the_package(device_yml, tmp_path, capsys):
+    schema = tmp_path / "device.yml"
+    schema.write_text(device_yml)
+    main([str(schema), str(tmp_path / "pkg"), "--name", "Renamed"])
+    assert 'DEVICE_NAME: str = "Renamed"' in (tmp_path / "pkg" / "__init__.py").read_text()
+    assert "pkg" in capsys.readouterr().out
@@ -8,9 +8,13 @@
 from harp.device.schema import (
     DeviceModule,
     DeviceModuleLike,
+    _module,
+    clear_module_cache,
     create_device_module,
     parse_device_schema,
 )
+from harp.device.schema._emit import UnknownConverterError
+from harp.device.schema._model import DeviceModel
 from harp.protocol import RegisterBase
 
 from . import expected_device
@@ -206,3 +210,84 @@ def test_emitted_registers_are_usable(test_module):
         reg.payload_class(analog0=1.0, analog1=2.0, analog2=3.0, accelerometer=[4, 5, 6])
     )
     assert isinstance(frame, (bytes, bytearray))
+
+
+def test_same_schema_shares_classes_in_new_modules(device_yml):
+    # The second build is served from the cache, yet stays a module of its own.
+    first = create_device_module(device_yml, converters=CONVERTERS)
+    second = create_device_module(device_yml, converters=CONVERTERS)
+    assert first is not second
+    assert second.AnalogData is first.AnalogData
+    assert second.REGISTER_MAP == first.REGISTER_MAP
+    assert second.REGISTER_MAP is not first.REGISTER_MAP
+    second.__name__ = "Renamed"
+    assert first.__name__ == "Tests"
+
+
+def test_cache_is_keyed_on_every_build_option(device_yml):
+    reference = create_device_module(device_yml, converters=CONVERTERS)
+    assert create_device_module(device_yml, converters=CONVERTERS, cache=False).AnalogData is not (
+        reference.AnalogData
+    )
+    assert create_device_module(device_yml, name="Other", converters=CONVERTERS).AnalogData is not (
+        reference.AnalogData
+    )
+    assert create_device_module(
+        device_yml, converters={"DataConverter": DataConverter()}
+    ).AnalogData is not (reference.AnalogData)
+    clear_module_cache()
+    assert create_device_module(device_yml, converters=CONVERTERS).AnalogData is not (
+        reference.AnalogData
+    )
+
+
+def test_lazy_module_emits_on_first_access(device_yml):
+    mod = create_device_module(device_yml, converters=CONVERTERS, lazy=True, cache=False)
+    assert "AnalogData" not in vars(mod)
+    assert "AnalogData" in mod.__all__ and "AnalogData" in dir(mod)
+
+    assert mod.AnalogData.address == 33
+    assert "AnalogData" in vars(mod)  # bound for the next access
+    assert "EncoderMode" not in vars(mod)
+    assert mod.AnalogData.__module__ == "Tests"
+    assert mod.AnalogDataPayload is mod.AnalogData.payload_class
+    assert mod.REGISTER_MAP[103] is mod.EncoderMode
+    with pytest.raises(AttributeError, match="Nonexistent"):
+        _ = mod.Nonexistent
+
+
+def test_lazy_module_matches_eager_module(device_yml):
+    eager = create_device_module(device_yml, converters=CONVERTERS, cache=False)
+    lazy = create_device_module(device_yml, converters=CONVERTERS, lazy=True, cache=False)
+    assert isinstance(lazy, DeviceModuleLike)
+    assert lazy.__all__ == eager.__all__
+    for name in eager.__all__:
+        declaration = getattr(lazy, name)
+        assert type(declaration) is type(getattr(eager, name))
+    assert sorted(lazy.REGISTER_MAP) == sorted(eager.REGISTER_MAP)
+
+
+def test_lazy_module_raises_missing_converter_on_access(device_yml):
+    mod = create_device_module(device_yml, lazy=True, cache=False)  # no DataConverter
+    assert mod.AnalogData.address == 33
+    with pytest.raises(UnknownConverterError, match="DataConverter"):
+        _ = mod.REGISTER_MAP
+
+
+def test_cache_dir_skips_parsing_a_known_schema(device_yml, tmp_path, monkeypatch):
+    create_device_module(device_yml, converters=CONVERTERS, cache=False, cache_dir=tmp_path)
+    (cached,) = tmp_path.glob("*.json")
+
+    def fail(_text):
+        raise AssertionError("the schema was parsed again")
+
+    monkeypatch.setattr(_module, "parse_device_schema", fail)
+    mod = create_device_module(device_yml, converters=CONVERTERS, cache=False, cache_dir=tmp_path)
+    assert mod.AnalogData.address == 33
+
+    # A damaged cache file is parsed afresh and rewritten rather than trusted.
+    cached.write_text("{not json")
+    monkeypatch.undo()
+    mod = create_device_module(device_yml, converters=CONVERTERS, cache=False, cache_dir=tmp_path)
+    assert mod.AnalogData.address == 33
+    assert DeviceModel.model_validate_json(cached.read_bytes()) == parse_device_schema(device_yml)
@@ -127,6 +127,16 @@ def reply_once(_: bytes) -> Iterable[bytes]:
         assert [int(reply.result(timeout=2).payload) for reply in replies] == [9, 9]
 
 
+def test_write_sends_the_frame_of_the_register_encoder():
+    transport = _ScriptedTransport()
+    transport.on_write = lambda data: (data,)  # the device echoes the write as its reply
+    with _ShortTimeoutDevice(transport) as device:
+        reply = device.write(core.OperationControl, core.OperationControl.parse(b"\x02"))
+    encoder = core.OperationControl.encoder(MessageType.Write)
+    assert transport.writes == [encoder.encode(b"\x02")]
+    assert reply.bytes == transport.writes[0]
+
+
 def test_transport_failure_faults_pending_read():
     transport = _ScriptedTransport()
 
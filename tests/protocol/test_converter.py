@@ -2,7 +2,8 @@
 
 Covers:
 * IdentityConverter via auto-generated _Field (parity with previous _Field).
-* StringConverter, sub-array uint8 to str and back.
+* StringConverter, sub-array uint8 to str and back, and its categorical decode.
+* HarpVersionConverter, split into typed columns by decode_columns.
 * EnumConverter (full-byte enum decoding).
 * Declarations-build-dtype direction (no _dtype on the subclass).
 * Reserved-name collision check.
@@ -20,6 +21,7 @@
     GroupMask,
     _IdentityConverter,
 )
+from harp.protocol._payload_converters import HarpVersion, HarpVersionConverter
 from harp.protocol._payload_converters import StringConverter as _StringConverter
 
 
@@ -134,6 +136,58 @@ def test_string_converter_to_dataframe():
     assert df["delta"].tolist() == [1, 2]
 
 
+class _DeviceNamePayload(PayloadBase):
+    name = Field(converter=_StringConverter(8, encoding="utf-8", categorical=True), offset=0)
+    delta = Field(converter=_IdentityConverter(np.uint16), offset=8)
+
+
+def test_categorical_string_converter_decodes_each_value_once():
+    names = ["Behavior", "Behavior", "Sound", "", "Behavior", "Sound", "Sönd"]
+    raw = b"".join(
+        _DeviceNamePayload(name=n, delta=i).payload_array.tobytes() for i, n in enumerate(names)
+    )
+    batch = _DeviceNamePayload.payload_from_buffer(raw)
+
+    (col, _delta) = batch.payload_as_columns()
+    df = payload_to_dataframe(batch)
+
+    assert col.categories == ["", "Behavior", "Sound", "Sönd"]
+    assert df["name"].dtype == "category"
+    assert df["name"].tolist() == names
+    assert list(batch.name) == names  # the batch accessor still decodes every row
+    assert payload_to_dataframe(_DeviceNamePayload.payload_from_buffer(b""))["name"].empty
+
+
+class _FirmwarePayload(PayloadBase):
+    firmware = Field(converter=HarpVersionConverter(np.uint8), offset=0)
+    build = Field(converter=_IdentityConverter(np.uint16), offset=3)
+
+
+def test_version_converter_splits_into_typed_columns():
+    versions = [HarpVersion(1, 2, 3), HarpVersion(2, 0, 10)]
+    raw = b"".join(
+        _FirmwarePayload(firmware=v, build=i).payload_array.tobytes()
+        for i, v in enumerate(versions)
+    )
+    batch = _FirmwarePayload.payload_from_buffer(raw)
+
+    columns = batch.payload_as_columns()
+    df = payload_to_dataframe(batch)
+
+    assert [c.name for c in columns] == [
+        "firmware_major",
+        "firmware_minor",
+        "firmware_patch",
+        "build",
+    ]
+    assert all(c.data.dtype == np.uint8 for c in columns[:3])
+    assert df["firmware_minor"].tolist() == [2, 0]
+    assert df["firmware_patch"].tolist() == [3, 10]
+    assert np.asarray(batch.firmware).tolist() == versions  # the accessor builds HarpVersions
+    selected = batch.payload_as_columns(columns=["firmware_patch"])
+    assert [c.name for c in selected] == ["firmware_patch"]
+
+
 # ---------------------------------------------------------------------------
 # GroupMask in struct-field role (full-byte enum, non-default slot).
 # Demonstrates that _GroupMask subsumes the previous _EnumConverter.
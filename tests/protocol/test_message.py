@@ -3,7 +3,8 @@
 import numpy as np
 import pytest
 from harp.protocol._message import HarpMessage, HarpParseError
-from harp.protocol._register import RegisterU8, RegisterU16
+from harp.device.schema import create_device_module
+from harp.protocol._register import RegisterFloatArray, RegisterU8, RegisterU16
 from harp.protocol._message_type import MessageType
 from harp.protocol._payload_type import PayloadType
 
@@ -131,6 +132,18 @@ def test_decode_rejects_a_payload_type_mismatch():
         _u8_frame().decode(RegisterU16(0x0A))
 
 
+def test_decode_sizes_a_struct_payload_from_its_record(device_yml):
+    # Six floats under one Float payload type: the record, not the type, gives the size.
+    analog = create_device_module(device_yml, require_converters=False).AnalogData
+    values = np.arange(6, dtype=np.float32).reshape(1, 6)
+    frame = bytes(analog.format_bulk(values, timestamps=[1.0]))
+    typed = HarpMessage.parse(frame).decode(analog)
+    assert (typed.payload.analog0, typed.payload.analog2) == (0.0, 2.0)
+    short = bytes(RegisterFloatArray(33, length=5).format_bulk(values[:, :5]))
+    with pytest.raises(HarpParseError, match="reads 24 payload bytes"):
+        HarpMessage.parse(short).decode(analog)
+
+
 def test_decode_accepts_a_register_at_another_address():
     # The payload type decides whether these bytes can be read as this register at all.
     # The address says which register the device meant, so an identical layout decodes
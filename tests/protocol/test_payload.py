@@ -3,8 +3,9 @@
 import numpy as np
 import pytest
 from harp.data import payload_to_dataframe
-from harp.protocol import AnonymousPayload, Column, GroupMask
-from harp.protocol._payload import PayloadBase, Field, _IdentityConverter
+from harp.protocol import AnonymousPayload, BitMask, Column, GroupMask, StructPayload
+from harp.protocol._payload import PayloadBase, Field, _IdentityConverter, _unpack_bits
+from harp.protocol._payload_converters import StringConverter
 
 
 class SimplePayload(PayloadBase):
@@ -102,3 +103,165 @@ def test_groupmask_scalar_matches_batch_for_undefined():
     undefined = _SparseModePayload.payload_from_buffer(np.array([90], dtype=np.uint8).tobytes())
     assert undefined.__value__ == 90
     assert not isinstance(undefined.__value__, _SparseMode)
+
+
+@pytest.mark.parametrize(
+    ("element", "mask"),
+    [(np.uint16, 0x0FF0), (np.uint32, 0x00FFFF00), (np.uint32, 0xFFFFFFFF)],
+)
+def test_groupmask_decode_is_the_same_for_every_table(element, mask):
+    # 16-bit slots decode through a table of every element value, wider ones through a
+    # table of every raw code, or without a table when the raw range is past 16 bits.
+    class _Wide(AnonymousPayload[element]):
+        __value__ = GroupMask(enum=_SparseMode, mask=mask)
+
+    shift = (mask & -mask).bit_length() - 1
+    raw = np.array([2, 0, 1, 90, 2, 90, 7], dtype=element)
+    noise = np.array([0, 1, 0, 1, 1, 0, 1], dtype=element) * (~np.uint32(mask) & 0xF)
+    batch = _Wide.payload_from_buffer(((raw << shift) | noise.astype(element)).tobytes())
+    column = payload_to_dataframe(batch)["value"]
+    assert list(column) == ["High", "Low", 1, 90, "High", 90, 7]
+    assert list(column.cat.categories) == ["Low", "High", 1, 7, 90]
+    defined = _Wide.payload_from_buffer((raw[:2] << shift).tobytes())
+    assert list(payload_to_dataframe(defined)["value"]) == ["High", "Low"]
+
+
+class _CountingStringConverter(StringConverter):
+    def __init__(self, length: int) -> None:
+        super().__init__(length)
+        self.batch_decodes = 0
+
+    def decode_batch(self, view):
+        self.batch_decodes += 1
+        return super().decode_batch(view)
+
+
+class _Flags(enum.IntFlag):
+    A = 0x01
+    B = 0x02
+
+
+class _WidePayload(PayloadBase):
+    label = Field(converter=_CountingStringConverter(4), offset=0)
+    samples = Field(converter=_IdentityConverter(np.dtype(("<i2", (2,)))), offset=4)
+    flags = BitMask(enum=_Flags, mask=0x03, offset=8)
+
+
+def _wide_batch():
+    arr = np.zeros(2, dtype=_WidePayload.payload_dtype)
+    arr["label"] = np.frombuffer(b"ab\0\0cd\0\0", dtype=np.uint8).reshape(2, 4)
+    arr["samples"] = [[1, 2], [3, 4]]
+    arr["flags"] = [0x01, 0x03]
+    return _WidePayload.payload_from_buffer(arr.tobytes())
+
+
+def test_selected_columns_leave_other_fields_undecoded():
+    batch = _wide_batch()
+    converter = _WidePayload._mro_descriptor("label")._converter
+    converter.batch_decodes = 0
+
+    cols = batch.payload_as_columns(columns={"samples_1", "B"}, demux_bit_masks=True)
+
+    assert [c.name for c in cols] == ["samples_1", "B"]
+    assert converter.batch_decodes == 0
+    np.testing.assert_array_equal(cols[0].data, [2, 4])
+    np.testing.assert_array_equal(cols[1].data, [False, True])
+    assert [c.name for c in batch.payload_as_columns(columns={"label"})] == ["label"]
+    assert converter.batch_decodes == 1
+
+
+def test_decode_plan_is_compiled_with_the_class(monkeypatch):
+    plan = _WidePayload._decode_plan
+    assert _WidePayload._PayloadBatchType._decode_plan is plan
+    assert [step.names for step in plan] == [("label",), ("samples_0", "samples_1"), ("flags",)]
+    assert plan[2].demux_names == ("A", "B")
+
+    # A call runs the compiled steps without resolving any descriptor again.
+    batch = _wide_batch()
+    monkeypatch.setattr(_WidePayload, "_mro_descriptor", classmethod(lambda cls, name: None))
+    cols = batch.payload_as_columns(demux_bit_masks=True)
+    assert [c.name for c in cols] == ["label", "samples_0", "samples_1", "A", "B"]
+    np.testing.assert_array_equal(cols[4].data, [False, True])
+
+
+def test_payload_to_dataframe_columns_in_requested_order():
+    df = payload_to_dataframe(_wide_batch(), columns=["flags", "label"])
+    assert list(df.columns) == ["flags", "label"]
+    assert list(df["label"]) == ["ab", "cd"]
+    with pytest.raises(KeyError, match="samples"):
+        payload_to_dataframe(_wide_batch(), columns=["samples"])
+
+
+def test_anonymous_value_selected_by_default_name():
+    batch = _SparseModePayload.payload_from_buffer(np.array([0, 2], dtype=np.uint8).tobytes())
+    assert list(payload_to_dataframe(batch, columns=["value"])["value"]) == ["Low", "High"]
+    assert batch.payload_as_columns(columns={"other"}) == []
+
+
+class _WideFlags(enum.IntFlag):
+    LOW = 0x0001
+    MID = 0x0100
+    HIGH = 0x8000
+
+
+class _WideFlagsPayload(AnonymousPayload[np.uint16]):
+    __value__ = BitMask(enum=_WideFlags)
+
+
+class _NarrowFlagsPayload(StructPayload[np.uint16]):
+    flags = BitMask(enum=_WideFlags, mask=0x00FF)
+    level = GroupMask(enum=_SparseMode, mask=0x0300)
+
+
+@pytest.mark.parametrize(
+    ("payload", "members"),
+    [(_WideFlagsPayload, ["LOW", "MID", "HIGH"]), (_NarrowFlagsPayload, ["LOW", "level"])],
+)
+def test_demux_matches_per_member_masks(payload, members):
+    values = np.random.default_rng(3).integers(0, 1 << 16, size=64, dtype=np.uint16)
+    batch = payload.payload_from_buffer(values.tobytes())
+
+    cols = batch.payload_as_columns(demux_bit_masks=True)
+
+    assert [c.name for c in cols] == members
+    for col in cols:
+        if col.name in _WideFlags.__members__:
+            np.testing.assert_array_equal(col.data, (values & _WideFlags[col.name]) != 0)
+
+
+_Lines = enum.IntFlag("_Lines", {f"L{i}": 1 << i for i in range(0, 32, 2)} | {"L31": 1 << 31})
+
+
+class _LinesPayload(AnonymousPayload[np.uint32]):
+    __value__ = BitMask(enum=_Lines)
+
+
+def test_wide_flag_demux_unpacks_every_bit():
+    # 17 flags: past the per-flag threshold, so the columns come from one bit block.
+    values = np.random.default_rng(5).integers(0, 1 << 32, size=64, dtype=np.uint32)
+    batch = _LinesPayload.payload_from_buffer(values.tobytes())
+
+    cols = batch.payload_as_columns(demux_bit_masks=True)
+
+    assert [c.name for c in cols] == [m.name for m in _Lines]
+    for col in cols:
+        np.testing.assert_array_equal(col.data, (values & _Lines[col.name]) != 0)
+
+
+def test_unpack_bits_reads_any_byte_order():
+    values = np.array([0x0001, 0x8100], dtype=">u2")
+    bits = _unpack_bits(values)
+    assert bits.shape == (2, 16)
+    assert np.flatnonzero(bits[0]).tolist() == [0]
+    assert np.flatnonzero(bits[1]).tolist() == [8, 15]
+
+
+def test_flag_set_column_reads_one_flag():
+    values = np.array([0x0001, 0x8100, 0x0000], dtype=np.uint16)
+    (col,) = _WideFlagsPayload.payload_from_buffer(values.tobytes()).payload_as_columns()
+
+    assert col.flags is _WideFlags
+    assert col.flag("MID").tolist() == [False, True, False]
+    assert col.flag(_WideFlags.HIGH).tolist() == [False, True, False]
+    with pytest.raises(TypeError, match="not a flag set"):
+        Column("x", values).flag("MID")
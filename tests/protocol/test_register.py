@@ -5,6 +5,7 @@
 import numpy as np
 import pytest
 from harp.data import parse_to_dataframe, payload_to_dataframe, to_buffer, to_file
+from harp.protocol._builder import build_message_frame
 from harp.protocol._message import HarpMessage, HarpParseError
 from harp.protocol._message_type import MessageType
 from harp.protocol._payload import (
@@ -506,6 +507,29 @@ def test_parse_does_not_overrun_buffer():
     assert parsed.ndim == 0
 
 
+@pytest.mark.parametrize(
+    "payload_cls",
+    [PayloadU8, PayloadU16, PayloadU32, PayloadU64, PayloadS8, PayloadS16, PayloadS32, PayloadS64],
+)
+def test_scalar_parse_matches_numpy_decode(payload_cls):
+    dtype = payload_cls.payload_dtype
+    info = np.iinfo(dtype)
+    for value in (info.min, info.max, 0, 1):
+        raw = np.array([value], dtype=dtype).tobytes()
+        parsed = payload_cls._scalar_parser(memoryview(raw))
+        expected = np.frombuffer(raw, dtype=dtype, count=1)[0]
+        assert type(parsed) is type(expected) and parsed == expected
+
+
+def test_scalar_parse_keeps_float_bits():
+    # Inf, a signalling NaN and a negative quiet NaN keep their exact bit patterns.
+    bits = np.array([0x3FC00000, 0x7F800000, 0x7F800001, 0xFFC00001], dtype="<u4")
+    parsed = [RegisterFloat(0x20).parse(b.tobytes()) for b in bits]
+    assert all(type(p) is np.float32 for p in parsed)
+    assert parsed[0] == 1.5
+    assert [int(np.float32(p).view(np.uint32)) for p in parsed] == bits.tolist()
+
+
 def test_batch_payload_routes_to_batch_twin():
     """from_buffer wraps a multi-element buffer in the auto-derived ``Batch`` twin.
 
@@ -576,6 +600,46 @@ class P(PayloadBase):
     assert P._repr_fields == ("low", "high")
 
 
+# ---------------------------------------------------------------------------
+# FrameEncoder, the precompiled template behind format
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("timestamp", [None, 1.5, 123456.000032])
+@pytest.mark.parametrize("message_type", [MessageType.Write, MessageType.Event])
+def test_encoder_matches_build_message_frame(message_type, timestamp):
+    reg = RegisterU16Array(0x20, length=2)
+    payload = np.array([513, 7], dtype="<u2").tobytes()
+    encoder = reg.encoder(message_type, port=3, timestamped=timestamp is not None)
+    expected = build_message_frame(
+        message_type, 0x20, PayloadType.U16, payload, port=3, timestamp=timestamp
+    )
+    assert encoder.encode(payload, timestamp=timestamp) == expected
+
+
+def test_encoder_read_carries_no_payload():
+    encoder = TimestampSecond.encoder(MessageType.Read)
+    assert encoder.payload_size == 0
+    assert encoder.encode() == TimestampSecond.format()
+
+
+def test_encoder_is_cached_per_register():
+    assert DigitalOutputSet.encoder() is DigitalOutputSet.encoder()
+    assert DigitalOutputSet.encoder() is not DigitalOutputSet.encoder(timestamped=True)
+    # A register declared at another address must not reuse the template of its base.
+    assert RegisterU16(0x21).encoder().encode(b"\x00\x00")[2] == 0x21
+
+
+def test_encoder_rejects_mismatched_frames():
+    encoder = DigitalOutputSet.encoder()
+    with pytest.raises(ValueError, match="encodes 2 payload bytes but 3 were given"):
+        encoder.encode(b"\x00\x00\x00")
+    with pytest.raises(ValueError, match="carries no timestamp"):
+        encoder.encode(b"\x00\x00", timestamp=1.0)
+    with pytest.raises(ValueError, match="needs a timestamp"):
+        DigitalOutputSet.encoder(timestamped=True).encode(b"\x00\x00")
+
+
 # ---------------------------------------------------------------------------
 # format_bulk (inverse of parse_bulk) + harp.data.to_buffer / to_file
 # ---------------------------------------------------------------------------
@@ -637,6 +701,62 @@ def test_format_bulk_rejects_shape_without_declared_payload():
         reg.format_bulk([[1, 2, 3], [4, 5, 6]])
 
 
+@pytest.mark.parametrize("length", [1, 8])  # narrow and wide frames sum checksums differently
+def test_format_bulk_frames_match_format(length):
+    reg = RegisterU32Array(0x20, length=length)
+    values = np.arange(3 * length, dtype="<u4").reshape(3, length) * 0x01010101
+    bulk = reg.format_bulk(values, timestamps=[1.5, 2.25, 3.0])
+    frames = [
+        reg.format(row, message_type=MessageType.Event, timestamp=t)
+        for row, t in zip(values, [1.5, 2.25, 3.0])
+    ]
+    assert bytes(bulk) == b"".join(frames)
+
+
+def test_format_bulk_writes_into_out():
+    reg = RegisterU16(0x20)
+    values = np.array([1, 2, 3], dtype="<u2")
+    expected = bytes(reg.format_bulk(values, timestamps=[1.0, 2.0, 3.0]))
+    out = bytearray(len(expected) + 4)
+    frames = reg.format_bulk(values, timestamps=[1.0, 2.0, 3.0], out=out)
+    assert bytes(frames) == expected
+    assert bytes(out[: len(expected)]) == expected  # written in place, not copied
+    assert np.shares_memory(frames, np.frombuffer(out, dtype=np.uint8))
+
+
+def test_format_bulk_rejects_unusable_out():
+    reg = RegisterU16(0x20)
+    values = np.array([1, 2], dtype="<u2")
+    with pytest.raises(ValueError, match="out holds 4 bytes but the frames need 16"):
+        reg.format_bulk(values, out=bytearray(4))
+    with pytest.raises(ValueError, match="writable, contiguous uint8"):
+        reg.format_bulk(values, out=np.zeros(16, dtype=np.uint16))
+    with pytest.raises(ValueError, match="writable, contiguous uint8"):
+        reg.format_bulk(values, out=bytes(16))
+
+
+def test_format_bulk_chunks_concatenate_to_format_bulk():
+    reg = AnalogData
+    records = np.zeros(10, dtype=reg.payload_class.payload_dtype)
+    records["analog_input0"] = np.arange(10)
+    timestamps = np.linspace(0.0, 1.0, 10)
+    message_types = np.where(np.arange(10) % 2, MessageType.Write, MessageType.Event)
+    expected = bytes(reg.format_bulk(records, timestamps=timestamps, message_type=message_types))
+    chunks = [
+        bytes(chunk)
+        for chunk in reg.format_bulk_chunks(
+            records, timestamps=timestamps, message_type=message_types, chunk_frames=4
+        )
+    ]
+    assert [len(chunk) for chunk in chunks] == [4 * 18, 4 * 18, 2 * 18]
+    assert b"".join(chunks) == expected
+
+
+def test_format_bulk_chunks_rejects_empty_chunks():
+    with pytest.raises(ValueError, match="chunk_frames must be positive"):
+        next(RegisterU16(0x20).format_bulk_chunks([1], chunk_frames=0))
+
+
 def test_parse_bulk_names_register_on_partial_frame():
     # numpy would otherwise report an out-of-bounds index against the strided view,
     # naming neither the register nor how many bytes a frame needs.
@@ -665,3 +785,38 @@ def test_to_buffer_and_to_file_roundtrip(tmp_path):
     path = tmp_path / "reg.bin"
     to_file(reg, values, path, timestamps=[1.0, 2.0])
     assert parse_to_dataframe(reg, path)["value"].tolist() == [10, 20]
+
+
+def test_to_file_leaves_the_file_untouched_when_values_are_invalid(tmp_path):
+    reg = RegisterU16(0x20)
+    path = tmp_path / "reg.bin"
+    to_file(reg, np.array([10, 20], dtype="<u2"), path, timestamps=[1.0, 2.0])
+    before = path.read_bytes()
+    with pytest.raises(ValueError):
+        to_file(reg, np.zeros((3, 5)), path)
+    assert path.read_bytes() == before
+
+
+def test_to_file_checks_timestamps_against_the_frames_before_writing(tmp_path):
+    # Over several chunks, a short timestamp array would only run out past the first.
+    reg = RegisterU16(0x20)
+    path = tmp_path / "reg.bin"
+    to_file(reg, np.array([10, 20], dtype="<u2"), path, timestamps=[1.0, 2.0])
+    before = path.read_bytes()
+    values = np.arange(200_000, dtype="<u2")
+    with pytest.raises(ValueError, match="199999 values for 200000 frames"):
+        to_file(reg, values, path, timestamps=np.arange(199_999, dtype=np.float64))
+    with pytest.raises(ValueError, match="message_type"):
+        reg.format_bulk_chunks(values, message_type=[MessageType.Event] * 3)
+    assert path.read_bytes() == before
+
+
+def test_to_file_stamps_every_frame_with_a_scalar_timestamp(tmp_path):
+    reg = RegisterU16(0x20)
+    path = tmp_path / "reg.bin"
+    values = np.arange(200_000, dtype="<u2")
+    to_file(reg, values, path, timestamps=1.5)
+    assert path.read_bytes() == bytes(reg.format_bulk(values, timestamps=1.5))
+    df = parse_to_dataframe(reg, path)
+    assert len(df) == 200_000
+    assert (df.index == 1.5).all()